@@ -0,0 +1,31 @@
+-- Add per-business rating summary table (review count, rating sum and 1-5 histogram)
+-- Kept up to date by /api/reviews; run this once on existing databases to create and backfill it.
+-- Equivalent to: flask --app app rebuild-rating-summaries
+
+CREATE TABLE IF NOT EXISTS business_rating_summary (
+    business_id INTEGER PRIMARY KEY REFERENCES "user"(id),
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_1 INTEGER NOT NULL DEFAULT 0,
+    rating_2 INTEGER NOT NULL DEFAULT 0,
+    rating_3 INTEGER NOT NULL DEFAULT 0,
+    rating_4 INTEGER NOT NULL DEFAULT 0,
+    rating_5 INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+DELETE FROM business_rating_summary;
+
+INSERT INTO business_rating_summary
+    (business_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5)
+SELECT business_id,
+       COUNT(id),
+       SUM(rating),
+       SUM(CASE WHEN rating = 1 THEN 1 ELSE 0 END),
+       SUM(CASE WHEN rating = 2 THEN 1 ELSE 0 END),
+       SUM(CASE WHEN rating = 3 THEN 1 ELSE 0 END),
+       SUM(CASE WHEN rating = 4 THEN 1 ELSE 0 END),
+       SUM(CASE WHEN rating = 5 THEN 1 ELSE 0 END)
+FROM review
+WHERE rating BETWEEN 1 AND 5
+GROUP BY business_id;
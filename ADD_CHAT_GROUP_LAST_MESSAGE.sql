@@ -0,0 +1,20 @@
+-- Last-message pointer on chat_group so the group list needs no per-group message lookup
+-- Run this once on existing databases.
+-- New messages move the pointer from the app; this backfills it from chat_message.
+
+ALTER TABLE chat_group ADD COLUMN IF NOT EXISTS last_message_id INTEGER;
+ALTER TABLE chat_group ADD COLUMN IF NOT EXISTS last_message_preview VARCHAR(200);
+ALTER TABLE chat_group ADD COLUMN IF NOT EXISTS last_sender_name VARCHAR(100);
+ALTER TABLE chat_group ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMP;
+
+UPDATE chat_group g
+SET last_message_id = m.id,
+    last_message_preview = LEFT(m.message, 200),
+    last_sender_name = m.sender_name,
+    last_message_at = m.created_at
+FROM (
+    SELECT DISTINCT ON (group_id) id, group_id, message, sender_name, created_at
+    FROM chat_message
+    ORDER BY group_id, id DESC
+) m
+WHERE m.group_id = g.id;
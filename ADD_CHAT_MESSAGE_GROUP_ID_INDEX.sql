@@ -0,0 +1,4 @@
+-- Index for chat delta polling (GET .../messages?since_id=): newer messages of one group by id
+-- Run this once on existing databases.
+
+CREATE INDEX IF NOT EXISTS idx_chat_message_group_id ON chat_message(group_id, id);
@@ -0,0 +1,13 @@
+-- Composite indexes for the hot tenant-scoped list queries
+-- Matches the db.Index declarations on the models in app.py; db.create_all() only adds
+-- them to new tables, so run this once on existing databases (after ADD_SOCIETY_ID.sql).
+-- Verify afterwards with: flask --app app check-query-plans
+
+CREATE INDEX IF NOT EXISTS idx_maintenance_request_society_created ON maintenance_request(society_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_visitor_log_society_created ON visitor_log(society_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_activity_log_society_created ON activity_log(society_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_announcement_society_created ON announcement(society_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_payment_society_created ON payment(society_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_notification_user_read ON notification(user_id, is_read);
+CREATE INDEX IF NOT EXISTS idx_notification_user_created ON notification(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_chat_message_group_created ON chat_message(group_id, created_at);
@@ -0,0 +1,20 @@
+-- Per-society, per-day visitor counter plus an index for "today" range filters on entry_time
+-- Run this once on existing databases (after ADD_SOCIETY_ID.sql).
+-- New entries are counted by the app; this backfills the history from visitor_log.
+
+CREATE INDEX IF NOT EXISTS idx_visitor_log_society_entry ON visitor_log(society_id, entry_time);
+
+CREATE TABLE IF NOT EXISTS daily_visitor_count (
+    society_id INTEGER NOT NULL REFERENCES society(id),
+    day DATE NOT NULL,
+    visitor_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (society_id, day)
+);
+
+DELETE FROM daily_visitor_count;
+
+INSERT INTO daily_visitor_count (society_id, day, visitor_count)
+SELECT society_id, CAST(entry_time AS DATE), COUNT(*)
+FROM visitor_log
+WHERE society_id IS NOT NULL AND entry_time IS NOT NULL
+GROUP BY society_id, CAST(entry_time AS DATE);
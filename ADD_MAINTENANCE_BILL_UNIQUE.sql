@@ -0,0 +1,22 @@
+-- One maintenance bill per flat per month, so re-running /api/admin/set-maintenance cannot double-bill
+-- Run this once on existing databases (after ADD_SOCIETY_ID.sql).
+-- Duplicate pending bills left by earlier re-runs are removed first, keeping a paid bill if there is one,
+-- otherwise the oldest. If a flat was billed twice and paid both, resolve that by hand before creating the index.
+
+DELETE FROM payment p
+USING (
+    SELECT id,
+           ROW_NUMBER() OVER (
+               PARTITION BY society_id, payer_id, payment_type, due_date
+               ORDER BY (status = 'paid') DESC, id
+           ) AS duplicate_rank
+    FROM payment
+    WHERE payment_type = 'maintenance'
+) d
+WHERE p.id = d.id
+  AND d.duplicate_rank > 1
+  AND p.status <> 'paid';
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_payment_maintenance_bill
+    ON payment(society_id, payer_id, payment_type, due_date)
+    WHERE payment_type = 'maintenance';
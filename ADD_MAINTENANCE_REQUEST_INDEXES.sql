@@ -0,0 +1,5 @@
+-- Indexes for the resident and business views of GET /api/maintenance-requests (newest first per creator / assignee)
+-- Run this once on existing databases.
+
+CREATE INDEX IF NOT EXISTS idx_maintenance_request_creator_created ON maintenance_request(created_by_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_maintenance_request_business_created ON maintenance_request(assigned_business_id, created_at);
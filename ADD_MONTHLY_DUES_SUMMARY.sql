@@ -0,0 +1,29 @@
+-- Per-society, per-month, per-status maintenance dues rollup for /api/admin/payments/overview
+-- Run this once on existing databases (after ADD_SOCIETY_ID.sql).
+-- New bills and payments are folded in by the app; this backfills the history from payment.
+-- The same backfill can be re-run later with: flask --app app rebuild-dues-summaries
+
+CREATE INDEX IF NOT EXISTS idx_payment_society_type_due ON payment(society_id, payment_type, due_date, created_at);
+
+CREATE TABLE IF NOT EXISTS monthly_dues_summary (
+    society_id INTEGER NOT NULL REFERENCES society(id),
+    month VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    bill_count INTEGER NOT NULL DEFAULT 0,
+    total_amount DOUBLE PRECISION NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (society_id, month, status)
+);
+
+CREATE INDEX IF NOT EXISTS idx_monthly_dues_society_created ON monthly_dues_summary(society_id, created_at);
+
+DELETE FROM monthly_dues_summary;
+
+INSERT INTO monthly_dues_summary (society_id, month, status, bill_count, total_amount, created_at)
+SELECT society_id, due_date, status, COUNT(*), SUM(amount), MIN(created_at)
+FROM payment
+WHERE payment_type = 'maintenance'
+  AND society_id IS NOT NULL
+  AND due_date IS NOT NULL
+  AND status IS NOT NULL
+GROUP BY society_id, due_date, status;
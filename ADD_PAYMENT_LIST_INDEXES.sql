@@ -0,0 +1,5 @@
+-- Indexes for the resident and business views of GET /api/payments (newest first per payer / payee)
+-- Run this once on existing databases.
+
+CREATE INDEX IF NOT EXISTS idx_payment_payer_created ON payment(payer_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_payment_payee_created ON payment(payee_id, created_at);
@@ -0,0 +1,5 @@
+-- Short photo-store key on "user" so the per-request user load no longer carries a base64 image
+-- Run this once on existing databases.
+-- Then run `flask --app app migrate-profile-photos` to move existing photos into the store.
+
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS photo_key VARCHAR(40);
@@ -0,0 +1,166 @@
+-- Replace the free-text society_name tenant key with an integer society_id foreign key
+-- Run this once on existing databases (PostgreSQL). society_name is kept as a display label;
+-- every tenant filter, ownership check and Socket.IO room now uses society_id.
+
+-- 1. Every society name in use needs a society row. Names that were never registered
+--    through /api/register-society get a placeholder row (claimed if their admin registers later).
+INSERT INTO society (name, address, city_state_pincode)
+SELECT DISTINCT names.society_name, '', ''
+FROM (
+    SELECT society_name FROM "user"
+    UNION
+    SELECT society_name FROM maintenance_request
+    UNION
+    SELECT society_name FROM review
+    UNION
+    SELECT society_name FROM chat_group
+    UNION
+    SELECT society_name FROM activity_log
+    UNION
+    SELECT society_name FROM announcement
+    UNION
+    SELECT society_name FROM guard_shift
+    UNION
+    SELECT society_name FROM business_society
+    UNION
+    SELECT society_name FROM visitor_log
+    UNION
+    SELECT society_name FROM family_member
+    UNION
+    SELECT society_name FROM vehicle
+    UNION
+    SELECT society_name FROM shift_report
+    UNION
+    SELECT society_name FROM payment
+    UNION
+    SELECT society_name FROM approval_request
+    UNION
+    SELECT society_name FROM notification
+    UNION
+    SELECT society_name FROM business_booking) AS names
+WHERE names.society_name IS NOT NULL
+  AND names.society_name <> ''
+  AND NOT EXISTS (SELECT 1 FROM society s WHERE s.name = names.society_name);
+
+-- Plain index for the backfill below; step 5 makes it unique once duplicates are collapsed
+CREATE INDEX IF NOT EXISTS ix_society_name ON society(name);
+
+-- 2. Add the society_id columns
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE maintenance_request ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE review ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE chat_group ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE activity_log ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE announcement ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE guard_shift ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE business_society ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE visitor_log ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE family_member ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE vehicle ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE shift_report ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE payment ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE approval_request ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE notification ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+ALTER TABLE business_booking ADD COLUMN IF NOT EXISTS society_id INTEGER REFERENCES society(id);
+
+-- 3. Backfill from names (the oldest society row wins if a name was registered twice)
+UPDATE "user" SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = "user".society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE maintenance_request SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = maintenance_request.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE review SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = review.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE chat_group SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = chat_group.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE activity_log SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = activity_log.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE announcement SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = announcement.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE guard_shift SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = guard_shift.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE business_society SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = business_society.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE visitor_log SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = visitor_log.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE family_member SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = family_member.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE vehicle SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = vehicle.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE shift_report SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = shift_report.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE payment SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = payment.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE approval_request SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = approval_request.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE notification SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = notification.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+UPDATE business_booking SET society_id = (SELECT MIN(s.id) FROM society s WHERE s.name = business_booking.society_name)
+WHERE society_id IS NULL AND society_name IS NOT NULL;
+
+-- 4. Index the new tenant key; the composite (society, created_at) indexes move to society_id
+CREATE INDEX IF NOT EXISTS ix_user_society_id ON "user"(society_id);
+CREATE INDEX IF NOT EXISTS ix_review_society_id ON review(society_id);
+CREATE INDEX IF NOT EXISTS ix_chat_group_society_id ON chat_group(society_id);
+CREATE INDEX IF NOT EXISTS ix_guard_shift_society_id ON guard_shift(society_id);
+CREATE INDEX IF NOT EXISTS ix_business_society_society_id ON business_society(society_id);
+CREATE INDEX IF NOT EXISTS ix_family_member_society_id ON family_member(society_id);
+CREATE INDEX IF NOT EXISTS ix_vehicle_society_id ON vehicle(society_id);
+CREATE INDEX IF NOT EXISTS ix_shift_report_society_id ON shift_report(society_id);
+CREATE INDEX IF NOT EXISTS ix_approval_request_society_id ON approval_request(society_id);
+CREATE INDEX IF NOT EXISTS ix_notification_society_id ON notification(society_id);
+CREATE INDEX IF NOT EXISTS ix_business_booking_society_id ON business_booking(society_id);
+DROP INDEX IF EXISTS idx_maintenance_request_society_created;
+CREATE INDEX idx_maintenance_request_society_created ON maintenance_request(society_id, created_at);
+DROP INDEX IF EXISTS idx_visitor_log_society_created;
+CREATE INDEX idx_visitor_log_society_created ON visitor_log(society_id, created_at);
+DROP INDEX IF EXISTS idx_activity_log_society_created;
+CREATE INDEX idx_activity_log_society_created ON activity_log(society_id, created_at);
+DROP INDEX IF EXISTS idx_announcement_society_created;
+CREATE INDEX idx_announcement_society_created ON announcement(society_id, created_at);
+DROP INDEX IF EXISTS idx_payment_society_created;
+CREATE INDEX idx_payment_society_created ON payment(society_id, created_at);
+
+-- 5. One society per name. Rows that already pointed at a later duplicate move to the lowest id
+--    for that name, which also takes over a duplicate's admin if it has none; then the duplicates
+--    go and the name index becomes unique (/api/register-society answers 409 for a taken name).
+UPDATE "user" SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = "user".society_id)
+WHERE society_id IS NOT NULL;
+UPDATE maintenance_request SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = maintenance_request.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE review SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = review.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE chat_group SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = chat_group.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE activity_log SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = activity_log.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE announcement SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = announcement.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE guard_shift SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = guard_shift.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE business_society SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = business_society.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE visitor_log SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = visitor_log.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE family_member SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = family_member.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE vehicle SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = vehicle.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE shift_report SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = shift_report.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE payment SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = payment.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE approval_request SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = approval_request.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE notification SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = notification.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE business_booking SET society_id = (SELECT MIN(s.id) FROM society s JOIN society d ON d.name = s.name WHERE d.id = business_booking.society_id)
+WHERE society_id IS NOT NULL;
+UPDATE society SET admin_id = (
+    SELECT MIN(d.admin_id) FROM society d WHERE d.name = society.name AND d.id <> society.id
+)
+WHERE admin_id IS NULL
+  AND id = (SELECT MIN(s.id) FROM society s WHERE s.name = society.name);
+DELETE FROM society
+WHERE id > (SELECT MIN(s.id) FROM society s WHERE s.name = society.name);
+DROP INDEX IF EXISTS ix_society_name;
+CREATE UNIQUE INDEX ix_society_name ON society(name);
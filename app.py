@@ -1,18 +1,43 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, send_file
+from flask import (Flask, render_template, request, jsonify, session, redirect, url_for, send_from_directory, abort,
+                   stream_template, stream_with_context)
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
 from werkzeug.middleware.proxy_fix import ProxyFix
 import os
 from dotenv import load_dotenv
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, timezone
 import qrcode
-from io import BytesIO
+from io import BytesIO, RawIOBase, StringIO, TextIOWrapper
+from PIL import Image, ImageOps, UnidentifiedImageError
 import json
 import base64
-from sqlalchemy import create_engine
+import csv
+import re
+import zipfile
+import hashlib
+import hmac
+import struct
+import threading
+import time
+import queue
+import atexit
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from functools import wraps
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Load environment variables from .env file
 load_dotenv()
@@ -42,30 +67,348 @@ app.wsgi_app = ProxyFix(
     app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1
 )
 
-app.config['SECRET_KEY'] = os.environ.get(
-    'SECRET_KEY', 'urvoic-secret-key-change-in-production')
+DEFAULT_SECRET_KEY = 'urvoic-secret-key-change-in-production'
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', DEFAULT_SECRET_KEY)
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SQLALCHEMY_POOL_SIZE'] = 5
 app.config['SQLALCHEMY_MAX_OVERFLOW'] = 5
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
+app.config['STATS_CACHE_TTL'] = int(os.environ.get('STATS_CACHE_TTL', 30))
+app.config['RESIDENT_DIRECTORY_CACHE_TTL'] = int(os.environ.get('RESIDENT_DIRECTORY_CACHE_TTL', 600))
+# Werkzeug method string for new hashes; older hashes are upgraded on the next successful login
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+# Forked process pools keep the interpreter from exiting under eventlet/gevent monkey patching
+# (wsgi.py), which hangs gunicorn restarts, so green workers default to inline CPU work
+PROCESS_POOL_WORKERS = (max(1, (os.cpu_count() or 2) // 2)
+                        if hasattr(os, 'fork') and os.environ.get('SOCKETIO_ASYNC_MODE', 'threading') == 'threading'
+                        else 0)
+# Hashing runs in this many worker processes (0 hashes inline on the request thread)
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', PROCESS_POOL_WORKERS))
+# Logins, signups and resets admitted per second from one client IP before answering 429 (0 disables it)
+app.config['PASSWORD_HASH_RATE'] = float(os.environ.get('PASSWORD_HASH_RATE', 5))
+app.config['PASSWORD_HASH_CLIENTS'] = int(os.environ.get('PASSWORD_HASH_CLIENTS', 10000))
+app.config['PASSWORD_HASH_TIMEOUT'] = int(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+app.config['USER_CACHE_TTL'] = int(os.environ.get('USER_CACHE_TTL', 300))
+app.config['USER_CACHE_SIZE'] = int(os.environ.get('USER_CACHE_SIZE', 10000))
+# Version ETags also roll over this often, bounding staleness from writes made in other processes
+app.config['ETAG_MAX_AGE'] = int(os.environ.get('ETAG_MAX_AGE', 600))
+app.config['ACTIVITY_LOG_FLUSH_MS'] = int(os.environ.get('ACTIVITY_LOG_FLUSH_MS', 200))
+app.config['ACTIVITY_LOG_BATCH_SIZE'] = int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', 100))
+app.config['ACTIVITY_LOG_QUEUE_SIZE'] = int(os.environ.get('ACTIVITY_LOG_QUEUE_SIZE', 10000))
+app.config['CHAT_WRITE_FLUSH_MS'] = int(os.environ.get('CHAT_WRITE_FLUSH_MS', 2))
+app.config['CHAT_WRITE_BATCH_SIZE'] = int(os.environ.get('CHAT_WRITE_BATCH_SIZE', 200))
+app.config['CHAT_WRITE_QUEUE_SIZE'] = int(os.environ.get('CHAT_WRITE_QUEUE_SIZE', 5000))
+app.config['CHAT_ACK_TIMEOUT'] = int(os.environ.get('CHAT_ACK_TIMEOUT', 10))
+app.config['CHAT_GROUP_CACHE_SIZE'] = int(os.environ.get('CHAT_GROUP_CACHE_SIZE', 10000))
+# 'threading' is the development server; wsgi.py switches production to eventlet or gevent
+app.config['SOCKETIO_ASYNC_MODE'] = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+app.config['SOCKETIO_TRANSPORTS'] = os.environ.get(
+    'SOCKETIO_TRANSPORTS',
+    'polling,websocket' if app.config['SOCKETIO_ASYNC_MODE'] == 'threading' else 'websocket'
+).split(',')
+app.config['SOCKETIO_PING_INTERVAL'] = int(os.environ.get('SOCKETIO_PING_INTERVAL', 25))
+app.config['SOCKETIO_PING_TIMEOUT'] = int(os.environ.get('SOCKETIO_PING_TIMEOUT', 30))
+app.config['ASSET_MAX_AGE'] = 31536000
+app.config['PHOTO_STORE_DIR'] = os.environ.get('PHOTO_STORE_DIR', os.path.join(app.instance_path, 'photos'))
+# Rendered QR codes kept in memory, by total size; QR_CACHE_DIR also keeps them on disk across restarts
+app.config['QR_CACHE_MAX_BYTES'] = int(os.environ.get('QR_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+app.config['QR_CACHE_DIR'] = os.environ.get('QR_CACHE_DIR') or None
+# Worker processes for bulk pass rendering (0 renders inline)
+app.config['QR_RENDER_WORKERS'] = int(os.environ.get('QR_RENDER_WORKERS', PROCESS_POOL_WORKERS))
+app.config['QR_BULK_MAX_GUESTS'] = int(os.environ.get('QR_BULK_MAX_GUESTS', 1000))
+# Visitor passes are signed with a per-society key derived from this secret. Without QR_PASS_SECRET
+# or a real SECRET_KEY no passes are issued or accepted, since the default key is public.
+app.config['QR_PASS_SECRET'] = os.environ.get('QR_PASS_SECRET') or (
+    app.config['SECRET_KEY'] if app.config['SECRET_KEY'] != DEFAULT_SECRET_KEY else None)
+app.config['QR_PASS_TTL'] = int(os.environ.get('QR_PASS_TTL', 7 * 24 * 3600))
+# Queued offline scans older than this are refused
+app.config['QR_OFFLINE_MAX_AGE'] = int(os.environ.get('QR_OFFLINE_MAX_AGE', 24 * 3600))
+app.config['QR_VERIFY_BATCH_SIZE'] = int(os.environ.get('QR_VERIFY_BATCH_SIZE', 500))
+# Unsigned JSON passes are only accepted for visitors created before this UTC time (e.g. 2026-10-18T00:00)
+app.config['QR_UNSIGNED_BEFORE'] = (datetime.fromisoformat(os.environ['QR_UNSIGNED_BEFORE'])
+                                    if os.environ.get('QR_UNSIGNED_BEFORE') else None)
+# Lets guards download their society's pass key to check passes offline; the key can mint passes too
+app.config['QR_GUARD_PASS_KEYS'] = os.environ.get('QR_GUARD_PASS_KEYS', '0') == '1'
+app.config['PHOTO_MAX_BYTES'] = int(os.environ.get('PHOTO_MAX_BYTES', 5 * 1024 * 1024))
+# Responses smaller than this are sent as-is; the encoding overhead isn't worth it
+app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+# Preferred encodings, best first; brotli is skipped when the package is missing
+app.config['COMPRESS_ALGORITHMS'] = os.environ.get('COMPRESS_ALGORITHMS', 'br,gzip').split(',')
+# Higher levels trade CPU per response for fewer bytes (gzip 1-9, brotli 0-11)
+app.config['COMPRESS_GZIP_LEVEL'] = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))
+app.config['COMPRESS_BROTLI_QUALITY'] = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
 
 @app.after_request
 def add_header(response):
+    if request.endpoint == 'fingerprinted_asset':
+        response.headers['Cache-Control'] = f"public, max-age={app.config['ASSET_MAX_AGE']}, immutable"
+        return response
+    if request.endpoint == 'profile_photo_file' and response.status_code in (200, 304):
+        # Photo URLs are content hashes, so they never change; only signed-in users may fetch them
+        response.headers['Cache-Control'] = f"private, max-age={app.config['ASSET_MAX_AGE']}, immutable"
+        return response
+    if request.endpoint == 'static':
+        # Unversioned static URLs are shared by everyone; revalidate them with their ETag
+        return response
+    if 'ETag' in response.headers:
+        # Let the browser keep a private copy and revalidate it with If-None-Match
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
     response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
     response.headers['Pragma'] = 'no-cache'
     response.headers['Expires'] = '0'
     return response
 
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'text/html', 'text/css', 'text/plain',
+    'text/javascript', 'application/javascript', 'image/svg+xml'
+}
+compression_stats = {}
+_compression_stats_lock = threading.Lock()
+
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=app.config['COMPRESS_GZIP_LEVEL'], mtime=0)
+
+
+def negotiate_encoding():
+    for encoding in app.config['COMPRESS_ALGORITHMS']:
+        if encoding not in ('br', 'gzip') or (encoding == 'br' and brotli is None):
+            continue
+        if request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+@app.after_request
+def compress_response(response):
+    """Compress buffered text responses with the best encoding the client accepts.
+
+    Streamed and file-passthrough responses are left alone so they are never
+    read into memory here.
+    """
+    if (response.mimetype not in COMPRESSIBLE_MIMETYPES or response.direct_passthrough
+            or response.is_streamed or 'Content-Encoding' in response.headers
+            or response.status_code < 200 or response.status_code in (204, 304)):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    encoding = negotiate_encoding()
+    if encoding is None or len(data) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+    
+    compressed = compress_body(data, encoding)
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # Byte-for-byte different from the identity body, so only weakly equal to it
+        response.set_etag(etag, weak=True)
+    
+    with _compression_stats_lock:
+        stats = compression_stats.setdefault(encoding, {'responses': 0, 'bytes_in': 0, 'bytes_out': 0})
+        stats['responses'] += 1
+        stats['bytes_in'] += len(data)
+        stats['bytes_out'] += len(compressed)
+    return response
+
 db = SQLAlchemy(app)
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode=app.config['SOCKETIO_ASYNC_MODE'],
+    transports=app.config['SOCKETIO_TRANSPORTS'],
+    ping_interval=app.config['SOCKETIO_PING_INTERVAL'],
+    ping_timeout=app.config['SOCKETIO_PING_TIMEOUT']
+)
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'index'
 
 
+class SocietyCache:
+    """In-process cache of per-society values that expire after ``ttl`` seconds.
+
+    Entries are dropped by ``invalidate`` once a write that changes them commits.
+    A value computed while an invalidation was in flight is returned but not stored.
+    With ``max_entries`` the least recently used entries are evicted past that size.
+    """
+
+    def __init__(self, ttl, max_entries=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.compute_seconds = 0.0
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, society_id, compute):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(society_id)
+            if entry and entry[0] > now:
+                self.hits += 1
+                self._entries.move_to_end(society_id)
+                return entry[1]
+            self.misses += 1
+            generation = self._generations.get(society_id, 0)
+        
+        value = compute(society_id)
+        elapsed = time.monotonic() - now
+        
+        with self._lock:
+            self.compute_seconds += elapsed
+            if self._generations.get(society_id, 0) == generation:
+                self._entries[society_id] = (now + self.ttl, value)
+                self._entries.move_to_end(society_id)
+                if self.max_entries and len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, society_id):
+        with self._lock:
+            self._generations[society_id] = self._generations.get(society_id, 0) + 1
+            self._entries.pop(society_id, None)
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            for key in self._entries:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            average_compute_ms = self.compute_seconds * 1000 / self.misses if self.misses else None
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'avg_compute_ms': round(average_compute_ms, 3) if average_compute_ms is not None else None,
+                'estimated_saved_ms': round(self.hits * average_compute_ms, 1) if average_compute_ms is not None else None
+            }
+
+
+society_stats_cache = SocietyCache(app.config['STATS_CACHE_TTL'])
+resident_directory_cache = SocietyCache(app.config['RESIDENT_DIRECTORY_CACHE_TTL'])
+user_principal_cache = SocietyCache(app.config['USER_CACHE_TTL'], max_entries=app.config['USER_CACHE_SIZE'])
+
+
+class ResourceVersions:
+    """Generation counters for one kind of read-mostly resource, keyed by society (or user).
+
+    ``invalidate`` bumps a key's generation, so it plugs into
+    ``invalidate_after_commit`` like a ``SocietyCache``. The counters live in
+    this process: a restart changes every ETag through ``_epoch``, and writes
+    from other processes show up once ``ETAG_MAX_AGE`` rolls the ETags over.
+    """
+
+    _epoch = os.urandom(8).hex()
+
+    def __init__(self, name):
+        self.name = name
+        self.not_modified = 0
+        self.modified = 0
+        self.invalidations = 0
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def etag(self, key):
+        generation = self._generations.get(key, 0)
+        period = int(time.time() // app.config['ETAG_MAX_AGE'])
+        user_id = current_user.id if current_user.is_authenticated else None
+        token = f"{self._epoch}:{self.name}:{key}:{generation}:{period}:{user_id}:{request.full_path}"
+        return hashlib.sha1(token.encode()).hexdigest()[:24]
+
+    def invalidate(self, key):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self.invalidations += 1
+
+    def record(self, not_modified):
+        with self._lock:
+            if not_modified:
+                self.not_modified += 1
+            else:
+                self.modified += 1
+
+    def metrics(self):
+        with self._lock:
+            served = self.not_modified + self.modified
+            return {
+                'not_modified': self.not_modified,
+                'modified': self.modified,
+                'not_modified_ratio': round(self.not_modified / served, 3) if served else None,
+                'invalidations': self.invalidations,
+                'keys': len(self._generations)
+            }
+
+
+announcement_versions = ResourceVersions('announcements')
+resident_list_versions = ResourceVersions('residents')
+business_directory_versions = ResourceVersions('businesses')
+user_profile_versions = ResourceVersions('current-user')
+
+# Businesses serve many societies, so the business directory has a single version
+ALL_SOCIETIES = 'all'
+
+
+def conditional_get(versions, key=lambda: current_user.society_id):
+    """Answer a GET with 304 Not Modified when the client already has the current version.
+
+    The ETag comes from the resource's generation counter, the signed-in user
+    and the URL, so a match returns before the view runs any query.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = versions.etag(key())
+            if request.if_none_match.contains_weak(etag):
+                versions.record(not_modified=True)
+                response = app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+            
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                versions.record(not_modified=False)
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate_after_commit(cache, society_id, session=None):
+    """Drop ``society_id`` from ``cache`` once the current transaction commits."""
+    if society_id:
+        (session or db.session).info.setdefault('stale_society_caches', set()).add((cache, society_id))
+
+
+def mark_society_stats_stale(society_id):
+    invalidate_after_commit(society_stats_cache, society_id)
+
+
+@event.listens_for(db.session, 'after_commit')
+def invalidate_stale_society_caches(session):
+    for cache, society_id in session.info.pop('stale_society_caches', ()):
+        cache.invalidate(society_id)
+
+
 @app.context_processor
 def inject_current_user_id():
     if current_user.is_authenticated:
@@ -73,6 +416,67 @@ def inject_current_user_id():
     return {'current_user_id': None}
 
 
+@app.context_processor
+def inject_socketio_transports():
+    return {'socketio_transports': app.config['SOCKETIO_TRANSPORTS']}
+
+
+asset_manifest = {}
+_asset_manifest_lock = threading.Lock()
+
+
+def static_file_path(filename):
+    """Path of a regular file under ``static/``, or None for anything outside it or missing."""
+    path = safe_join(app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        return None
+    return path
+
+
+def asset_url(filename):
+    """URL of a static file with its content hash in the name, e.g. /assets/style.1a2b3c4d5e6f.css.
+
+    The manifest keeps one hash per file and only rehashes a file when its
+    size or modification time changes, so edits show up without a restart.
+    Only real files under ``static/`` are hashed or added to the manifest.
+    """
+    path = static_file_path(filename)
+    try:
+        stat = os.stat(path) if path else None
+    except OSError:
+        stat = None
+    if stat is None:
+        return url_for('static', filename=filename)
+    
+    key = (stat.st_mtime_ns, stat.st_size)
+    entry = asset_manifest.get(filename)
+    if entry is None or entry[0] != key:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        stem, ext = os.path.splitext(filename)
+        entry = (key, digest, f"/assets/{stem}.{digest}{ext}")
+        with _asset_manifest_lock:
+            asset_manifest[filename] = entry
+    return entry[2]
+
+
+app.jinja_env.globals['asset_url'] = asset_url
+
+
+@app.route('/assets/<path:fingerprinted>')
+def fingerprinted_asset(fingerprinted):
+    stem, _, ext = fingerprinted.rpartition('.')
+    stem, _, digest = stem.rpartition('.')
+    filename = f"{stem}.{ext}"
+    # Resolve before asset_url stats or reads anything, so crafted paths never leave static/
+    if not stem or static_file_path(filename) is None:
+        abort(404)
+    # An old hash must not be answered with new content under an immutable header
+    if asset_url(filename) != f"/assets/{fingerprinted}":
+        abort(404)
+    return send_from_directory(app.static_folder, filename, max_age=app.config['ASSET_MAX_AGE'])
+
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -84,28 +488,31 @@ class User(UserMixin, db.Model):
     is_main_admin = db.Column(db.Boolean, default=False)
     is_approved = db.Column(db.Boolean, default=False)
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     flat_number = db.Column(db.String(50))
     business_name = db.Column(db.String(200))
     business_category = db.Column(db.String(100))
     business_description = db.Column(db.Text)
     business_address = db.Column(db.String(500))
-    profile_photo = db.Column(db.Text)
+    # Legacy base64 data-URL; photos now live in the photo store under photo_key
+    profile_photo = db.deferred(db.Column(db.Text))
+    photo_key = db.Column(db.String(40))
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.check(self.password_hash, password)
 
 
 class Society(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(200), nullable=False)
+    name = db.Column(db.String(200), nullable=False, unique=True, index=True)
     address = db.Column(db.String(500), nullable=False)
     city_state_pincode = db.Column(db.String(200), nullable=False)
     total_blocks = db.Column(db.Integer)
     total_flats = db.Column(db.Integer)
-    admin_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    admin_id = db.Column(db.Integer, db.ForeignKey('user.id', use_alter=True))
 
 
 class MaintenanceRequest(db.Model):
@@ -119,6 +526,7 @@ class MaintenanceRequest(db.Model):
     upvotes = db.Column(db.Integer, default=0)
     comments_count = db.Column(db.Integer, default=0)
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'))
     flat_number = db.Column(db.String(50))
     created_by_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     assigned_business_id = db.Column(db.Integer, db.ForeignKey('user.id'))
@@ -127,6 +535,12 @@ class MaintenanceRequest(db.Model):
     engaged = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        db.Index('idx_maintenance_request_society_created', 'society_id', 'created_at'),
+        # Residents see their own requests as well as public ones; businesses see those assigned to them
+        db.Index('idx_maintenance_request_creator_created', 'created_by_id', 'created_at'),
+        db.Index('idx_maintenance_request_business_created', 'assigned_business_id', 'created_at'),
+    )
 
 
 class Review(db.Model):
@@ -136,17 +550,45 @@ class Review(db.Model):
     business_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_by_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     business_comment = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
+class BusinessRatingSummary(db.Model):
+    business_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def histogram(self):
+        return {str(star): getattr(self, f'rating_{star}') or 0 for star in range(1, 6)}
+
+
 class ChatGroup(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     group_type = db.Column(db.String(50), default='custom')
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     created_by_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_message_id = db.Column(db.Integer)
+    last_message_preview = db.Column(db.String(200))
+    last_sender_name = db.Column(db.String(100))
+    last_message_at = db.Column(db.DateTime)
 
 
 class ChatMessage(db.Model):
@@ -156,6 +598,10 @@ class ChatMessage(db.Model):
     sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     sender_name = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('idx_chat_message_group_created', 'group_id', 'created_at'),
+        db.Index('idx_chat_message_group_id', 'group_id', 'id'),
+    )
 
 
 class ActivityLog(db.Model):
@@ -166,7 +612,9 @@ class ActivityLog(db.Model):
     user_name = db.Column(db.String(100))
     user_type = db.Column(db.String(20))
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.Index('idx_activity_log_society_created', 'society_id', 'created_at'),)
 
 
 class Announcement(db.Model):
@@ -174,8 +622,10 @@ class Announcement(db.Model):
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
     society_name = db.Column(db.String(200), nullable=False)
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'))
     created_by_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.Index('idx_announcement_society_created', 'society_id', 'created_at'),)
 
 
 class GuardShift(db.Model):
@@ -183,6 +633,7 @@ class GuardShift(db.Model):
     guard_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     guard_name = db.Column(db.String(100))
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     action = db.Column(db.String(10), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -191,6 +642,7 @@ class BusinessSociety(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     business_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     society_name = db.Column(db.String(200), nullable=False)
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
@@ -203,6 +655,7 @@ class VisitorLog(db.Model):
     purpose = db.Column(db.String(200))
     flat_number = db.Column(db.String(50), nullable=False)
     society_name = db.Column(db.String(200), nullable=False)
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'))
     guard_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     guard_name = db.Column(db.String(100))
     resident_id = db.Column(db.Integer, db.ForeignKey('user.id'))
@@ -219,6 +672,16 @@ class VisitorLog(db.Model):
     expected_date = db.Column(db.String(50))
     expected_time = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('idx_visitor_log_society_created', 'society_id', 'created_at'),
+        db.Index('idx_visitor_log_society_entry', 'society_id', 'entry_time'),
+    )
+
+
+class DailyVisitorCount(db.Model):
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    visitor_count = db.Column(db.Integer, nullable=False, default=0)
 
 
 class FamilyMember(db.Model):
@@ -229,6 +692,7 @@ class FamilyMember(db.Model):
     age = db.Column(db.Integer)
     phone = db.Column(db.String(20))
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     flat_number = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -241,6 +705,7 @@ class Vehicle(db.Model):
     vehicle_model = db.Column(db.String(100))
     vehicle_color = db.Column(db.String(50))
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     flat_number = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -250,6 +715,7 @@ class ShiftReport(db.Model):
     guard_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     guard_name = db.Column(db.String(100))
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     shift_date = db.Column(db.String(50))
     shift_start_time = db.Column(db.DateTime)
     shift_end_time = db.Column(db.DateTime)
@@ -271,16 +737,265 @@ class Payment(db.Model):
     payment_method = db.Column(db.String(50))
     description = db.Column(db.Text)
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'))
     status = db.Column(db.String(20), default='pending')
     due_date = db.Column(db.String(50))
     paid_date = db.Column(db.DateTime)
     maintenance_request_id = db.Column(db.Integer, db.ForeignKey('maintenance_request.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('idx_payment_society_created', 'society_id', 'created_at'),
+        db.Index('idx_payment_society_type_due', 'society_id', 'payment_type', 'due_date', 'created_at'),
+        db.Index('idx_payment_payer_created', 'payer_id', 'created_at'),
+        db.Index('idx_payment_payee_created', 'payee_id', 'created_at'),
+        # One maintenance bill per flat per month, so re-running billing cannot double-bill
+        db.Index('uq_payment_maintenance_bill', 'society_id', 'payer_id', 'payment_type', 'due_date',
+                 unique=True,
+                 sqlite_where=db.text("payment_type = 'maintenance'"),
+                 postgresql_where=db.text("payment_type = 'maintenance'")),
+    )
+
+
+class MonthlyDuesSummary(db.Model):
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), primary_key=True)
+    month = db.Column(db.String(50), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    bill_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Float, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (db.Index('idx_monthly_dues_society_created', 'society_id', 'created_at'),)
+
+
+def background_process_pool(workers):
+    """A forked process pool for CPU-heavy work, niced so request threads preempt it.
+
+    Workers only run module-level functions on plain arguments, so forking
+    needs no app re-import.
+    """
+    return ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context('fork'),
+        initializer=os.nice,
+        initargs=(10,)
+    )
+
+
+class PasswordHashingUnavailable(Exception):
+    """The hashing pool timed out or broke; answered with 503 by ``password_hashing_unavailable``."""
+
+
+class PasswordHasher:
+    """Runs password hashing in a small process pool behind a per-client admission limit.
+
+    Hashing is deliberately CPU-heavy; on the request threads a burst of logins
+    would take the CPU from chat and gate events. ``workers`` caps how many
+    cores hashing can use, and ``admit`` turns away a client sending more than
+    ``rate`` requests per second, so one noisy client can't lock out the rest.
+    """
+
+    def __init__(self, method, workers, rate, timeout, max_clients=10000):
+        self.method = method
+        self.workers = workers
+        self.rate = rate
+        self.timeout = timeout
+        self.max_clients = max_clients
+        self.hashes = 0
+        self.checks = 0
+        self.upgrades = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.pending = 0
+        self.busy_seconds = 0.0
+        self.failures = 0
+        self._buckets = OrderedDict()
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def admit(self, client):
+        """Take one token from ``client``'s bucket; False means answer 429.
+
+        Buckets are kept for the ``max_clients`` most recent clients; a client
+        that is evicted simply starts again with a full bucket.
+        """
+        with self._lock:
+            if not self.rate:
+                self.admitted += 1
+                return True
+            now = time.monotonic()
+            tokens, refilled = self._buckets.pop(client, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - refilled) * self.rate)
+            admitted = tokens >= 1
+            self._buckets[client] = (tokens - 1 if admitted else tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            if admitted:
+                self.admitted += 1
+            else:
+                self.rejected += 1
+            return admitted
+
+    def hash(self, password):
+        with self._lock:
+            self.hashes += 1
+        return self._run(generate_password_hash, password, self.method)
+
+    def check(self, pwhash, password):
+        with self._lock:
+            self.checks += 1
+        return self._run(check_password_hash, pwhash, password)
+
+    def upgrade(self, user, password):
+        """Rehash ``user``'s verified password if it was hashed with an older method."""
+        if user.password_hash.split('$', 1)[0] == self.method:
+            return False
+        user.password_hash = self.hash(password)
+        with self._lock:
+            self.upgrades += 1
+        return True
+
+    def _run(self, function, *args):
+        start = time.monotonic()
+        with self._lock:
+            self.pending += 1
+        try:
+            if not self.workers:
+                return function(*args)
+            pool = self._executor()
+            future = pool.submit(function, *args)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                with self._lock:
+                    self.failures += 1
+                raise PasswordHashingUnavailable('password hashing timed out')
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next request
+            with self._lock:
+                self.failures += 1
+                if self._pool is pool:
+                    self._pool = None
+            raise PasswordHashingUnavailable('password hashing pool broke')
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.busy_seconds += time.monotonic() - start
+
+    def _executor(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = background_process_pool(self.workers)
+        return self._pool
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def metrics(self):
+        with self._lock:
+            operations = self.hashes + self.checks
+            return {
+                'method': self.method,
+                'workers': self.workers,
+                'rate_per_second': self.rate,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'clients': len(self._buckets),
+                'pending': self.pending,
+                'failures': self.failures,
+                'hashes': self.hashes,
+                'checks': self.checks,
+                'upgrades': self.upgrades,
+                'avg_ms': round(self.busy_seconds * 1000 / operations, 1) if operations else None
+            }
+
+
+password_hasher = PasswordHasher(
+    app.config['PASSWORD_HASH_METHOD'],
+    app.config['PASSWORD_HASH_WORKERS'],
+    app.config['PASSWORD_HASH_RATE'],
+    app.config['PASSWORD_HASH_TIMEOUT'],
+    app.config['PASSWORD_HASH_CLIENTS']
+)
+atexit.register(password_hasher.shutdown)
+
+
+def password_hashing_busy():
+    response = jsonify({
+        'success': False,
+        'message': 'Too many sign-in requests right now. Please try again in a moment.'
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+@app.errorhandler(PasswordHashingUnavailable)
+def password_hashing_unavailable(e):
+    response = jsonify({
+        'success': False,
+        'message': 'Sign-in is temporarily unavailable. Please try again in a moment.'
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = '5'
+    return response
 
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    values = user_principal_cache.get_or_compute(int(user_id), load_user_principal)
+    return UserPrincipal(values) if values else None
+
+
+def load_user_principal(user_id):
+    row = db.session.execute(
+        db.select(*[getattr(User, field) for field in UserPrincipal.FIELDS]).where(User.id == user_id)
+    ).first()
+    return dict(row._mapping) if row else None
+
+
+class UserPrincipal(UserMixin):
+    """Read-only snapshot of the signed-in user, handed out as ``current_user``.
+
+    Holds the columns nearly every request reads and comes from
+    ``user_principal_cache``, so most requests load no user row at all. Any
+    other attribute is read from ``row``, the full ``User`` loaded on first
+    use; endpoints that change the user must write through ``row``.
+    """
+
+    FIELDS = (
+        'id', 'email', 'full_name', 'phone', 'user_type', 'role', 'is_main_admin',
+        'is_approved', 'society_name', 'society_id', 'flat_number', 'business_name', 'photo_key'
+    )
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+        self.__dict__['_row'] = None
+
+    @property
+    def row(self):
+        if self._row is None:
+            self.__dict__['_row'] = db.session.get(User, self.id)
+        return self._row
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.row, name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"current_user is read-only; set current_user.row.{name} instead")
+
+
+@event.listens_for(db.session, 'before_flush')
+def mark_changed_user_principals_stale(session, flush_context, instances):
+    """Promotions, approvals, transfers and profile edits all reach the cache through here."""
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and (obj in session.deleted or session.is_modified(obj)):
+            invalidate_after_commit(user_principal_cache, obj.id, session)
 
 
 class PasswordResetToken(db.Model):
@@ -298,6 +1013,7 @@ class ApprovalRequest(db.Model):
     requester_email = db.Column(db.String(120), nullable=False)
     user_type = db.Column(db.String(20), nullable=False)
     society_name = db.Column(db.String(200), nullable=False)
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     status = db.Column(db.String(20), default='pending')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     handled_by_id = db.Column(db.Integer, db.ForeignKey('user.id'))
@@ -314,7 +1030,12 @@ class Notification(db.Model):
     is_read = db.Column(db.Boolean, default=False)
     related_id = db.Column(db.Integer)
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        db.Index('idx_notification_user_read', 'user_id', 'is_read'),
+        db.Index('idx_notification_user_created', 'user_id', 'created_at'),
+    )
 
 
 class MaintenanceComment(db.Model):
@@ -334,6 +1055,7 @@ class BusinessBooking(db.Model):
     scheduled_time = db.Column(db.String(50))
     status = db.Column(db.String(20), default='New')
     society_name = db.Column(db.String(200))
+    society_id = db.Column(db.Integer, db.ForeignKey('society.id'), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -368,8 +1090,30 @@ def index():
     return render_template('index.html')
 
 
+def resolve_society_id(society_name):
+    """Map a society name to its Society id, or None if no such society exists.
+
+    Only /api/register-society creates societies. Rows saved under a name
+    that is not registered yet keep a null ``society_id`` and are adopted by
+    the society when its admin registers it.
+    """
+    if not society_name:
+        return None
+    return db.session.scalar(db.select(Society.id).where(Society.name == society_name))
+
+
+def adopt_society_members(society):
+    """Point signups and business links made before ``society`` was registered at it."""
+    for model in (User, ApprovalRequest, BusinessSociety):
+        for row in model.query.filter(model.society_name == society.name, model.society_id == None):
+            row.society_id = society.id
+
+
 @app.route('/api/signup', methods=['POST'])
 def signup():
+    if not password_hasher.admit(request.remote_addr):
+        return password_hashing_busy()
+    
     data = request.get_json()
 
     if User.query.filter_by(email=data['email']).first():
@@ -387,6 +1131,7 @@ def signup():
                 user_type=data['user_type'],
                 role=data.get('role', 'resident'),
                 society_name=data.get('society_name'),
+                society_id=resolve_society_id(data.get('society_name')),
                 flat_number=data.get('flat_number'),
                 business_name=data.get('business_name'),
                 business_category=data.get('business_category'),
@@ -403,7 +1148,8 @@ def signup():
         for society_name in data['societies']:
             business_society = BusinessSociety(
                 business_id=user.id,
-                society_name=society_name
+                society_name=society_name,
+                society_id=resolve_society_id(society_name)
             )
             db.session.add(business_society)
         db.session.commit()
@@ -415,7 +1161,8 @@ def signup():
             requester_name=user.full_name,
             requester_email=user.email,
             user_type=user.user_type,
-            society_name=data.get('society_name', '')
+            society_name=data.get('society_name', ''),
+            society_id=user.society_id
         )
         db.session.add(approval_request)
         db.session.commit()
@@ -452,9 +1199,14 @@ def signup():
 
 @app.route('/api/login', methods=['POST'])
 def login():
+    if not password_hasher.admit(request.remote_addr):
+        return password_hashing_busy()
+    
     data = request.get_json()
 
     user = User.query.filter_by(email=data['email']).first()
+    # Don't hold a pooled connection while the hash is checked; the user stays loaded, just detached
+    db.session.close()
 
     if not user or not user.check_password(data['password']):
         return jsonify({
@@ -469,6 +1221,10 @@ def login():
             'is_approved': False
         }), 403
 
+    if password_hasher.upgrade(user, data['password']):
+        db.session.add(user)
+        db.session.commit()
+
     session.permanent = True
     login_user(user, remember=True)
 
@@ -522,6 +1278,9 @@ def forgot_password():
 
 @app.route('/api/reset-password', methods=['POST'])
 def reset_password():
+    if not password_hasher.admit(request.remote_addr):
+        return password_hashing_busy()
+    
     data = request.get_json()
     token = data.get('token')
     new_password = data.get('new_password')
@@ -564,6 +1323,9 @@ def reset_password():
 
 @app.route('/api/register-society', methods=['POST'])
 def register_society():
+    if not password_hasher.admit(request.remote_addr):
+        return password_hashing_busy()
+    
     data = request.get_json()
 
     if User.query.filter_by(email=data['admin_email']).first():
@@ -572,6 +1334,14 @@ def register_society():
             'message': 'Email already registered'
         }), 400
 
+    # Names are the lookup key for signups and business links, so each may have one admin
+    society = Society.query.filter_by(name=data['society_name']).first()
+    if society and society.admin_id is not None:
+        return jsonify({
+            'success': False,
+            'message': 'A society with this name is already registered'
+        }), 409
+
     admin = User(email=data['admin_email'],
                  full_name=data['admin_name'],
                  phone=data['admin_phone'],
@@ -584,16 +1354,29 @@ def register_society():
     admin.set_password(data['password'])
 
     db.session.add(admin)
-    db.session.commit()
-
-    society = Society(name=data['society_name'],
-                      address=data['address'],
-                      city_state_pincode=data['city_state_pincode'],
-                      total_blocks=data['total_blocks'],
-                      total_flats=data['total_flats'],
-                      admin_id=admin.id)
+    db.session.flush()
+
+    # Claim a placeholder row the ADD_SOCIETY_ID migration made for a name already in use
+    if not society:
+        society = Society(name=data['society_name'])
+    society.address = data['address']
+    society.city_state_pincode = data['city_state_pincode']
+    society.total_blocks = data['total_blocks']
+    society.total_flats = data['total_flats']
+    society.admin_id = admin.id
+    try:
+        with db.session.begin_nested():
+            db.session.add(society)
+    except IntegrityError:
+        # Another admin registered the same name first
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'A society with this name is already registered'
+        }), 409
 
-    db.session.add(society)
+    admin.society_id = society.id
+    adopt_society_members(society)
     db.session.commit()
 
     session.permanent = True
@@ -617,7 +1400,11 @@ def register_society():
 
 @app.route('/api/current-user')
 @login_required
+@conditional_get(user_profile_versions, key=lambda: current_user.id)
 def current_user_info():
+    # Only business accounts carry the long business profile fields
+    business = current_user.row if current_user.user_type == 'business' else None
+    
     return jsonify({
         'success': True,
         'user': {
@@ -631,11 +1418,12 @@ def current_user_info():
             'is_approved': current_user.is_approved,
             'society_name': current_user.society_name,
             'flat_number': current_user.flat_number,
-            'profile_photo': current_user.profile_photo,
+            'profile_photo': profile_photo_url(current_user.photo_key),
+            'profile_photos': profile_photo_urls(current_user.photo_key),
             'business_name': current_user.business_name,
-            'business_category': current_user.business_category,
-            'business_description': current_user.business_description,
-            'business_address': current_user.business_address
+            'business_category': business.business_category if business else None,
+            'business_description': business.business_description if business else None,
+            'business_address': business.business_address if business else None
         }
     })
 
@@ -652,7 +1440,7 @@ def promote_user():
     data = request.get_json()
     user = User.query.get(data['user_id'])
 
-    if not user or user.society_name != current_user.society_name:
+    if not user or user.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'User not found'
@@ -680,7 +1468,7 @@ def demote_user():
     data = request.get_json()
     user = User.query.get(data['user_id'])
 
-    if not user or user.society_name != current_user.society_name:
+    if not user or user.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'User not found'
@@ -713,13 +1501,13 @@ def transfer_main_admin():
     data = request.get_json()
     new_admin = User.query.get(data['user_id'])
 
-    if not new_admin or new_admin.society_name != current_user.society_name:
+    if not new_admin or new_admin.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'User not found'
         }), 404
 
-    current_user.is_main_admin = False
+    current_user.row.is_main_admin = False
     new_admin.role = 'admin'
     new_admin.is_main_admin = True
 
@@ -745,6 +1533,7 @@ def create_maintenance_request():
         description=data['description'],
         request_type=data['request_type'],
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         flat_number=current_user.flat_number,
         created_by_id=current_user.id,
         status='pending',
@@ -753,6 +1542,7 @@ def create_maintenance_request():
     )
 
     db.session.add(request_obj)
+    mark_society_stats_stale(request_obj.society_id)
     db.session.commit()
 
     return jsonify({
@@ -762,41 +1552,103 @@ def create_maintenance_request():
     })
 
 
-@app.route('/api/maintenance-requests', methods=['GET'])
-@login_required
-def get_maintenance_requests():
-    request_type = request.args.get('type')
-    status = request.args.get('status')
+def parse_keyset_cursor(raw):
+    """Parse an ``after`` cursor of the form ``<created_at iso>,<id>``."""
+    if not raw:
+        return None
+    try:
+        created_at, row_id = raw.rsplit(',', 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_page_limit(default=50, maximum=200):
+    """Read ``?limit=`` clamped to 1..``maximum``, falling back to ``default``."""
+    try:
+        return min(max(int(request.args.get('limit', default)), 1), maximum)
+    except (ValueError, TypeError):
+        return default
+
+
+def keyset_page_query(query, created_col, id_col, cursor, limit):
+    """Order newest-first past ``cursor`` and limit to one page plus one row to detect more."""
+    if cursor:
+        created_at, row_id = cursor
+        query = query.filter(
+            (created_col < created_at) |
+            ((created_col == created_at) & (id_col < row_id))
+        )
+    return query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def apply_keyset_page(query, created_col, id_col, cursor, limit):
+    """Fetch one page of ``keyset_page_query``."""
+    return keyset_page_query(query, created_col, id_col, cursor, limit).all()
 
-    query = MaintenanceRequest.query
 
-    if current_user.user_type == 'resident':
-        if current_user.role == 'admin':
-            query = query.filter_by(society_name=current_user.society_name)
+def keyset_cursor_for(created_at, row_id):
+    return f"{created_at.isoformat() if created_at else ''},{row_id}"
+
+
+def maintenance_request_filters(user, request_type=None, status=None):
+    """WHERE clauses for the maintenance requests ``user`` may list, shared by a page and its totals."""
+    filters = []
+    if user.user_type == 'resident':
+        if user.role == 'admin':
+            filters.append(MaintenanceRequest.society_id == user.society_id)
         else:
-            query = query.filter(
-                (MaintenanceRequest.created_by_id == current_user.id) |
+            filters.append(
+                (MaintenanceRequest.created_by_id == user.id) |
                 ((MaintenanceRequest.request_type == 'public') & 
-                 (MaintenanceRequest.society_name == current_user.society_name))
+                 (MaintenanceRequest.society_id == user.society_id))
             )
-    elif current_user.user_type == 'business':
-        query = query.filter_by(assigned_business_id=current_user.id)
+    elif user.user_type == 'business':
+        filters.append(MaintenanceRequest.assigned_business_id == user.id)
 
     if request_type:
-        query = query.filter_by(request_type=request_type)
+        filters.append(MaintenanceRequest.request_type == request_type)
     if status:
-        query = query.filter_by(status=status)
+        filters.append(MaintenanceRequest.status == status)
+    return filters
+
+
+def maintenance_request_list_query(filters):
+    """Requests matching ``filters`` with the assigned business's name."""
+    return db.session.query(MaintenanceRequest, User.business_name).outerjoin(
+        User, User.id == MaintenanceRequest.assigned_business_id
+    ).filter(*filters)
+
+
+def maintenance_request_count_query(filters):
+    return db.session.query(db.func.count(MaintenanceRequest.id)).filter(*filters)
+
+
+@app.route('/api/maintenance-requests', methods=['GET'])
+@login_required
+def get_maintenance_requests():
+    """One page of maintenance requests; ``?totals=1`` adds the count of every matching request."""
+    request_type = request.args.get('type')
+    status = request.args.get('status')
+    limit = parse_page_limit()
+
+    after = request.args.get('after')
+    cursor = parse_keyset_cursor(after)
+    if after and not cursor:
+        return jsonify({
+            'success': False,
+            'message': 'Invalid cursor'
+        }), 400
+
+    filters = maintenance_request_filters(current_user, request_type, status)
+    query = maintenance_request_list_query(filters)
 
-    requests = query.order_by(MaintenanceRequest.created_at.desc()).all()
+    rows = apply_keyset_page(query, MaintenanceRequest.created_at, MaintenanceRequest.id, cursor, limit)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
     result_list = []
-    for req in requests:
-        assigned_business_name = None
-        if req.assigned_business_id:
-            business = User.query.get(req.assigned_business_id)
-            if business:
-                assigned_business_name = business.business_name
-        
+    for req, assigned_business_name in rows:
         result_list.append({
             'id': req.id,
             'title': req.title,
@@ -814,10 +1666,22 @@ def get_maintenance_requests():
             'created_at': req.created_at.isoformat() if req.created_at else None
         })
 
-    return jsonify({
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1][0]
+        next_cursor = keyset_cursor_for(last.created_at, last.id)
+
+    result = {
         'success': True,
-        'requests': result_list
-    })
+        'requests': result_list,
+        'next_cursor': next_cursor
+    }
+    if request.args.get('totals') == '1':
+        result['totals'] = {
+            'count': maintenance_request_count_query(filters).scalar()
+        }
+
+    return jsonify(result)
 
 
 @app.route('/api/maintenance-requests/<int:request_id>/engage', methods=['POST'])
@@ -837,7 +1701,7 @@ def engage_request(request_id):
             'message': 'Only residents can engage requests'
         }), 403
 
-    if maintenance_request.society_name != current_user.society_name:
+    if maintenance_request.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'Unauthorized'
@@ -871,7 +1735,7 @@ def assign_to_business(request_id):
         }), 404
 
     if maintenance_request.request_type == 'public':
-        if current_user.role != 'admin' or maintenance_request.society_name != current_user.society_name:
+        if current_user.role != 'admin' or maintenance_request.society_id != current_user.society_id:
             return jsonify({
                 'success': False,
                 'message': 'Only admins can assign public requests'
@@ -892,6 +1756,7 @@ def assign_to_business(request_id):
 
     maintenance_request.assigned_business_id = business.id
     maintenance_request.status = 'pending'
+    mark_society_stats_stale(maintenance_request.society_id)
     db.session.commit()
 
     return jsonify({
@@ -921,6 +1786,7 @@ def approve_request(request_id):
     maintenance_request.status = 'in_progress'
     maintenance_request.scheduled_date = data.get('scheduled_date')
     maintenance_request.scheduled_time = data.get('scheduled_time')
+    mark_society_stats_stale(maintenance_request.society_id)
     db.session.commit()
 
     return jsonify({
@@ -948,6 +1814,7 @@ def deny_request(request_id):
 
     maintenance_request.assigned_business_id = None
     maintenance_request.status = 'pending'
+    mark_society_stats_stale(maintenance_request.society_id)
     db.session.commit()
 
     return jsonify({
@@ -974,6 +1841,7 @@ def complete_request(request_id):
         }), 403
 
     maintenance_request.status = 'completed'
+    mark_society_stats_stale(maintenance_request.society_id)
     db.session.commit()
 
     return jsonify({
@@ -989,13 +1857,14 @@ def update_request_status(request_id):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     maintenance_request = MaintenanceRequest.query.get(request_id)
-    if not maintenance_request or maintenance_request.society_name != current_user.society_name:
+    if not maintenance_request or maintenance_request.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Request not found'}), 404
     
     data = request.get_json()
     new_status = data.get('status', maintenance_request.status)
     maintenance_request.status = new_status
     maintenance_request.current_status = new_status
+    mark_society_stats_stale(maintenance_request.society_id)
     db.session.commit()
     
     log_activity('Request Status Updated', f"Changed status of '{maintenance_request.title}' to {maintenance_request.status}", current_user)
@@ -1005,7 +1874,7 @@ def update_request_status(request_id):
         'title': maintenance_request.title,
         'status': maintenance_request.status,
         'current_status': maintenance_request.current_status
-    }, room=f"society_{current_user.society_name}")
+    }, room=f"society_{current_user.society_id}")
     
     return jsonify({'success': True, 'message': 'Status updated successfully'})
 
@@ -1017,10 +1886,11 @@ def delete_maintenance_request(request_id):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     maintenance_request = MaintenanceRequest.query.get(request_id)
-    if not maintenance_request or maintenance_request.society_name != current_user.society_name:
+    if not maintenance_request or maintenance_request.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Request not found'}), 404
     
     db.session.delete(maintenance_request)
+    mark_society_stats_stale(maintenance_request.society_id)
     db.session.commit()
     
     log_activity('Request Deleted', f"Deleted maintenance request '{maintenance_request.title}'", current_user)
@@ -1038,7 +1908,7 @@ def get_users():
         }), 403
 
     user_type = request.args.get('type')
-    query = User.query.filter_by(society_name=current_user.society_name)
+    query = User.query.filter_by(society_id=current_user.society_id)
 
     if user_type:
         query = query.filter_by(user_type=user_type)
@@ -1064,23 +1934,21 @@ def get_users():
 
 @app.route('/api/businesses', methods=['GET'])
 @login_required
+@conditional_get(business_directory_versions, key=lambda: ALL_SOCIETIES)
 def get_businesses():
-    business_societies = BusinessSociety.query.filter_by(
-        society_name=current_user.society_name
-    ).all()
-    
-    business_ids = [bs.business_id for bs in business_societies]
+    society_business_ids = db.select(BusinessSociety.business_id).where(
+        BusinessSociety.society_id == current_user.society_id
+    )
     
-    businesses = User.query.filter(
-        User.id.in_(business_ids),
+    rows = db.session.query(User, BusinessRatingSummary).outerjoin(
+        BusinessRatingSummary, BusinessRatingSummary.business_id == User.id
+    ).filter(
+        User.id.in_(society_business_ids),
         User.user_type == 'business'
     ).all()
     
     business_list = []
-    for business in businesses:
-        avg_rating = db.session.query(db.func.avg(Review.rating)).filter_by(business_id=business.id).scalar()
-        review_count = Review.query.filter_by(business_id=business.id).count()
-        
+    for business, summary in rows:
         business_list.append({
             'id': business.id,
             'business_name': business.business_name,
@@ -1089,8 +1957,8 @@ def get_businesses():
             'business_address': business.business_address,
             'phone': business.phone,
             'email': business.email,
-            'average_rating': round(avg_rating, 1) if avg_rating else 0,
-            'review_count': review_count
+            'average_rating': summary.average_rating if summary else 0,
+            'review_count': summary.review_count if summary else 0
         })
 
     return jsonify({
@@ -1099,6 +1967,69 @@ def get_businesses():
     })
 
 
+def record_business_rating(business_id, rating):
+    """Fold one new review into the business's rating summary.
+
+    Runs inside the caller's transaction so the summary commits together
+    with the review row.
+    """
+    histogram_column = getattr(BusinessRatingSummary, f'rating_{rating}')
+    increment = {
+        BusinessRatingSummary.review_count: BusinessRatingSummary.review_count + 1,
+        BusinessRatingSummary.rating_sum: BusinessRatingSummary.rating_sum + rating,
+        histogram_column: histogram_column + 1,
+        BusinessRatingSummary.updated_at: datetime.utcnow()
+    }
+    updated = BusinessRatingSummary.query.filter_by(business_id=business_id).update(
+        increment, synchronize_session=False
+    )
+    if updated:
+        return
+    
+    summary = BusinessRatingSummary(business_id=business_id, review_count=1, rating_sum=rating)
+    for star in range(1, 6):
+        setattr(summary, f'rating_{star}', 1 if star == rating else 0)
+    try:
+        with db.session.begin_nested():
+            db.session.add(summary)
+    except IntegrityError:
+        # A concurrent first review created the summary row first
+        BusinessRatingSummary.query.filter_by(business_id=business_id).update(
+            increment, synchronize_session=False
+        )
+
+
+def rebuild_rating_summaries():
+    """Recompute every business rating summary from the review table."""
+    BusinessRatingSummary.query.delete()
+    
+    columns = [
+        Review.business_id,
+        db.func.count(Review.id),
+        db.func.sum(Review.rating)
+    ] + [
+        db.func.sum(db.case((Review.rating == star, 1), else_=0)) for star in range(1, 6)
+    ]
+    totals = db.select(*columns).where(
+        Review.rating.between(1, 5)
+    ).group_by(Review.business_id)
+    
+    db.session.execute(db.insert(BusinessRatingSummary).from_select(
+        ['business_id', 'review_count', 'rating_sum',
+         'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5'],
+        totals
+    ))
+    db.session.commit()
+    return BusinessRatingSummary.query.count()
+
+
+@app.cli.command('rebuild-rating-summaries')
+def rebuild_rating_summaries_command():
+    """Recompute business rating summaries from scratch."""
+    count = rebuild_rating_summaries()
+    print(f"✅ Rebuilt rating summaries for {count} businesses")
+
+
 @app.route('/api/reviews', methods=['POST'])
 @login_required
 def create_review():
@@ -1111,21 +2042,33 @@ def create_review():
             'message': 'Business not found'
         }), 404
     
-    if business.society_name != current_user.society_name:
+    if business.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'Unauthorized'
         }), 403
     
+    try:
+        rating = int(data['rating'])
+    except (ValueError, TypeError):
+        rating = 0
+    if rating < 1 or rating > 5:
+        return jsonify({
+            'success': False,
+            'message': 'Rating must be between 1 and 5'
+        }), 400
+    
     review = Review(
-        rating=data['rating'],
+        rating=rating,
         review_text=data['review_text'],
-        business_id=data['business_id'],
+        business_id=business.id,
         created_by_id=current_user.id,
-        society_name=current_user.society_name
+        society_name=current_user.society_name,
+        society_id=current_user.society_id
     )
     
     db.session.add(review)
+    record_business_rating(business.id, rating)
     db.session.commit()
     
     log_activity('Created Review', f"{current_user.full_name} reviewed a business", current_user)
@@ -1145,14 +2088,14 @@ def get_reviews():
     query = Review.query
     if business_id:
         business = User.query.get(business_id)
-        if not business or business.society_name != current_user.society_name:
+        if not business or business.society_id != current_user.society_id:
             return jsonify({
                 'success': False,
                 'message': 'Unauthorized'
             }), 403
         query = query.filter_by(business_id=business_id)
     else:
-        query = query.filter_by(society_name=current_user.society_name)
+        query = query.filter_by(society_id=current_user.society_id)
     
     reviews = query.order_by(Review.created_at.desc()).all()
     
@@ -1206,6 +2149,7 @@ def create_chat_group():
         name=data['name'],
         group_type='custom',
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         created_by_id=current_user.id
     )
     
@@ -1225,7 +2169,7 @@ def create_chat_group():
 @login_required
 def get_chat_groups():
     society_group = ChatGroup.query.filter_by(
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         group_type='society'
     ).first()
     
@@ -1233,12 +2177,13 @@ def get_chat_groups():
         society_group = ChatGroup(
             name=f"{current_user.society_name} - Entire Society",
             group_type='society',
-            society_name=current_user.society_name
+            society_name=current_user.society_name,
+            society_id=current_user.society_id
         )
         db.session.add(society_group)
         db.session.commit()
     
-    groups = ChatGroup.query.filter_by(society_name=current_user.society_name).all()
+    groups = ChatGroup.query.filter_by(society_id=current_user.society_id).all()
     
     return jsonify({
         'success': True,
@@ -1251,6 +2196,37 @@ def get_chat_groups():
     })
 
 
+def post_chat_message(group_id, sender, text):
+    """Add a chat message and move its group's last-message pointer in the caller's transaction."""
+    message = ChatMessage(
+        message=text,
+        group_id=group_id,
+        sender_id=sender.id,
+        sender_name=sender.full_name,
+        created_at=datetime.utcnow()
+    )
+    db.session.add(message)
+    db.session.flush()
+    advance_chat_group_pointer(message)
+    return message
+
+
+def advance_chat_group_pointer(message):
+    """Point ``message``'s group at it unless the group already points at a newer message.
+
+    The pointer only moves forward, so concurrent writers leave it on the newest message.
+    """
+    ChatGroup.query.filter(
+        ChatGroup.id == message.group_id,
+        (ChatGroup.last_message_id == None) | (ChatGroup.last_message_id < message.id)
+    ).update({
+        ChatGroup.last_message_id: message.id,
+        ChatGroup.last_message_preview: message.message[:200],
+        ChatGroup.last_sender_name: message.sender_name,
+        ChatGroup.last_message_at: message.created_at
+    }, synchronize_session=False)
+
+
 @app.route('/api/chat/messages', methods=['POST'])
 @login_required
 def send_message():
@@ -1263,21 +2239,15 @@ def send_message():
             'message': 'Group not found'
         }), 404
     
-    if group.society_name != current_user.society_name:
+    if group.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'Unauthorized'
         }), 403
     
-    message = ChatMessage(
-        message=data['message'],
-        group_id=data['group_id'],
-        sender_id=current_user.id,
-        sender_name=current_user.full_name
-    )
-    
-    db.session.add(message)
+    message = post_chat_message(group.id, current_user, data['message'])
     db.session.commit()
+    socketio.emit('new_message', chat_message_payload(message), room=f"chat_{group.id}")
     
     return jsonify({
         'success': True,
@@ -1289,11 +2259,8 @@ def send_message():
 @login_required
 def get_messages():
     group_id = request.args.get('group_id')
-    try:
-        limit = int(request.args.get('limit', 50))
-        limit = min(max(limit, 1), 200)
-    except (ValueError, TypeError):
-        limit = 50
+    limit = parse_page_limit()
+    since_id = request.args.get('since_id', type=int)
     
     group = ChatGroup.query.get(group_id)
     if not group:
@@ -1302,17 +2269,13 @@ def get_messages():
             'message': 'Group not found'
         }), 404
     
-    if group.society_name != current_user.society_name:
+    if group.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'Unauthorized'
         }), 403
     
-    messages = ChatMessage.query.filter_by(group_id=group_id).order_by(
-        ChatMessage.created_at.desc()
-    ).limit(limit).all()
-    
-    messages.reverse()
+    messages, has_more = chat_messages_page(group.id, since_id, limit)
     
     return jsonify({
         'success': True,
@@ -1322,17 +2285,51 @@ def get_messages():
             'sender_id': msg.sender_id,
             'sender_name': msg.sender_name,
             'created_at': msg.created_at.isoformat() if msg.created_at else None
-        } for msg in messages]
+        } for msg in messages],
+        'has_more': has_more
     })
 
 
+def chat_messages_query(group_id, since_id=None, limit=50):
+    """The ``limit + 1`` rows behind ``chat_messages_page``; newest first unless ``since_id`` is given."""
+    query = ChatMessage.query.filter(ChatMessage.group_id == group_id)
+    if since_id is not None:
+        return query.filter(ChatMessage.id > since_id).order_by(ChatMessage.id).limit(limit + 1)
+    return query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit + 1)
+
+
+def chat_messages_page(group_id, since_id=None, limit=50):
+    """Messages of a group, oldest first, and whether more are waiting.
+
+    Without ``since_id`` this is the latest ``limit`` messages. With it, only
+    the messages after that id, so pollers download just what they missed.
+    """
+    messages = chat_messages_query(group_id, since_id, limit).all()
+    if since_id is not None:
+        return messages[:limit], len(messages) > limit
+    
+    has_more = len(messages) > limit
+    return list(reversed(messages[:limit])), has_more
+
+
+def chat_message_payload(message):
+    return {
+        'id': message.id,
+        'group_id': message.group_id,
+        'sender_id': message.sender_id,
+        'sender_name': message.sender_name,
+        'message': message.message,
+        'created_at': message.created_at.isoformat() if message.created_at else None
+    }
+
+
 @app.route('/api/activity-logs', methods=['GET'])
 @login_required
 def get_activity_logs():
     limit = request.args.get('limit', 20, type=int)
     context = request.args.get('context')
     
-    query = ActivityLog.query.filter_by(society_name=current_user.society_name)
+    query = ActivityLog.query.filter_by(society_id=current_user.society_id)
     
     if context:
         query = query.filter(ActivityLog.action.ilike(f'{context}%'))
@@ -1370,6 +2367,7 @@ def create_announcement():
         title=data['title'],
         content=data['content'],
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         created_by_id=current_user.id
     )
     
@@ -1378,12 +2376,28 @@ def create_announcement():
     
     log_activity('Published Announcement', f"{current_user.full_name} published '{data['title']}'", current_user)
     
+    resident_ids = db.session.scalars(db.select(User.id).where(
+        User.society_id == current_user.society_id,
+        User.is_approved == True,
+        User.user_type == 'resident',
+        User.id != current_user.id
+    )).all()
+    notify_many(
+        resident_ids,
+        title=f"New Announcement: {announcement.title}",
+        message=announcement.content,
+        notification_type='announcement',
+        society_name=current_user.society_name,
+        society_id=current_user.society_id,
+        related_id=announcement.id
+    )
+    
     socketio.emit('new_announcement', {
         'id': announcement.id,
         'title': announcement.title,
         'content': announcement.content,
         'created_at': announcement.created_at.isoformat() if announcement.created_at else None
-    }, room=f"society_{current_user.society_name}")
+    }, room=f"society_{current_user.society_id}")
     
     return jsonify({
         'success': True,
@@ -1394,9 +2408,10 @@ def create_announcement():
 
 @app.route('/api/announcements', methods=['GET'])
 @login_required
+@conditional_get(announcement_versions)
 def get_announcements():
     announcements = Announcement.query.filter_by(
-        society_name=current_user.society_name
+        society_id=current_user.society_id
     ).order_by(Announcement.created_at.desc()).all()
     
     return jsonify({
@@ -1425,6 +2440,7 @@ def record_shift():
         guard_id=current_user.id,
         guard_name=current_user.full_name,
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         action=data['action']
     )
     
@@ -1449,7 +2465,7 @@ def get_shift_history():
     if current_user.role == 'guard':
         query = query.filter_by(guard_id=current_user.id)
     elif current_user.role == 'admin':
-        query = query.filter_by(society_name=current_user.society_name)
+        query = query.filter_by(society_id=current_user.society_id)
         if guard_id:
             query = query.filter_by(guard_id=guard_id)
     else:
@@ -1473,6 +2489,7 @@ def get_shift_history():
 
 @app.route('/api/residents', methods=['GET'])
 @login_required
+@conditional_get(resident_list_versions)
 def get_residents():
     if current_user.role not in ['admin', 'guard']:
         return jsonify({
@@ -1481,7 +2498,7 @@ def get_residents():
         }), 403
     
     residents = User.query.filter_by(
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         user_type='resident'
     ).all()
     
@@ -1507,44 +2524,92 @@ def get_residents_for_guard():
             'message': 'Unauthorized'
         }), 403
     
+    etag, body = resident_directory_cache.get_or_compute(current_user.society_id, build_resident_directory)
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def build_resident_directory(society_id):
+    """Serialize a society's residents with their family members and vehicles.
+
+    Uses one query per table. Returns (etag, JSON body) for ``resident_directory_cache``.
+    """
     residents = User.query.filter_by(
-        society_name=current_user.society_name,
+        society_id=society_id,
         user_type='resident'
-    ).all()
+    ).order_by(User.id).all()
+    
+    family_by_resident = {}
+    for fm in FamilyMember.query.filter_by(society_id=society_id).order_by(FamilyMember.id):
+        family_by_resident.setdefault(fm.resident_id, []).append({
+            'id': fm.id,
+            'name': fm.name,
+            'relationship': fm.relationship,
+            'age': fm.age,
+            'phone': fm.phone
+        })
     
-    result = []
-    for res in residents:
-        family_members = FamilyMember.query.filter_by(resident_id=res.id).all()
-        vehicles = Vehicle.query.filter_by(resident_id=res.id).all()
-        
-        result.append({
+    vehicles_by_resident = {}
+    for v in Vehicle.query.filter_by(society_id=society_id).order_by(Vehicle.id):
+        vehicles_by_resident.setdefault(v.resident_id, []).append({
+            'id': v.id,
+            'vehicle_type': v.vehicle_type,
+            'vehicle_number': v.vehicle_number,
+            'vehicle_model': v.vehicle_model,
+            'vehicle_color': v.vehicle_color
+        })
+    
+    body = json.dumps({
+        'success': True,
+        'residents': [{
             'id': res.id,
             'full_name': res.full_name,
             'email': res.email,
             'phone': res.phone,
             'flat_number': res.flat_number,
             'role': res.role,
-            'profile_photo': res.profile_photo,
-            'family_members': [{
-                'id': fm.id,
-                'name': fm.name,
-                'relationship': fm.relationship,
-                'age': fm.age,
-                'phone': fm.phone
-            } for fm in family_members],
-            'vehicles': [{
-                'id': v.id,
-                'vehicle_type': v.vehicle_type,
-                'vehicle_number': v.vehicle_number,
-                'vehicle_model': v.vehicle_model,
-                'vehicle_color': v.vehicle_color
-            } for v in vehicles]
-        })
-    
-    return jsonify({
-        'success': True,
-        'residents': result
+            'profile_photo': profile_photo_url(res.photo_key, 'small'),
+            'family_members': family_by_resident.get(res.id, []),
+            'vehicles': vehicles_by_resident.get(res.id, [])
+        } for res in residents]
     })
+    return hashlib.sha1(body.encode()).hexdigest(), body
+
+
+@event.listens_for(db.session, 'before_flush')
+def mark_changed_resident_directories_stale(session, flush_context, instances):
+    """Any resident, family member or vehicle write makes its society's cached directory stale."""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            if obj.user_type != 'resident' or (obj in session.dirty and not session.is_modified(obj)):
+                continue
+        elif not isinstance(obj, (FamilyMember, Vehicle)):
+            continue
+        
+        society_ids = {obj.society_id} | set(db.inspect(obj).attrs.society_id.history.deleted or ())
+        for society_id in society_ids:
+            invalidate_after_commit(resident_directory_cache, society_id, session)
+
+
+@event.listens_for(db.session, 'before_flush')
+def bump_changed_resource_versions(session, flush_context, instances):
+    """Bump the version of every conditional-GET resource a pending write touches."""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        
+        is_user = isinstance(obj, User)
+        if is_user and obj.id is not None:
+            invalidate_after_commit(user_profile_versions, obj.id, session)
+        
+        if isinstance(obj, (BusinessSociety, BusinessRatingSummary, Review)) or (is_user and obj.user_type == 'business'):
+            invalidate_after_commit(business_directory_versions, ALL_SOCIETIES, session)
+        elif isinstance(obj, Announcement) or (is_user and obj.user_type == 'resident'):
+            versions = resident_list_versions if is_user else announcement_versions
+            society_ids = {obj.society_id} | set(db.inspect(obj).attrs.society_id.history.deleted or ())
+            for society_id in society_ids:
+                invalidate_after_commit(versions, society_id, session)
 
 
 @app.route('/api/guards', methods=['GET'])
@@ -1557,7 +2622,7 @@ def get_guards():
         }), 403
     
     guards = User.query.filter_by(
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         role='guard'
     ).all()
     
@@ -1572,35 +2637,288 @@ def get_guards():
     })
 
 
-def log_activity(action, description, user):
-    activity = ActivityLog(
-        action=action,
-        description=description,
-        user_id=user.id,
-        user_name=user.full_name,
-        user_type=user.user_type,
-        society_name=user.society_name
-    )
-    db.session.add(activity)
-    db.session.commit()
+def utc_day_bounds(day=None):
+    """Half-open [start, end) datetimes covering one UTC day, so range filters can use an index."""
+    day = day or datetime.utcnow().date()
+    start = datetime(day.year, day.month, day.day)
+    return start, start + timedelta(days=1)
 
 
-def create_notification(user_id, title, message, notification_type, society_name=None, related_id=None):
-    notification = Notification(
-        user_id=user_id,
-        title=title,
-        message=message,
-        notification_type=notification_type,
-        society_name=society_name,
-        related_id=related_id
-    )
-    db.session.add(notification)
+def adjust_daily_visitor_count(society_id, day, delta):
+    """Add ``delta`` (which may be negative) to a society's visitor counter for ``day``."""
+    mark_society_stats_stale(society_id)
+    updated = DailyVisitorCount.query.filter_by(society_id=society_id, day=day).update({
+        DailyVisitorCount.visitor_count: DailyVisitorCount.visitor_count + delta
+    }, synchronize_session=False)
+    if updated or delta <= 0:
+        return
+    
+    try:
+        with db.session.begin_nested():
+            db.session.add(DailyVisitorCount(society_id=society_id, day=day, visitor_count=delta))
+    except IntegrityError:
+        # Another request created the day's row first
+        DailyVisitorCount.query.filter_by(society_id=society_id, day=day).update({
+            DailyVisitorCount.visitor_count: DailyVisitorCount.visitor_count + delta
+        }, synchronize_session=False)
+
+
+def count_visitor_entry(society_id, entry_time, previous_entry_time=None):
+    """Count a visitor on the day of ``entry_time``.
+
+    When the entry moves from ``previous_entry_time`` to another day, it is
+    taken off that day's counter, so a visitor is counted once. Runs in the
+    caller's transaction.
+    """
+    if not society_id or not entry_time:
+        return
+    if previous_entry_time and previous_entry_time.date() == entry_time.date():
+        return
+    
+    if previous_entry_time:
+        adjust_daily_visitor_count(society_id, previous_entry_time.date(), -1)
+    adjust_daily_visitor_count(society_id, entry_time.date(), 1)
+
+
+@event.listens_for(db.session, 'before_flush')
+def uncount_deleted_visitor_entries(session, flush_context, instances):
+    """Take deleted visitors off their day's counter in the same transaction.
+
+    Bulk ``Query.delete()`` skips this; run ``flask rebuild-visitor-counts`` after one.
+    """
+    for obj in session.deleted:
+        if isinstance(obj, VisitorLog) and obj.society_id and obj.entry_time:
+            adjust_daily_visitor_count(obj.society_id, obj.entry_time.date(), -1)
+
+
+def rebuild_visitor_counts():
+    """Recompute every daily visitor counter from the visitor log."""
+    DailyVisitorCount.query.delete()
+    
+    day = db.func.date(VisitorLog.entry_time, type_=db.Date)
+    totals = db.select(VisitorLog.society_id, day, db.func.count(VisitorLog.id)).where(
+        VisitorLog.society_id.isnot(None),
+        VisitorLog.entry_time.isnot(None)
+    ).group_by(VisitorLog.society_id, day)
+    
+    db.session.execute(db.insert(DailyVisitorCount).from_select(
+        ['society_id', 'day', 'visitor_count'],
+        totals
+    ))
     db.session.commit()
-    return notification
+    return DailyVisitorCount.query.count()
 
 
-@app.route('/api/notifications', methods=['GET'])
-@login_required
+@app.cli.command('rebuild-visitor-counts')
+def rebuild_visitor_counts_command():
+    """Recompute the per-society daily visitor counters from scratch."""
+    count = rebuild_visitor_counts()
+    print(f"✅ Rebuilt {count} daily visitor counts")
+
+
+def visitors_on(society_id, day=None):
+    counter = DailyVisitorCount.query.get((society_id, day or datetime.utcnow().date()))
+    return counter.visitor_count if counter else 0
+
+
+class BatchWriter(ABC):
+    """Drains a bounded in-memory queue from a background thread in batches.
+
+    A batch is handed to ``write_batch`` once it holds ``batch_size`` items or
+    ``flush_interval`` seconds after its first item arrived; anything already
+    queued joins the batch without waiting. Items offered while the queue is
+    full are refused and counted rather than blocking the caller.
+    """
+
+    thread_name = 'batch-writer'
+
+    def __init__(self, flush_interval, batch_size, max_queue_size):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stopping = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, item):
+        """Queue ``item`` for the writer thread; returns False if the queue is full."""
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    @abstractmethod
+    def write_batch(self, batch):
+        """Persist ``batch`` and return how many items were written."""
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=max(self.flush_interval, 0.5))]
+        except queue.Empty:
+            return []
+        
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        written = self.write_batch(batch)
+        with self._lock:
+            self.batches += 1
+            self.written += written
+            self.failed += len(batch) - written
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._write(batch)
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_size': self._queue.maxsize,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batches': self.batches,
+                'average_batch_size': round((self.written + self.failed) / self.batches, 1) if self.batches else None,
+                'batch_size': self.batch_size,
+                'flush_interval_ms': int(self.flush_interval * 1000)
+            }
+
+
+class ActivityLogWriter(BatchWriter):
+    """Inserts queued activity-log rows so requests never wait on the audit write."""
+
+    thread_name = 'activity-log-writer'
+
+    def write_batch(self, batch):
+        with app.app_context():
+            try:
+                db.session.execute(db.insert(ActivityLog), batch)
+                db.session.commit()
+                return len(batch)
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Activity log batch of {len(batch)} failed, retrying row by row: {e}")
+            
+            written = 0
+            for row in batch:
+                try:
+                    db.session.execute(db.insert(ActivityLog), [row])
+                    db.session.commit()
+                    written += 1
+                except Exception:
+                    db.session.rollback()
+            return written
+
+
+activity_log_writer = ActivityLogWriter(
+    app.config['ACTIVITY_LOG_FLUSH_MS'] / 1000,
+    app.config['ACTIVITY_LOG_BATCH_SIZE'],
+    app.config['ACTIVITY_LOG_QUEUE_SIZE']
+)
+atexit.register(activity_log_writer.stop)
+
+
+def log_activity(action, description, user):
+    """Queue an activity-log row; ``activity_log_writer`` inserts it off the request path."""
+    activity_log_writer.enqueue({
+        'action': action,
+        'description': description,
+        'user_id': user.id,
+        'user_name': user.full_name,
+        'user_type': user.user_type,
+        'society_name': user.society_name,
+        'society_id': user.society_id,
+        'created_at': datetime.utcnow()
+    })
+
+
+def notify_many(user_ids, title, message, notification_type, society_name=None, related_id=None, society_id=None):
+    """Store one notification per user with a single bulk insert and commit.
+
+    Also commits anything else pending on the session. After the commit, one
+    ``notification`` Socket.IO event is sent to every ``user_<id>`` room.
+    """
+    user_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+    if not user_ids:
+        return 0
+    
+    created_at = datetime.utcnow()
+    db.session.execute(db.insert(Notification), [{
+        'user_id': uid,
+        'title': title,
+        'message': message,
+        'notification_type': notification_type,
+        'is_read': False,
+        'society_name': society_name,
+        'society_id': society_id,
+        'related_id': related_id,
+        'created_at': created_at
+    } for uid in user_ids])
+    db.session.commit()
+    
+    socketio.emit('notification', {
+        'title': title,
+        'message': message,
+        'notification_type': notification_type,
+        'related_id': related_id,
+        'created_at': created_at.isoformat()
+    }, to=[f"user_{uid}" for uid in user_ids])
+    return len(user_ids)
+
+
+@app.route('/api/notifications', methods=['GET'])
+@login_required
 def get_notifications():
     notifications = Notification.query.filter_by(
         user_id=current_user.id
@@ -1651,7 +2969,7 @@ def create_visitor_log():
     
     resident = User.query.filter_by(
         flat_number=data['flat_number'],
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         user_type='resident'
     ).first()
     
@@ -1663,6 +2981,7 @@ def create_visitor_log():
         purpose=data.get('purpose'),
         flat_number=data['flat_number'],
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         guard_id=current_user.id,
         guard_name=current_user.full_name,
         resident_id=resident.id if resident else None,
@@ -1673,17 +2992,20 @@ def create_visitor_log():
     )
     
     db.session.add(visitor)
+    db.session.flush()
+    count_visitor_entry(visitor.society_id, visitor.entry_time)
     db.session.commit()
     
     log_activity('Visitor Entry', f"Guard logged visitor {data['visitor_name']} for flat {data['flat_number']}", current_user)
     
     if resident:
-        create_notification(
-            user_id=resident.id,
+        notify_many(
+            [resident.id],
             title='Visitor Permission Request',
             message=f"Visitor {data['visitor_name']} ({data.get('purpose', 'Guest')}) is at the gate requesting entry to Flat {data['flat_number']}. Guard: {current_user.full_name}",
             notification_type='visitor_permission',
             society_name=current_user.society_name,
+            society_id=current_user.society_id,
             related_id=visitor.id
         )
         
@@ -1714,7 +3036,7 @@ def ask_visitor_permission(visitor_id):
     
     visitor = VisitorLog.query.get(visitor_id)
     
-    if not visitor or visitor.society_name != current_user.society_name:
+    if not visitor or visitor.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'Visitor not found'
@@ -1732,35 +3054,43 @@ def ask_visitor_permission(visitor_id):
     })
 
 
+def visitor_log_filters(user, status=None, permission_status=None):
+    """WHERE clauses for the visitor log ``user`` may see, or None if they may see none."""
+    if user.role == 'guard':
+        filters = [VisitorLog.society_id == user.society_id]
+    elif user.user_type == 'resident':
+        filters = [VisitorLog.society_id == user.society_id, VisitorLog.flat_number == user.flat_number]
+    elif user.role == 'admin':
+        filters = [VisitorLog.society_id == user.society_id]
+    else:
+        return None
+    
+    if status:
+        filters.append(VisitorLog.status == status)
+    if permission_status:
+        filters.append(VisitorLog.permission_status == permission_status)
+    return filters
+
+
+def visitor_log_list_query(filters):
+    return VisitorLog.query.filter(*filters).order_by(VisitorLog.created_at.desc())
+
+
 @app.route('/api/visitor-log', methods=['GET'])
 @login_required
 def get_visitor_logs():
-    query = VisitorLog.query
-    
-    if current_user.role == 'guard':
-        query = query.filter_by(society_name=current_user.society_name)
-    elif current_user.user_type == 'resident':
-        query = query.filter_by(
-            society_name=current_user.society_name,
-            flat_number=current_user.flat_number
-        )
-    elif current_user.role == 'admin':
-        query = query.filter_by(society_name=current_user.society_name)
-    else:
+    filters = visitor_log_filters(
+        current_user,
+        request.args.get('status'),
+        request.args.get('permission_status')
+    )
+    if filters is None:
         return jsonify({
             'success': False,
             'message': 'Unauthorized'
         }), 403
     
-    status_filter = request.args.get('status')
-    permission_filter = request.args.get('permission_status')
-    
-    if status_filter:
-        query = query.filter_by(status=status_filter)
-    if permission_filter:
-        query = query.filter_by(permission_status=permission_filter)
-    
-    visitors = query.order_by(VisitorLog.created_at.desc()).all()
+    visitors = visitor_log_list_query(filters).all()
     
     return jsonify({
         'success': True,
@@ -1831,7 +3161,7 @@ def respond_visitor_permission(visitor_id):
         'permission_status': visitor.permission_status,
         'flat_number': visitor.flat_number,
         'action': action
-    }, room=f"society_{current_user.society_name}")
+    }, room=f"society_{current_user.society_id}")
     
     return jsonify({
         'success': True,
@@ -1850,7 +3180,7 @@ def visitor_exit(visitor_id):
     
     visitor = VisitorLog.query.get(visitor_id)
     
-    if not visitor or visitor.society_name != current_user.society_name:
+    if not visitor or visitor.society_id != current_user.society_id:
         return jsonify({
             'success': False,
             'message': 'Visitor not found'
@@ -1887,6 +3217,7 @@ def pre_approve_visitor():
         purpose=data.get('purpose'),
         flat_number=current_user.flat_number,
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         guard_id=None,
         resident_id=current_user.id,
         is_pre_approved_service=data.get('is_service_provider', False),
@@ -1896,6 +3227,8 @@ def pre_approve_visitor():
     )
     
     db.session.add(visitor)
+    db.session.flush()
+    count_visitor_entry(visitor.society_id, visitor.entry_time)
     db.session.commit()
     
     log_activity('Pre-Approved Visitor', f"Resident pre-approved visitor {data['visitor_name']}", current_user)
@@ -1907,100 +3240,398 @@ def pre_approve_visitor():
     })
 
 
-@app.route('/api/visitor-log/<int:visitor_id>/qr-code', methods=['GET'])
-@login_required
-def generate_visitor_qr_code(visitor_id):
-    visitor = VisitorLog.query.get(visitor_id)
-    
-    if not visitor:
-        return jsonify({
-            'success': False,
-            'message': 'Visitor not found'
-        }), 404
-    
-    if current_user.user_type == 'resident' and visitor.resident_id != current_user.id:
-        return jsonify({
-            'success': False,
-            'message': 'Unauthorized'
-        }), 403
-    
-    qr_data = {
-        'visitor_id': visitor.id,
-        'visitor_name': visitor.visitor_name,
-        'visitor_phone': visitor.visitor_phone,
-        'flat_number': visitor.flat_number,
-        'society_name': visitor.society_name,
-        'purpose': visitor.purpose,
-        'is_pre_approved': True,
-        'created_at': visitor.created_at.isoformat() if visitor.created_at else None
-    }
-    
+QR_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+
+def render_qr(payload, fmt):
+    """Encode ``payload`` as a QR code image in ``fmt`` ('png' or 'svg') and return its bytes."""
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
         box_size=10,
         border=4,
     )
-    qr.add_data(json.dumps(qr_data))
+    qr.add_data(payload)
     qr.make(fit=True)
     
-    img = qr.make_image(fill_color="black", back_color="white")
+    if fmt == 'svg':
+        return qr_matrix_svg(qr.get_matrix(), qr.box_size).encode()
     
+    img = qr.make_image(fill_color="black", back_color="white")
     img_io = BytesIO()
     img.save(img_io, 'PNG')
-    img_io.seek(0)
-    
-    return send_file(img_io, mimetype='image/png', as_attachment=True, download_name=f'visitor_qr_{visitor_id}.png')
+    return img_io.getvalue()
+
+
+def qr_matrix_svg(matrix, box_size):
+    """Draw a module matrix as one stroked SVG path with a relative segment per run of dark modules.
+
+    Coordinates are whole modules scaled by the viewBox, which keeps the markup a
+    fraction of the size qrcode's own SVG factories produce.
+    """
+    size = len(matrix)
+    segments = []
+    pen_x, pen_y = 0, 0
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < size and row[x]:
+                x += 1
+            segments.append(f"m{start - pen_x} {y - pen_y}h{x - start}")
+            pen_x, pen_y = x, y
+    pixels = size * box_size
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+            f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+            f'<rect width="{size}" height="{size}" fill="#fff"/>'
+            f'<path stroke="#000" transform="translate(0 .5)" d="M{"".join(segments)[1:]}"/></svg>')
+
+
+class QRRenderer:
+    """Renders QR codes once per payload and keeps the images in an LRU bounded by bytes.
+
+    Entries are keyed by a hash of the format and payload, so a changed payload
+    simply gets a new key and stale images age out. With ``directory`` the
+    images are also written to disk and survive restarts. ``render_many``
+    renders misses in a pool of ``workers`` processes.
+    """
+
+    def __init__(self, max_bytes, directory=None, workers=0):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.workers = workers
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.pooled = 0
+        self.evictions = 0
+        self.render_seconds = 0.0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(payload, fmt):
+        return hashlib.sha1(f"{fmt}:{payload}".encode()).hexdigest()
+
+    def render(self, payload, fmt='png'):
+        """Return ``(key, image bytes)`` for ``payload``, rendering it only on a miss."""
+        key = self.key(payload, fmt)
+        image = self._cached(key, fmt)
+        if image is None:
+            start = time.monotonic()
+            image = render_qr(payload, fmt)
+            with self._lock:
+                self.misses += 1
+                self.render_seconds += time.monotonic() - start
+            self._write_file(key, fmt, image)
+            self._store(key, image)
+        return key, image
+
+    def render_many(self, payloads, fmt='png'):
+        """Yield ``(key, image bytes)`` for each payload in order, rendering misses in the pool.
+
+        At most ``workers * 4`` images are in flight, so memory stays flat however
+        many payloads there are. Without workers the misses render inline.
+        """
+        if not self.workers:
+            for payload in payloads:
+                yield self.render(payload, fmt)
+            return
+        
+        in_flight = deque()
+        for payload in payloads:
+            key = self.key(payload, fmt)
+            image = self._cached(key, fmt)
+            if image is None:
+                image = self._executor().submit(render_qr, payload, fmt)
+            in_flight.append((key, image))
+            if len(in_flight) >= self.workers * 4:
+                yield self._collect(fmt, *in_flight.popleft())
+        while in_flight:
+            yield self._collect(fmt, *in_flight.popleft())
+
+    def _cached(self, key, fmt):
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return image
+        
+        image = self._read_file(key, fmt)
+        if image is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._store(key, image)
+        return image
+
+    def _collect(self, fmt, key, image):
+        if isinstance(image, Future):
+            image = image.result()
+            with self._lock:
+                self.pooled += 1
+            self._write_file(key, fmt, image)
+            self._store(key, image)
+        return key, image
+
+    def _executor(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = background_process_pool(self.workers)
+        return self._pool
+
+    def _store(self, key, image):
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = image
+            self._bytes += len(image)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def _path(self, key, fmt):
+        return os.path.join(self.directory, key[:2], f"{key}.{fmt}")
+
+    def _read_file(self, key, fmt):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key, fmt), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_file(self, key, fmt, image):
+        if not self.directory:
+            return
+        path = self._path(key, fmt)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write beside the final name and rename, so readers never see a partial image
+            staging = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(staging, 'wb') as f:
+                f.write(image)
+            os.replace(staging, path)
+        except OSError as e:
+            print(f"❌ Could not persist QR code {key}: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses + self.pooled
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'pooled_renders': self.pooled,
+                'workers': self.workers,
+                'hit_ratio': round((self.hits + self.disk_hits) / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'directory': self.directory,
+                'avg_render_ms': round(self.render_seconds * 1000 / self.misses, 2) if self.misses else None
+            }
 
 
-@app.route('/api/visitor-log/<int:visitor_id>/qr-code-base64', methods=['GET'])
-@login_required
-def get_visitor_qr_code_base64(visitor_id):
+qr_renderer = QRRenderer(app.config['QR_CACHE_MAX_BYTES'], app.config['QR_CACHE_DIR'], app.config['QR_RENDER_WORKERS'])
+
+
+# Signed pass layout: format version, visitor id, society id, valid from, valid until (UTC seconds)
+VISITOR_PASS_FORMAT = struct.Struct('>BIIII')
+VISITOR_PASS_VERSION = 1
+VISITOR_PASS_MAC_BYTES = 10
+# Slack on both ends of a pass's window for gate tablets whose clocks drift
+VISITOR_PASS_LEEWAY = 300
+visitor_pass_stats = {'verified': 0, 'bad_signature': 0, 'wrong_society': 0, 'outside_window': 0, 'unsigned': 0}
+_visitor_pass_stats_lock = threading.Lock()
+
+
+def count_visitor_pass(outcome):
+    with _visitor_pass_stats_lock:
+        visitor_pass_stats[outcome] += 1
+
+
+def visitor_pass_key(society_id):
+    """HMAC key for one society's passes; guard tablets hold only their own society's key."""
+    if not app.config['QR_PASS_SECRET']:
+        raise RuntimeError('QR_PASS_SECRET or SECRET_KEY must be set to sign visitor passes')
+    return hmac.new(app.config['QR_PASS_SECRET'].encode(), f"visitor-pass:{society_id}".encode(),
+                    hashlib.sha256).digest()
+
+
+def visitor_passes_unavailable():
+    """Answer for pass endpoints while no signing secret is configured."""
+    return jsonify({
+        'success': False,
+        'message': 'Visitor passes are disabled until the server has a signing secret'
+    }), 503
+
+
+def utc_seconds(moment):
+    return int(moment.replace(tzinfo=timezone.utc).timestamp())
+
+
+def visitor_pass_window(visitor):
+    """Seconds from issue until ``QR_PASS_TTL`` later, stretched to cover the expected date."""
+    issued = visitor.created_at or datetime(1970, 1, 1)
+    valid_until = issued + timedelta(seconds=app.config['QR_PASS_TTL'])
+    try:
+        # Through the day after the expected date, so local time zones never cut a visit short
+        expected = datetime.strptime(visitor.expected_date or '', '%Y-%m-%d') + timedelta(days=2)
+        valid_until = max(valid_until, expected)
+    except ValueError:
+        pass
+    return utc_seconds(issued), utc_seconds(valid_until)
+
+
+def visitor_qr_payload(visitor):
+    """The signed pass a visitor's QR code encodes: 27 bytes as 44 base32 characters.
+
+    Base32 only uses characters from the QR alphanumeric set, so the code fits
+    in a version 2 symbol; it depends only on the visitor row, so re-rendering
+    the same pass hits ``qr_renderer``'s cache.
+    """
+    valid_from, valid_until = visitor_pass_window(visitor)
+    body = VISITOR_PASS_FORMAT.pack(VISITOR_PASS_VERSION, visitor.id, visitor.society_id or 0, valid_from, valid_until)
+    mac = hmac.new(visitor_pass_key(visitor.society_id or 0), body, hashlib.sha256).digest()[:VISITOR_PASS_MAC_BYTES]
+    return base64.b32encode(body + mac).decode().rstrip('=')
+
+
+def read_visitor_pass(qr_data, society_id, at):
+    """Check a scanned pass without touching the database; returns ``(visitor_id, signed)``.
+
+    Raises ``ValueError`` with a message for the guard when the signature, the
+    society or the validity window (checked at ``at``) is wrong. Unsigned JSON
+    passes are only read while ``QR_UNSIGNED_BEFORE`` is set, and the caller must
+    hold them to ``unsigned_pass_allowed`` once the visitor is loaded.
+    """
+    qr_data = str(qr_data or '').strip()
+    if qr_data.startswith('{') and app.config['QR_UNSIGNED_BEFORE']:
+        try:
+            visitor_id = json.loads(qr_data).get('visitor_id')
+        except (json.JSONDecodeError, AttributeError):
+            visitor_id = None
+        if not isinstance(visitor_id, int):
+            raise ValueError('Invalid QR code format')
+        count_visitor_pass('unsigned')
+        return visitor_id, False
+    
+    try:
+        raw = base64.b32decode(qr_data.upper() + '=' * (-len(qr_data) % 8))
+    except ValueError:
+        raw = b''
+    if len(raw) != VISITOR_PASS_FORMAT.size + VISITOR_PASS_MAC_BYTES:
+        count_visitor_pass('bad_signature')
+        raise ValueError('Invalid QR code')
+    body, mac = raw[:VISITOR_PASS_FORMAT.size], raw[VISITOR_PASS_FORMAT.size:]
+    version, visitor_id, pass_society_id, valid_from, valid_until = VISITOR_PASS_FORMAT.unpack(body)
+    expected_mac = hmac.new(visitor_pass_key(pass_society_id), body, hashlib.sha256).digest()[:VISITOR_PASS_MAC_BYTES]
+    if version != VISITOR_PASS_VERSION or not hmac.compare_digest(mac, expected_mac):
+        count_visitor_pass('bad_signature')
+        raise ValueError('Invalid QR code')
+    if pass_society_id != society_id:
+        count_visitor_pass('wrong_society')
+        raise ValueError('Visitor is for a different society')
+    scanned = utc_seconds(at)
+    if not valid_from - VISITOR_PASS_LEEWAY <= scanned <= valid_until + VISITOR_PASS_LEEWAY:
+        count_visitor_pass('outside_window')
+        raise ValueError('This pass has expired' if scanned > valid_until else 'This pass is not valid yet')
+    count_visitor_pass('verified')
+    return visitor_id, True
+
+
+def unsigned_pass_allowed(visitor):
+    """Unsigned passes only admit visitors whose passes were printed before signing began."""
+    cutoff = app.config['QR_UNSIGNED_BEFORE']
+    return bool(cutoff and visitor.created_at and visitor.created_at < cutoff)
+
+
+def visitor_for_qr(visitor_id):
+    """Load a visitor whose QR code the current user may see, or return an error response."""
     visitor = VisitorLog.query.get(visitor_id)
     
     if not visitor:
-        return jsonify({
+        return None, (jsonify({
             'success': False,
             'message': 'Visitor not found'
-        }), 404
+        }), 404)
     
-    if current_user.user_type == 'resident' and visitor.resident_id != current_user.id:
-        return jsonify({
+    # Admins and guards see their society's passes; everyone else only their own visitors'
+    if visitor.society_id != current_user.society_id or (
+            current_user.role not in ['admin', 'guard'] and visitor.resident_id != current_user.id):
+        return None, (jsonify({
             'success': False,
             'message': 'Unauthorized'
-        }), 403
+        }), 403)
     
-    qr_data = {
-        'visitor_id': visitor.id,
-        'visitor_name': visitor.visitor_name,
-        'visitor_phone': visitor.visitor_phone,
-        'flat_number': visitor.flat_number,
-        'society_name': visitor.society_name,
-        'purpose': visitor.purpose,
-        'is_pre_approved': True,
-        'created_at': visitor.created_at.isoformat() if visitor.created_at else None
-    }
+    return visitor, None
+
+
+def requested_qr_format():
+    fmt = request.args.get('format', 'png').lower()
+    return fmt if fmt in QR_FORMATS else None
+
+
+@app.route('/api/visitor-log/<int:visitor_id>/qr-code', methods=['GET'])
+@login_required
+def generate_visitor_qr_code(visitor_id):
+    fmt = requested_qr_format()
+    if not fmt:
+        return jsonify({'success': False, 'message': 'format must be png or svg'}), 400
     
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(json.dumps(qr_data))
-    qr.make(fit=True)
+    if not app.config['QR_PASS_SECRET']:
+        return visitor_passes_unavailable()
     
-    img = qr.make_image(fill_color="black", back_color="white")
+    visitor, error = visitor_for_qr(visitor_id)
+    if error:
+        return error
     
-    img_io = BytesIO()
-    img.save(img_io, 'PNG')
-    img_io.seek(0)
+    key, image = qr_renderer.render(visitor_qr_payload(visitor), fmt)
+    
+    # Built by hand rather than with send_file so SVG still goes through compress_response.
+    # The key hashes the image's content, so it doubles as a strong ETag.
+    response = app.response_class(image, mimetype=QR_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=visitor_qr_{visitor_id}.{fmt}'
+    response.set_etag(key)
+    return response.make_conditional(request)
+
+
+@app.route('/api/visitor-log/<int:visitor_id>/qr-code-base64', methods=['GET'])
+@login_required
+def get_visitor_qr_code_base64(visitor_id):
+    fmt = requested_qr_format()
+    if not fmt:
+        return jsonify({'success': False, 'message': 'format must be png or svg'}), 400
+    
+    if not app.config['QR_PASS_SECRET']:
+        return visitor_passes_unavailable()
+    
+    visitor, error = visitor_for_qr(visitor_id)
+    if error:
+        return error
     
-    img_base64 = base64.b64encode(img_io.read()).decode('utf-8')
+    _, image = qr_renderer.render(visitor_qr_payload(visitor), fmt)
+    img_base64 = base64.b64encode(image).decode('utf-8')
     
     return jsonify({
         'success': True,
-        'qr_code': f'data:image/png;base64,{img_base64}',
+        'qr_code': f'data:{QR_FORMATS[fmt]};base64,{img_base64}',
         'visitor': {
             'id': visitor.id,
             'visitor_name': visitor.visitor_name,
@@ -2009,6 +3640,43 @@ def get_visitor_qr_code_base64(visitor_id):
     })
 
 
+def admit_verified_visitor(visitor, entry_time, signed=True):
+    """Record a guard's entry for a visitor whose pass checked out.
+
+    Returns ``(message, status)`` when the visitor can't be let in, else None.
+    """
+    if not visitor:
+        return 'Visitor not found', 404
+    if not signed and not unsigned_pass_allowed(visitor):
+        return 'Invalid QR code', 400
+    if visitor.society_id != current_user.society_id:
+        return 'Visitor is for a different society', 403
+    if visitor.status == 'exited':
+        return 'This visitor has already exited', 400
+    
+    visitor.guard_id = current_user.id
+    visitor.guard_name = current_user.full_name
+    previous_entry_time = visitor.entry_time
+    visitor.entry_time = entry_time
+    count_visitor_entry(visitor.society_id, visitor.entry_time, previous_entry_time)
+    
+    if visitor.status == 'pre_approved':
+        visitor.status = 'allowed'
+    return None
+
+
+def verified_visitor_json(visitor):
+    return {
+        'id': visitor.id,
+        'visitor_name': visitor.visitor_name,
+        'visitor_phone': visitor.visitor_phone,
+        'flat_number': visitor.flat_number,
+        'purpose': visitor.purpose,
+        'permission_status': visitor.permission_status,
+        'is_pre_approved_service': visitor.is_pre_approved_service
+    }
+
+
 @app.route('/api/visitor-log/verify-qr', methods=['POST'])
 @login_required
 def verify_visitor_qr():
@@ -2018,72 +3686,138 @@ def verify_visitor_qr():
             'message': 'Unauthorized'
         }), 403
     
-    data = request.get_json()
+    if not app.config['QR_PASS_SECRET']:
+        return visitor_passes_unavailable()
+    
+    data = request.get_json(silent=True) or {}
+    now = datetime.utcnow()
     
+    # Signature, society and validity are checked before any query
     try:
-        qr_data = json.loads(data['qr_data'])
-        visitor_id = qr_data.get('visitor_id')
-        
-        if not visitor_id:
-            return jsonify({
-                'success': False,
-                'message': 'Invalid QR code'
-            }), 400
-        
-        visitor = VisitorLog.query.get(visitor_id)
-        
-        if not visitor:
-            return jsonify({
-                'success': False,
-                'message': 'Visitor not found'
-            }), 404
-        
-        if visitor.society_name != current_user.society_name:
-            return jsonify({
-                'success': False,
-                'message': 'Visitor is for a different society'
-            }), 403
-        
-        if visitor.status == 'exited':
-            return jsonify({
-                'success': False,
-                'message': 'This visitor has already exited'
-            }), 400
-        
-        visitor.guard_id = current_user.id
-        visitor.guard_name = current_user.full_name
-        visitor.entry_time = datetime.utcnow()
-        
-        if visitor.status == 'pre_approved':
-            visitor.status = 'allowed'
-        
-        db.session.commit()
-        
-        log_activity('QR Verified', f"Guard verified QR for visitor {visitor.visitor_name}", current_user)
-        
-        return jsonify({
-            'success': True,
-            'message': 'Visitor verified successfully',
-            'visitor': {
-                'id': visitor.id,
-                'visitor_name': visitor.visitor_name,
-                'visitor_phone': visitor.visitor_phone,
-                'flat_number': visitor.flat_number,
-                'purpose': visitor.purpose,
-                'permission_status': visitor.permission_status,
-                'is_pre_approved_service': visitor.is_pre_approved_service
-            }
-        })
-    except json.JSONDecodeError:
+        visitor_id, signed = read_visitor_pass(data.get('qr_data'), current_user.society_id, now)
+    except ValueError as e:
         return jsonify({
             'success': False,
-            'message': 'Invalid QR code format'
+            'message': str(e)
         }), 400
-    except Exception as e:
+    
+    visitor = VisitorLog.query.get(visitor_id)
+    error = admit_verified_visitor(visitor, now, signed)
+    if error:
+        return jsonify({
+            'success': False,
+            'message': error[0]
+        }), error[1]
+    
+    db.session.commit()
+    
+    log_activity('QR Verified', f"Guard verified QR for visitor {visitor.visitor_name}", current_user)
+    
+    return jsonify({
+        'success': True,
+        'message': 'Visitor verified successfully',
+        'visitor': verified_visitor_json(visitor)
+    })
+
+
+@app.route('/api/visitor-log/verify-qr/batch', methods=['POST'])
+@login_required
+def verify_visitor_qr_batch():
+    """Apply scans a gate tablet queued while offline, in one query and one commit.
+
+    Each scan is ``{"qr_data": ..., "scanned_at": ISO time}``; passes are checked
+    against the time they were scanned, which may be at most ``QR_OFFLINE_MAX_AGE``
+    seconds ago. Results come back in the order of ``scans``.
+    """
+    if current_user.role != 'guard':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    if not app.config['QR_PASS_SECRET']:
+        return visitor_passes_unavailable()
+    
+    data = request.get_json(silent=True) or {}
+    scans = data.get('scans')
+    if not isinstance(scans, list) or not scans:
+        return jsonify({'success': False, 'message': 'No scans given'}), 400
+    if len(scans) > app.config['QR_VERIFY_BATCH_SIZE']:
         return jsonify({
             'success': False,
-            'message': f'Error verifying QR code: {str(e)}'
-        }), 500
+            'message': f"At most {app.config['QR_VERIFY_BATCH_SIZE']} scans per request"
+        }), 400
+    
+    now = datetime.utcnow()
+    oldest = now - timedelta(seconds=app.config['QR_OFFLINE_MAX_AGE'])
+    checked = []
+    for scan in scans:
+        scan = scan if isinstance(scan, dict) else {}
+        try:
+            scanned_at = datetime.fromisoformat(str(scan.get('scanned_at') or now.isoformat()))
+        except ValueError:
+            checked.append((None, None, None, 'Invalid scanned_at time'))
+            continue
+        if scanned_at.tzinfo:
+            scanned_at = scanned_at.astimezone(timezone.utc).replace(tzinfo=None)
+        if not oldest <= scanned_at <= now + timedelta(seconds=VISITOR_PASS_LEEWAY):
+            checked.append((None, None, None, 'Scan is too old to accept'))
+            continue
+        try:
+            visitor_id, signed = read_visitor_pass(scan.get('qr_data'), current_user.society_id, scanned_at)
+            checked.append((visitor_id, signed, scanned_at, None))
+        except ValueError as e:
+            checked.append((None, None, None, str(e)))
+    
+    ids = {visitor_id for visitor_id, _, _, _ in checked if visitor_id}
+    visitors = {visitor.id: visitor for visitor in VisitorLog.query.filter(VisitorLog.id.in_(ids))} if ids else {}
+    
+    results = []
+    # Apply in scan order so a visitor scanned twice ends with the latest entry time
+    for index in sorted(range(len(checked)), key=lambda n: checked[n][2] or now):
+        visitor_id, signed, scanned_at, error = checked[index]
+        if not error:
+            refusal = admit_verified_visitor(visitors.get(visitor_id), scanned_at, signed)
+            error = refusal[0] if refusal else None
+        results.append((index, {'success': False, 'message': error} if error else
+                        {'success': True, 'visitor': verified_visitor_json(visitors[visitor_id])}))
+    db.session.commit()
+    results.sort(key=lambda result: result[0])
+    
+    admitted = sum(1 for _, result in results if result['success'])
+    if admitted:
+        log_activity('QR Verified', f"Guard verified {admitted} queued QR scans", current_user)
+    
+    return jsonify({
+        'success': True,
+        'verified': admitted,
+        'rejected': len(results) - admitted,
+        'results': [result for _, result in results]
+    })
+
+
+@app.route('/api/visitor-log/pass-key', methods=['GET'])
+@login_required
+def get_visitor_pass_key():
+    """The guard's society pass key, so a gate tablet can check passes while offline.
+
+    The key is symmetric: whoever holds it can also mint passes for the society
+    with any validity window. It is only handed out when ``QR_GUARD_PASS_KEYS``
+    is on; rotate ``QR_PASS_SECRET`` if a tablet is lost.
+    """
+    if current_user.role != 'guard' or not app.config['QR_GUARD_PASS_KEYS']:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    if not app.config['QR_PASS_SECRET']:
+        return visitor_passes_unavailable()
+    
+    return jsonify({
+        'success': True,
+        'algorithm': 'HMAC-SHA256',
+        'key': base64.b64encode(visitor_pass_key(current_user.society_id)).decode(),
+        'format': {
+            'encoding': 'base32',
+            'layout': '>BIIII',
+            'fields': ['version', 'visitor_id', 'society_id', 'valid_from', 'valid_until'],
+            'version': VISITOR_PASS_VERSION,
+            'mac_bytes': VISITOR_PASS_MAC_BYTES
+        }
+    })
 
 
 @app.route('/api/family-members', methods=['POST'])
@@ -2104,6 +3838,7 @@ def add_family_member():
         age=data.get('age'),
         phone=data.get('phone'),
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         flat_number=current_user.flat_number
     )
     
@@ -2129,7 +3864,7 @@ def get_family_members():
             }), 400
         
         members = FamilyMember.query.filter_by(
-            society_name=current_user.society_name,
+            society_id=current_user.society_id,
             flat_number=flat_number
         ).all()
     elif current_user.user_type == 'resident':
@@ -2138,12 +3873,12 @@ def get_family_members():
         flat_number = request.args.get('flat_number')
         if flat_number:
             members = FamilyMember.query.filter_by(
-                society_name=current_user.society_name,
+                society_id=current_user.society_id,
                 flat_number=flat_number
             ).all()
         else:
             members = FamilyMember.query.filter_by(
-                society_name=current_user.society_name
+                society_id=current_user.society_id
             ).all()
     else:
         return jsonify({
@@ -2202,6 +3937,7 @@ def add_vehicle():
         vehicle_model=data.get('vehicle_model'),
         vehicle_color=data.get('vehicle_color'),
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         flat_number=current_user.flat_number
     )
     
@@ -2227,7 +3963,7 @@ def get_vehicles():
             }), 400
         
         vehicles = Vehicle.query.filter_by(
-            society_name=current_user.society_name,
+            society_id=current_user.society_id,
             flat_number=flat_number
         ).all()
     elif current_user.user_type == 'resident':
@@ -2236,12 +3972,12 @@ def get_vehicles():
         flat_number = request.args.get('flat_number')
         if flat_number:
             vehicles = Vehicle.query.filter_by(
-                society_name=current_user.society_name,
+                society_id=current_user.society_id,
                 flat_number=flat_number
             ).all()
         else:
             vehicles = Vehicle.query.filter_by(
-                society_name=current_user.society_name
+                society_id=current_user.society_id
             ).all()
     else:
         return jsonify({
@@ -2298,7 +4034,7 @@ def create_shift_report():
     try:
         visitors_count = VisitorLog.query.filter_by(
             guard_id=current_user.id,
-            society_name=current_user.society_name
+            society_id=current_user.society_id
         ).filter(
             VisitorLog.created_at >= datetime.strptime(shift_date, '%Y-%m-%d')
         ).count()
@@ -2331,6 +4067,7 @@ def create_shift_report():
         guard_id=current_user.id,
         guard_name=current_user.full_name,
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         shift_date=shift_date,
         shift_start_time=shift_start,
         shift_end_time=shift_end,
@@ -2345,28 +4082,28 @@ def create_shift_report():
     
     log_activity('Shift Report', f"Guard submitted shift report for {shift_date}", current_user)
     
-    admins = User.query.filter_by(
-        society_name=current_user.society_name,
+    admin_ids = db.session.scalars(db.select(User.id).filter_by(
+        society_id=current_user.society_id,
         role='admin',
         is_approved=True
-    ).all()
+    )).all()
     
-    for admin in admins:
-        create_notification(
-            user_id=admin.id,
-            title='New Shift Report Submitted',
-            message=f"Guard {current_user.full_name} has submitted a shift report for {shift_date}. Total visitors: {visitors_count}. Incidents: {data.get('incidents') or 'None reported'}",
-            notification_type='shift_report',
-            society_name=current_user.society_name,
-            related_id=report.id
-        )
+    notify_many(
+        admin_ids,
+        title='New Shift Report Submitted',
+        message=f"Guard {current_user.full_name} has submitted a shift report for {shift_date}. Total visitors: {visitors_count}. Incidents: {data.get('incidents') or 'None reported'}",
+        notification_type='shift_report',
+        society_name=current_user.society_name,
+        society_id=current_user.society_id,
+        related_id=report.id
+    )
     
     socketio.emit('new_shift_report', {
         'report_id': report.id,
         'guard_name': current_user.full_name,
         'shift_date': shift_date,
         'total_visitors': visitors_count
-    }, room=f"society_{current_user.society_name}")
+    }, room=f"society_{current_user.society_id}")
     
     return jsonify({
         'success': True,
@@ -2384,7 +4121,7 @@ def get_shift_reports():
             'message': 'Unauthorized'
         }), 403
     
-    query = ShiftReport.query.filter_by(society_name=current_user.society_name)
+    query = ShiftReport.query.filter_by(society_id=current_user.society_id)
     
     if current_user.role == 'guard':
         query = query.filter_by(guard_id=current_user.id)
@@ -2418,10 +4155,16 @@ def add_business_society():
         }), 403
     
     data = request.get_json()
+    society_id = resolve_society_id(data['society_name'])
+    if not society_id:
+        return jsonify({
+            'success': False,
+            'message': 'Society not found'
+        }), 404
     
     existing = BusinessSociety.query.filter_by(
         business_id=current_user.id,
-        society_name=data['society_name']
+        society_id=society_id
     ).first()
     
     if existing:
@@ -2432,7 +4175,8 @@ def add_business_society():
     
     business_society = BusinessSociety(
         business_id=current_user.id,
-        society_name=data['society_name']
+        society_name=data['society_name'],
+        society_id=society_id
     )
     
     db.session.add(business_society)
@@ -2506,12 +4250,27 @@ def create_payment():
         payment_method=data.get('payment_method'),
         description=data.get('description'),
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         status=data.get('status', 'pending'),
         due_date=data.get('due_date'),
         maintenance_request_id=data.get('maintenance_request_id')
     )
     
-    db.session.add(payment)
+    try:
+        with db.session.begin_nested():
+            db.session.add(payment)
+    except IntegrityError:
+        # uq_payment_maintenance_bill: this flat already has a bill for that month
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'message': 'A maintenance bill for this month already exists'
+        }), 409
+    
+    if payment.payment_type == 'maintenance':
+        record_dues(payment.society_id, payment.due_date, payment.status, 1, float(payment.amount))
+    if payment.status == 'paid':
+        mark_society_stats_stale(payment.society_id)
     db.session.commit()
     
     return jsonify({
@@ -2521,31 +4280,66 @@ def create_payment():
     })
 
 
+def payment_filters(user, payment_type=None, status=None, month=None):
+    """WHERE clauses for the payments ``user`` may list, shared by a page and its totals."""
+    if user.role == 'admin':
+        filters = [Payment.society_id == user.society_id]
+    elif user.user_type == 'business':
+        filters = [Payment.payee_id == user.id]
+    else:
+        filters = [Payment.payer_id == user.id]
+    
+    if payment_type:
+        filters.append(Payment.payment_type == payment_type)
+    if status:
+        filters.append(Payment.status == status)
+    if month:
+        filters.append(Payment.due_date == month)
+    return filters
+
+
+def payment_list_query(filters):
+    """Payments matching ``filters`` with the payer's flat number."""
+    return db.session.query(Payment, User.flat_number).outerjoin(
+        User, User.id == Payment.payer_id
+    ).filter(*filters)
+
+
+def payment_totals_query(filters):
+    """Count, amount and paid amount over every payment matching ``filters``."""
+    return db.session.query(
+        db.func.count(Payment.id),
+        db.func.coalesce(db.func.sum(Payment.amount), 0),
+        db.func.coalesce(db.func.sum(db.case((Payment.status == 'paid', Payment.amount), else_=0)), 0)
+    ).filter(*filters)
+
+
 @app.route('/api/payments', methods=['GET'])
 @login_required
 def get_payments():
+    """One page of payments; ``?totals=1`` adds the count and sums over every matching payment."""
     payment_type = request.args.get('type')
     status = request.args.get('status')
+    month = request.args.get('month')
+    limit = parse_page_limit()
     
-    query = Payment.query
-    
-    if current_user.role == 'admin':
-        query = query.filter_by(society_name=current_user.society_name)
-    elif current_user.user_type == 'business':
-        query = query.filter_by(payee_id=current_user.id)
-    else:
-        query = query.filter_by(payer_id=current_user.id)
+    after = request.args.get('after')
+    cursor = parse_keyset_cursor(after)
+    if after and not cursor:
+        return jsonify({
+            'success': False,
+            'message': 'Invalid cursor'
+        }), 400
     
-    if payment_type:
-        query = query.filter_by(payment_type=payment_type)
-    if status:
-        query = query.filter_by(status=status)
+    filters = payment_filters(current_user, payment_type, status, month)
+    query = payment_list_query(filters)
     
-    payments = query.order_by(Payment.created_at.desc()).all()
+    rows = apply_keyset_page(query, Payment.created_at, Payment.id, cursor, limit)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
     payment_list = []
-    for p in payments:
-        payer = User.query.get(p.payer_id) if p.payer_id else None
+    for p, flat_number in rows:
         payment_list.append({
             'id': p.id,
             'payer_name': p.payer_name,
@@ -2556,15 +4350,27 @@ def get_payments():
             'description': p.description,
             'status': p.status,
             'due_date': p.due_date,
-            'flat_number': payer.flat_number if payer else 'N/A',
+            'flat_number': flat_number or 'N/A',
             'paid_date': p.paid_date.isoformat() if p.paid_date else None,
             'created_at': p.created_at.isoformat() if p.created_at else None
         })
     
-    return jsonify({
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1][0]
+        next_cursor = keyset_cursor_for(last.created_at, last.id)
+    
+    result = {
         'success': True,
-        'payments': payment_list
-    })
+        'payments': payment_list,
+        'next_cursor': next_cursor
+    }
+    if request.args.get('totals') == '1':
+        # Pages stop at ``limit`` rows, so sums over every payment must come from the server
+        count, amount, paid_amount = payment_totals_query(filters).one()
+        result['totals'] = {'count': count, 'amount': float(amount), 'paid_amount': float(paid_amount)}
+    
+    return jsonify(result)
 
 
 @app.route('/api/payments/<int:payment_id>/pay', methods=['POST'])
@@ -2580,9 +4386,7 @@ def pay_payment(payment_id):
     
     data = request.get_json()
     
-    payment.status = 'paid'
-    payment.paid_date = datetime.utcnow()
-    payment.payment_method = data.get('payment_method', payment.payment_method)
+    settle_payment(payment, data.get('payment_method'))
     db.session.commit()
     
     log_activity('Payment Made', f"Payment of {payment.amount} made for {payment.payment_type}", current_user)
@@ -2602,11 +4406,10 @@ def admin_mark_payment_paid():
     data = request.get_json()
     payment = Payment.query.get(data.get('payment_id'))
     
-    if not payment or payment.society_name != current_user.society_name:
+    if not payment or payment.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Payment not found'}), 404
     
-    payment.status = 'paid'
-    payment.paid_date = datetime.utcnow()
+    settle_payment(payment)
     db.session.commit()
     
     log_activity('Payment Marked Paid', f"Admin marked payment of ₹{payment.amount} as paid", current_user)
@@ -2679,7 +4482,7 @@ def get_pending_residents():
     
     pending = User.query.filter_by(
         user_type='resident',
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         is_approved=False
     ).all()
     
@@ -2705,10 +4508,11 @@ def approve_resident():
     data = request.get_json()
     user = User.query.get(data['user_id'])
     
-    if not user or user.society_name != current_user.society_name:
+    if not user or user.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'User not found'}), 404
     
     user.is_approved = True
+    mark_society_stats_stale(user.society_id)
     db.session.commit()
     log_activity('Resident Approved', f"Approved resident {user.full_name} (Flat {user.flat_number})", current_user)
     
@@ -2724,10 +4528,11 @@ def reject_resident():
     data = request.get_json()
     user = User.query.get(data['user_id'])
     
-    if not user or user.society_name != current_user.society_name:
+    if not user or user.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'User not found'}), 404
     
     db.session.delete(user)
+    mark_society_stats_stale(user.society_id)
     db.session.commit()
     log_activity('Resident Rejected', f"Rejected resident {user.full_name}", current_user)
     
@@ -2736,13 +4541,14 @@ def reject_resident():
 
 @app.route('/api/admin/residents/all', methods=['GET'])
 @login_required
+@conditional_get(resident_list_versions)
 def get_all_residents():
     if current_user.role != 'admin':
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     residents = User.query.filter_by(
         user_type='resident',
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         is_approved=True
     ).all()
     
@@ -2769,7 +4575,7 @@ def get_pending_guards():
     
     pending = User.query.filter_by(
         user_type='guard',
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         is_approved=False
     ).all()
     
@@ -2793,7 +4599,7 @@ def approve_guard():
     data = request.get_json()
     user = User.query.get(data['user_id'])
     
-    if not user or user.society_name != current_user.society_name:
+    if not user or user.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'User not found'}), 404
     
     user.is_approved = True
@@ -2812,7 +4618,7 @@ def reject_guard():
     data = request.get_json()
     user = User.query.get(data['user_id'])
     
-    if not user or user.society_name != current_user.society_name:
+    if not user or user.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'User not found'}), 404
     
     db.session.delete(user)
@@ -2830,7 +4636,7 @@ def get_all_guards():
     
     guards = User.query.filter_by(
         user_type='guard',
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         is_approved=True
     ).all()
     
@@ -2854,7 +4660,7 @@ def get_approval_requests():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     requests = ApprovalRequest.query.filter_by(
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         status='pending'
     ).all()
     
@@ -2880,12 +4686,13 @@ def approve_join_request():
     data = request.get_json()
     req = ApprovalRequest.query.get(data['request_id'])
     
-    if not req or req.society_name != current_user.society_name:
+    if not req or req.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Request not found'}), 404
     
     user = User.query.get(req.requester_id)
     if user:
         user.is_approved = True
+        mark_society_stats_stale(user.society_id)
         log_activity('Request Approved', f"Approved {user.full_name} ({user.user_type})", current_user)
         db.session.delete(req)
         db.session.commit()
@@ -2903,13 +4710,14 @@ def reject_join_request():
     data = request.get_json()
     req = ApprovalRequest.query.get(data['request_id'])
     
-    if not req or req.society_name != current_user.society_name:
+    if not req or req.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Request not found'}), 404
     
     user = User.query.get(req.requester_id)
     if user:
         user_name = user.full_name
         db.session.delete(user)
+        mark_society_stats_stale(user.society_id)
         log_activity('Request Rejected', f"Rejected {user_name}", current_user)
         db.session.delete(req)
         db.session.commit()
@@ -2927,7 +4735,7 @@ def promote_resident():
     data = request.get_json()
     user = User.query.get(data['user_id'])
     
-    if not user or user.society_name != current_user.society_name or user.user_type != 'resident':
+    if not user or user.society_id != current_user.society_id or user.user_type != 'resident':
         return jsonify({'success': False, 'message': 'User not found'}), 404
     
     user.role = 'admin'
@@ -2946,7 +4754,7 @@ def demote_admin():
     data = request.get_json()
     user = User.query.get(data['user_id'])
     
-    if not user or user.society_name != current_user.society_name or user.role != 'admin':
+    if not user or user.society_id != current_user.society_id or user.role != 'admin':
         return jsonify({'success': False, 'message': 'User not found'}), 404
     
     if user.id == current_user.id:
@@ -2966,7 +4774,7 @@ def update_announcement(ann_id):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     ann = Announcement.query.get(ann_id)
-    if not ann or ann.society_name != current_user.society_name:
+    if not ann or ann.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Announcement not found'}), 404
     
     data = request.get_json()
@@ -2984,7 +4792,7 @@ def delete_announcement(ann_id):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     ann = Announcement.query.get(ann_id)
-    if not ann or ann.society_name != current_user.society_name:
+    if not ann or ann.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Announcement not found'}), 404
     
     db.session.delete(ann)
@@ -3007,6 +4815,7 @@ def admin_pre_approve_visitor():
         purpose=data.get('purpose', data.get('visitor_type', 'Guest')),
         flat_number=data.get('flat_number', ''),
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         resident_id=None,
         permission_status='pre-approved',
         status='pending',
@@ -3023,6 +4832,201 @@ def admin_pre_approve_visitor():
     return jsonify({'success': True, 'message': 'Visitor pre-approved successfully', 'visitor_id': visitor.id})
 
 
+# Column names accepted for each guest field, in JSON lists and CSV headers alike
+BULK_GUEST_COLUMNS = {
+    'visitor_name': ('visitor_name', 'name', 'guest_name', 'guest'),
+    'visitor_phone': ('visitor_phone', 'phone', 'mobile'),
+    'flat_number': ('flat_number', 'flat'),
+    'purpose': ('purpose', 'visitor_type'),
+    'expected_date': ('expected_date', 'date'),
+    'expected_time': ('expected_time', 'time')
+}
+BULK_GUEST_LIMITS = {'visitor_name': 100, 'visitor_phone': 20, 'flat_number': 50, 'purpose': 200,
+                     'expected_date': 50, 'expected_time': 50}
+
+
+def read_bulk_guests():
+    """Guest rows and shared options from a multipart ``file`` CSV or a JSON ``guests`` list.
+
+    Raises ``ValueError`` when the CSV is not UTF-8 or cannot be parsed.
+    """
+    limit = app.config['QR_BULK_MAX_GUESTS']
+    upload = request.files.get('file')
+    if upload:
+        reader = csv.DictReader(TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''))
+        rows = []
+        try:
+            for row in reader:
+                rows.append(row)
+                if len(rows) > limit:
+                    break
+        except UnicodeDecodeError:
+            raise ValueError('The CSV file must be UTF-8 encoded; save it as "CSV UTF-8" and upload again')
+        except csv.Error as e:
+            raise ValueError(f"Could not read the CSV file: {e}")
+        return rows, request.form
+    
+    data = request.get_json(silent=True) or {}
+    guests = data.get('guests')
+    return guests if isinstance(guests, list) else [], data
+
+
+def normalize_bulk_guest(row, defaults):
+    """Map one guest row onto VisitorLog fields, or raise ``ValueError`` saying what is wrong."""
+    if not isinstance(row, dict):
+        raise ValueError('expected an object with visitor_name')
+    row = {str(name).strip().lower(): value for name, value in row.items() if name is not None}
+    guest = {}
+    for field, aliases in BULK_GUEST_COLUMNS.items():
+        value = next((row[alias] for alias in aliases if row.get(alias) not in (None, '')), defaults.get(field))
+        value = str(value).strip() if value is not None else ''
+        if len(value) > BULK_GUEST_LIMITS[field]:
+            raise ValueError(f"{field} is longer than {BULK_GUEST_LIMITS[field]} characters")
+        guest[field] = value or None
+    if not guest['visitor_name']:
+        raise ValueError('visitor_name is required')
+    return guest
+
+
+class ZipChunks(RawIOBase):
+    """Write-only sink for ``zipfile`` that hands back what was written since the last ``drain``.
+
+    It can't seek, so ``zipfile`` streams entries with data descriptors and the
+    archive never has to be held in memory.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        chunk = b''.join(self._chunks)
+        self._chunks.clear()
+        return chunk
+
+
+def visitor_pass_filename(visitor_id, name, fmt):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')[:40] or 'guest'
+    return f"{visitor_id}_{slug}.{fmt}"
+
+
+def stream_visitor_pass_zip(passes, fmt):
+    """Yield a ZIP of one QR image per pass, plus a passes.csv index, as it is built."""
+    sink = ZipChunks()
+    index = [('visitor_id', 'visitor_name', 'flat_number', 'file')]
+    payloads = (payload for _, _, _, payload in passes)
+    # PNG is already deflated; SVG text shrinks several times over
+    compression = zipfile.ZIP_DEFLATED if fmt == 'svg' else zipfile.ZIP_STORED
+    with zipfile.ZipFile(sink, 'w', compression=compression) as archive:
+        for (visitor_id, name, flat_number, _), (_, image) in zip(passes, qr_renderer.render_many(payloads, fmt)):
+            filename = visitor_pass_filename(visitor_id, name, fmt)
+            archive.writestr(filename, image)
+            index.append((visitor_id, name, flat_number or '', filename))
+            yield sink.drain()
+        listing = StringIO()
+        csv.writer(listing).writerows(index)
+        archive.writestr('passes.csv', listing.getvalue(), compress_type=zipfile.ZIP_DEFLATED)
+    yield sink.drain()
+
+
+def visitor_pass_cards(passes):
+    payloads = (payload for _, _, _, payload in passes)
+    for (visitor_id, name, flat_number, _), (_, image) in zip(passes, qr_renderer.render_many(payloads, 'svg')):
+        yield {'id': visitor_id, 'name': name, 'flat_number': flat_number, 'svg': image.decode()}
+
+
+@app.route('/api/visitors/pre-approve-admin/bulk', methods=['POST'])
+@login_required
+def admin_bulk_pre_approve_visitors():
+    """Pre-approve a guest list in one transaction and stream back their QR passes.
+
+    Takes a JSON ``guests`` list or a multipart ``file`` CSV. ``format`` picks a
+    ``zip`` of images (``image`` png or svg) or a printable HTML ``sheet``.
+    """
+    if current_user.role != 'admin':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    if not app.config['QR_PASS_SECRET']:
+        return visitor_passes_unavailable()
+    
+    try:
+        rows, options = read_bulk_guests()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    output = options.get('format', 'zip')
+    fmt = options.get('image', 'png')
+    if output not in ('zip', 'sheet') or fmt not in QR_FORMATS:
+        return jsonify({'success': False, 'message': 'format must be zip or sheet, image png or svg'}), 400
+    if not rows:
+        return jsonify({'success': False, 'message': 'No guests given'}), 400
+    if len(rows) > app.config['QR_BULK_MAX_GUESTS']:
+        return jsonify({
+            'success': False,
+            'message': f"At most {app.config['QR_BULK_MAX_GUESTS']} guests per request"
+        }), 400
+    
+    defaults = {'purpose': 'Guest', **{field: options.get(field) for field in BULK_GUEST_COLUMNS if options.get(field)}}
+    guests, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        try:
+            guests.append(normalize_bulk_guest(row, defaults))
+        except ValueError as e:
+            errors.append(f"Row {number}: {e}")
+    if errors:
+        return jsonify({'success': False, 'message': 'Some guests are invalid', 'errors': errors[:20]}), 400
+    
+    created_at = datetime.utcnow()
+    rows = [{
+        'visitor_name': guest['visitor_name'],
+        'visitor_phone': guest['visitor_phone'] or '',
+        'purpose': guest['purpose'],
+        'flat_number': guest['flat_number'] or '',
+        'society_name': current_user.society_name,
+        'society_id': current_user.society_id,
+        'resident_id': None,
+        'permission_status': 'pre-approved',
+        'status': 'pending',
+        'is_pre_approved': True,
+        'expected_date': guest['expected_date'],
+        'expected_time': guest['expected_time'],
+        'entry_time': None,
+        'created_at': created_at
+    } for guest in guests]
+    # One INSERT ... RETURNING statement for the whole list on PostgreSQL. SQLite can't return
+    # ids in parameter order from a multi-row insert, so there it runs one INSERT per guest;
+    # either way every visitor is inserted in this single transaction.
+    ids = db.session.scalars(
+        db.insert(VisitorLog).returning(VisitorLog.id, sort_by_parameter_order=True),
+        rows
+    ).all()
+    db.session.commit()
+    passes = [
+        (visitor_id, row['visitor_name'], row['flat_number'], visitor_qr_payload(VisitorLog(id=visitor_id, **row)))
+        for visitor_id, row in zip(ids, rows)
+    ]
+    
+    log_activity('Visitors Pre-Approved', f"Admin pre-approved {len(passes)} visitors in bulk", current_user)
+    
+    if output == 'sheet':
+        response = app.response_class(stream_template(
+            'visitor_passes.html',
+            passes=visitor_pass_cards(passes),
+            society_name=current_user.society_name,
+            count=len(passes)
+        ), mimetype='text/html')
+    else:
+        response = app.response_class(stream_with_context(stream_visitor_pass_zip(passes, fmt)),
+                                      mimetype='application/zip')
+        response.headers['Content-Disposition'] = f'attachment; filename=visitor_passes_{passes[0][0]}-{passes[-1][0]}.zip'
+    response.headers['X-Visitor-Count'] = str(len(passes))
+    return response
+
+
 @app.route('/api/visitors/pending', methods=['GET'])
 @login_required
 def get_pending_visitors_admin():
@@ -3030,7 +5034,7 @@ def get_pending_visitors_admin():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     pending = VisitorLog.query.filter_by(
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         permission_status='pending'
     ).order_by(VisitorLog.created_at.desc()).all()
     
@@ -3065,7 +5069,7 @@ def approve_visitor_admin():
     data = request.get_json()
     visitor = VisitorLog.query.get(data['visitor_id'])
     
-    if not visitor or visitor.society_name != current_user.society_name:
+    if not visitor or visitor.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Visitor not found'}), 404
     
     visitor.permission_status = 'approved'
@@ -3083,7 +5087,7 @@ def reject_visitor_admin():
     data = request.get_json()
     visitor = VisitorLog.query.get(data['visitor_id'])
     
-    if not visitor or visitor.society_name != current_user.society_name:
+    if not visitor or visitor.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Visitor not found'}), 404
     
     visitor.permission_status = 'rejected'
@@ -3101,10 +5105,12 @@ def guard_mark_visitor_entry():
     data = request.get_json()
     visitor = VisitorLog.query.get(data['visitor_id'])
     
-    if not visitor or visitor.society_name != current_user.society_name:
+    if not visitor or visitor.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Visitor not found'}), 404
     
+    previous_entry_time = visitor.entry_time
     visitor.entry_time = datetime.utcnow()
+    count_visitor_entry(visitor.society_id, visitor.entry_time, previous_entry_time)
     visitor.status = 'inside'
     visitor.guard_id = current_user.id
     visitor.guard_name = current_user.full_name
@@ -3122,7 +5128,7 @@ def guard_mark_visitor_exit():
     data = request.get_json()
     visitor = VisitorLog.query.get(data['visitor_id'])
     
-    if not visitor or visitor.society_name != current_user.society_name:
+    if not visitor or visitor.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Visitor not found'}), 404
     
     visitor.exit_time = datetime.utcnow()
@@ -3132,20 +5138,26 @@ def guard_mark_visitor_exit():
     return jsonify({'success': True, 'message': 'Exit marked'})
 
 
+def expected_visitors_query(society_id):
+    """Approved visitors due today who have not arrived yet."""
+    day_start, day_end = utc_day_bounds()
+    return VisitorLog.query.filter(
+        VisitorLog.society_id == society_id,
+        VisitorLog.entry_time >= day_start,
+        VisitorLog.entry_time < day_end,
+        VisitorLog.permission_status.in_(['pre-approved', 'approved']),
+        VisitorLog.status != 'inside',
+        VisitorLog.status != 'exited'
+    )
+
+
 @app.route('/api/visitors/expected', methods=['GET'])
 @login_required
 def get_expected_visitors_guard():
     if current_user.role != 'guard':
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
-    today = datetime.utcnow().date()
-    expected = VisitorLog.query.filter(
-        VisitorLog.society_name == current_user.society_name,
-        VisitorLog.permission_status.in_(['pre-approved', 'approved']),
-        VisitorLog.status != 'inside',
-        VisitorLog.status != 'exited',
-        db.func.date(VisitorLog.entry_time) == today
-    ).all()
+    expected = expected_visitors_query(current_user.society_id).all()
     
     return jsonify({
         'success': True,
@@ -3165,7 +5177,7 @@ def get_visitors_currently_inside():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     inside = VisitorLog.query.filter(
-        VisitorLog.society_name == current_user.society_name,
+        VisitorLog.society_id == current_user.society_id,
         VisitorLog.status == 'inside'
     ).all()
     
@@ -3181,28 +5193,35 @@ def get_visitors_currently_inside():
     })
 
 
+def compute_society_stats(society_id):
+    """Dashboard counts for one society; served through ``society_stats_cache``."""
+    dues_collected = db.session.query(db.func.sum(Payment.amount)).filter(
+        Payment.society_id == society_id,
+        Payment.status == 'paid'
+    ).scalar() or 0
+    
+    return {
+        'residents': User.query.filter_by(user_type='resident', society_id=society_id, is_approved=True).count(),
+        'pending_requests': MaintenanceRequest.query.filter_by(society_id=society_id, status='pending').count(),
+        'visitors_today': visitors_on(society_id),
+        'dues_collected': dues_collected
+    }
+
+
 @app.route('/api/admin/dashboard/data', methods=['GET'])
 @login_required
 def get_admin_dashboard_data():
     if current_user.role != 'admin':
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
-    society_name = current_user.society_name
-    
-    residents = User.query.filter_by(user_type='resident', society_name=society_name, is_approved=True).count()
-    pending_maintenance = MaintenanceRequest.query.filter_by(society_name=society_name, status='pending').count()
-    today = datetime.utcnow().date()
-    visitors_today = VisitorLog.query.filter(
-        VisitorLog.society_name == society_name,
-        db.func.date(VisitorLog.entry_time) == today
-    ).count()
+    stats = society_stats_cache.get_or_compute(current_user.society_id, compute_society_stats)
     
     return jsonify({
         'success': True,
         'data': {
-            'residents': residents,
-            'pending_requests': pending_maintenance,
-            'visitors_today': visitors_today
+            'residents': stats['residents'],
+            'pending_requests': stats['pending_requests'],
+            'visitors_today': stats['visitors_today']
         }
     })
 
@@ -3214,38 +5233,180 @@ def set_maintenance_amount():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     data = request.get_json()
-    amount = data['amount']
+    try:
+        amount = float(data['amount'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'A numeric amount is required'}), 400
     month = data.get('month', datetime.utcnow().strftime('%B %Y'))
     
-    residents = User.query.filter_by(
-        user_type='resident',
-        society_name=current_user.society_name,
-        is_approved=True
-    ).all()
-    
-    for resident in residents:
-        payment = Payment(
-            payer_id=resident.id,
-            payer_name=resident.full_name,
-            amount=amount,
-            payment_type='maintenance',
-            description=f'Maintenance for {month}',
-            society_name=current_user.society_name,
-            status='pending',
-            due_date=month
-        )
-        db.session.add(payment)
+    try:
+        residents, bills_created = bill_maintenance(current_user.society_id, current_user.society_name, amount, month)
+    except IntegrityError:
+        # A concurrent run billed some of the same flats first; the retry skips them
+        db.session.rollback()
+        residents, bills_created = bill_maintenance(current_user.society_id, current_user.society_name, amount, month)
     
-    db.session.commit()
-    log_activity('Set Maintenance', f"Set maintenance of ₹{amount} for {len(residents)} residents", current_user)
+    log_activity('Set Maintenance', f"Set maintenance of ₹{data['amount']} for {bills_created} residents ({month})", current_user)
     
     return jsonify({
         'success': True,
-        'message': f'Maintenance of ₹{amount} set for {len(residents)} residents',
-        'bills_created': len(residents)
+        'message': f"Maintenance of ₹{data['amount']} set for {bills_created} residents",
+        'bills_created': bills_created,
+        'already_billed': residents - bills_created,
+        'residents': residents
     })
 
 
+def bill_maintenance(society_id, society_name, amount, month):
+    """Insert a pending maintenance bill for every approved resident not yet billed for ``month``.
+
+    Runs as one INSERT ... SELECT and commits. Returns (approved residents, bills created).
+    """
+    resident_filter = db.and_(
+        User.user_type == 'resident',
+        User.society_id == society_id,
+        User.is_approved == True
+    )
+    already_billed = db.select(Payment.id).where(
+        Payment.society_id == society_id,
+        Payment.payer_id == User.id,
+        Payment.payment_type == 'maintenance',
+        Payment.due_date == month
+    ).exists()
+    
+    now = datetime.utcnow()
+    unbilled = db.select(
+        User.id,
+        User.full_name,
+        db.literal(amount, db.Float),
+        db.literal('maintenance'),
+        db.literal(f'Maintenance for {month}'),
+        db.literal(society_name, db.String),
+        db.literal(society_id, db.Integer),
+        db.literal('pending'),
+        db.literal(month),
+        db.literal(now, db.DateTime)
+    ).where(resident_filter, ~already_billed)
+    
+    residents = db.session.scalar(db.select(db.func.count(User.id)).where(resident_filter))
+    result = db.session.execute(db.insert(Payment).from_select([
+        'payer_id', 'payer_name', 'amount', 'payment_type', 'description',
+        'society_name', 'society_id', 'status', 'due_date', 'created_at'
+    ], unbilled))
+    if result.rowcount:
+        record_dues(society_id, month, 'pending', result.rowcount, result.rowcount * amount)
+    db.session.commit()
+    return residents, result.rowcount
+
+
+def record_dues(society_id, month, status, bill_count, amount):
+    """Add ``bill_count`` maintenance bills totalling ``amount`` to the monthly dues rollup.
+
+    Either value may be negative when a bill moves out of ``status``. Runs in the
+    caller's transaction so the rollup commits together with the payment rows.
+    """
+    if not society_id or not month:
+        return
+    
+    updated = MonthlyDuesSummary.query.filter_by(society_id=society_id, month=month, status=status).update({
+        MonthlyDuesSummary.bill_count: MonthlyDuesSummary.bill_count + bill_count,
+        MonthlyDuesSummary.total_amount: MonthlyDuesSummary.total_amount + amount
+    }, synchronize_session=False)
+    if updated:
+        return
+    
+    try:
+        with db.session.begin_nested():
+            db.session.add(MonthlyDuesSummary(
+                society_id=society_id, month=month, status=status,
+                bill_count=bill_count, total_amount=amount
+            ))
+    except IntegrityError:
+        # Another request created this month's row first
+        MonthlyDuesSummary.query.filter_by(society_id=society_id, month=month, status=status).update({
+            MonthlyDuesSummary.bill_count: MonthlyDuesSummary.bill_count + bill_count,
+            MonthlyDuesSummary.total_amount: MonthlyDuesSummary.total_amount + amount
+        }, synchronize_session=False)
+
+
+def settle_payment(payment, payment_method=None):
+    """Mark ``payment`` paid in the caller's transaction.
+
+    The status check is part of the UPDATE, so two concurrent requests cannot
+    both move the same maintenance bill from pending to paid in the dues rollup.
+    """
+    old_status = payment.status
+    values = {Payment.status: 'paid', Payment.paid_date: datetime.utcnow()}
+    if payment_method:
+        values[Payment.payment_method] = payment_method
+    
+    updated = Payment.query.filter(
+        Payment.id == payment.id,
+        Payment.status == old_status
+    ).update(values, synchronize_session='evaluate')
+    
+    if updated and old_status != 'paid' and payment.payment_type == 'maintenance':
+        record_dues(payment.society_id, payment.due_date, old_status, -1, -payment.amount)
+        record_dues(payment.society_id, payment.due_date, 'paid', 1, payment.amount)
+    mark_society_stats_stale(payment.society_id)
+
+
+def rebuild_dues_summaries():
+    """Recompute the monthly dues rollup from the payment table."""
+    MonthlyDuesSummary.query.delete()
+    
+    totals = db.select(
+        Payment.society_id,
+        Payment.due_date,
+        Payment.status,
+        db.func.count(Payment.id),
+        db.func.sum(Payment.amount),
+        db.func.min(Payment.created_at)
+    ).where(
+        Payment.payment_type == 'maintenance',
+        Payment.society_id.isnot(None),
+        Payment.due_date.isnot(None),
+        Payment.status.isnot(None)
+    ).group_by(Payment.society_id, Payment.due_date, Payment.status)
+    
+    db.session.execute(db.insert(MonthlyDuesSummary).from_select(
+        ['society_id', 'month', 'status', 'bill_count', 'total_amount', 'created_at'],
+        totals
+    ))
+    db.session.commit()
+    return MonthlyDuesSummary.query.count()
+
+
+@app.cli.command('rebuild-dues-summaries')
+def rebuild_dues_summaries_command():
+    """Recompute the monthly maintenance dues rollup from scratch."""
+    count = rebuild_dues_summaries()
+    print(f"✅ Rebuilt {count} monthly dues rows")
+
+
+def dues_status_totals_statement(filters):
+    """Bill count and amount per status over the maintenance bills matching ``filters``."""
+    return db.select(
+        Payment.status, db.func.count(Payment.id), db.func.sum(Payment.amount)
+    ).where(*filters).group_by(Payment.status)
+
+
+def dues_rollup_query(society_id, months_limit):
+    """Monthly dues rollup rows for the society's ``months_limit`` most recently billed months."""
+    recent_months = db.select(
+        MonthlyDuesSummary.month,
+        db.func.min(MonthlyDuesSummary.created_at).label('first_billed')
+    ).where(
+        MonthlyDuesSummary.society_id == society_id
+    ).group_by(MonthlyDuesSummary.month).order_by(db.desc('first_billed')).limit(months_limit).subquery()
+    
+    return MonthlyDuesSummary.query.join(
+        recent_months, recent_months.c.month == MonthlyDuesSummary.month
+    ).filter(
+        MonthlyDuesSummary.society_id == society_id
+    ).order_by(recent_months.c.first_billed.desc())
+
+
 @app.route('/api/admin/payments/overview', methods=['GET'])
 @login_required
 def get_payments_overview():
@@ -3253,28 +5414,57 @@ def get_payments_overview():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     month = request.args.get('month', datetime.utcnow().strftime('%B %Y'))
+    limit = parse_page_limit()
+    try:
+        months_limit = min(max(int(request.args.get('months', 12)), 1), 60)
+    except (ValueError, TypeError):
+        months_limit = 12
     
-    payments = Payment.query.filter_by(
-        society_name=current_user.society_name,
-        payment_type='maintenance'
-    ).all()
+    after = request.args.get('after')
+    cursor = parse_keyset_cursor(after)
+    if after and not cursor:
+        return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+    
+    filters = payment_filters(current_user, 'maintenance', month=month)
+    
+    totals = {status: (count, amount or 0) for status, count, amount in db.session.execute(
+        dues_status_totals_statement(filters)
+    )}
+    
+    rows = apply_keyset_page(payment_list_query(filters), Payment.created_at, Payment.id, cursor, limit)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1][0]
+        next_cursor = keyset_cursor_for(last.created_at, last.id)
     
-    collected = sum(p.amount for p in payments if p.status == 'paid')
-    pending = sum(p.amount for p in payments if p.status == 'pending')
+    rollup = {}
+    for summary in dues_rollup_query(current_user.society_id, months_limit):
+        rollup.setdefault(summary.month, {})[summary.status] = {
+            'count': summary.bill_count,
+            'amount': summary.total_amount
+        }
     
     return jsonify({
         'success': True,
-        'collected': collected,
-        'pending': pending,
+        'month': month,
+        'collected': totals.get('paid', (0, 0))[1],
+        'pending': totals.get('pending', (0, 0))[1],
+        'totals': {status: {'count': count, 'amount': amount} for status, (count, amount) in totals.items()},
         'payments': [{
             'id': p.id,
             'payer_id': p.payer_id,
             'payer_name': p.payer_name,
+            'flat_number': flat_number or 'N/A',
             'amount': p.amount,
             'status': p.status,
             'due_date': p.due_date,
             'paid_date': p.paid_date.isoformat() if p.paid_date else None
-        } for p in payments]
+        } for p, flat_number in rows],
+        'next_cursor': next_cursor,
+        'months': [{'month': month_name, 'statuses': statuses} for month_name, statuses in rollup.items()]
     })
 
 
@@ -3287,12 +5477,10 @@ def mark_payment_paid():
     data = request.get_json()
     payment = Payment.query.get(data['payment_id'])
     
-    if not payment or payment.society_name != current_user.society_name:
+    if not payment or payment.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Payment not found'}), 404
     
-    payment.status = 'paid'
-    payment.paid_date = datetime.utcnow()
-    payment.payment_method = 'cash'
+    settle_payment(payment, 'cash')
     db.session.commit()
     
     log_activity('Payment Marked Paid', f"Marked payment of ₹{payment.amount} from {payment.payer_name} as paid (cash)", current_user)
@@ -3309,7 +5497,7 @@ def send_payment_reminder():
     data = request.get_json()
     payment = Payment.query.get(data['payment_id'])
     
-    if not payment or payment.society_name != current_user.society_name:
+    if not payment or payment.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Payment not found'}), 404
     
     notification = ActivityLog(
@@ -3318,7 +5506,8 @@ def send_payment_reminder():
         user_id=payment.payer_id,
         user_name='Admin',
         user_type='notification',
-        society_name=current_user.society_name
+        society_name=current_user.society_name,
+        society_id=current_user.society_id
     )
     db.session.add(notification)
     db.session.commit()
@@ -3331,34 +5520,28 @@ def send_payment_reminder():
 @app.route('/api/chat-groups/society', methods=['GET'])
 @login_required
 def get_society_chat_groups():
-    society_group = ChatGroup.query.filter_by(
-        society_name=current_user.society_name,
-        group_type='society'
-    ).first()
+    all_groups = ChatGroup.query.filter_by(society_id=current_user.society_id).order_by(ChatGroup.id).all()
     
-    if not society_group:
+    if not any(g.group_type == 'society' for g in all_groups):
         society_group = ChatGroup(
             name='Entire Society',
             group_type='society',
             society_name=current_user.society_name,
+            society_id=current_user.society_id,
             created_by_id=current_user.id
         )
         db.session.add(society_group)
         db.session.commit()
+        all_groups.insert(0, society_group)
     
-    all_groups = ChatGroup.query.filter_by(society_name=current_user.society_name).all()
-    
-    groups_data = []
-    for g in all_groups:
-        last_msg = ChatMessage.query.filter_by(group_id=g.id).order_by(ChatMessage.created_at.desc()).first()
-        groups_data.append({
-            'id': g.id,
-            'name': g.name,
-            'group_type': g.group_type,
-            'last_message': last_msg.message if last_msg else None,
-            'last_sender': last_msg.sender_name if last_msg else None,
-            'last_time': last_msg.created_at.isoformat() if last_msg and last_msg.created_at else None
-        })
+    groups_data = [{
+        'id': g.id,
+        'name': g.name,
+        'group_type': g.group_type,
+        'last_message': g.last_message_preview,
+        'last_sender': g.last_sender_name,
+        'last_time': g.last_message_at.isoformat() if g.last_message_at else None
+    } for g in all_groups]
     
     return jsonify({'success': True, 'groups': groups_data})
 
@@ -3372,6 +5555,7 @@ def create_chat_group_new():
         name=data['name'],
         group_type='custom',
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         created_by_id=current_user.id
     )
     db.session.add(group)
@@ -3384,10 +5568,10 @@ def create_chat_group_new():
 @login_required
 def get_group_messages(group_id):
     group = ChatGroup.query.get(group_id)
-    if not group or group.society_name != current_user.society_name:
+    if not group or group.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Group not found'}), 404
     
-    messages = ChatMessage.query.filter_by(group_id=group_id).order_by(ChatMessage.created_at.desc()).limit(50).all()
+    messages, has_more = chat_messages_page(group_id, request.args.get('since_id', type=int), parse_page_limit())
     
     return jsonify({
         'success': True,
@@ -3398,7 +5582,8 @@ def get_group_messages(group_id):
             'sender_name': m.sender_name,
             'created_at': m.created_at.isoformat() if m.created_at else None,
             'is_mine': m.sender_id == current_user.id
-        } for m in reversed(messages)]
+        } for m in messages],
+        'has_more': has_more
     })
 
 
@@ -3406,19 +5591,14 @@ def get_group_messages(group_id):
 @login_required
 def send_group_message(group_id):
     group = ChatGroup.query.get(group_id)
-    if not group or group.society_name != current_user.society_name:
+    if not group or group.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Group not found'}), 404
     
     data = request.get_json()
     
-    message = ChatMessage(
-        message=data['message'],
-        group_id=group_id,
-        sender_id=current_user.id,
-        sender_name=current_user.full_name
-    )
-    db.session.add(message)
+    message = post_chat_message(group_id, current_user, data['message'])
     db.session.commit()
+    socketio.emit('new_message', chat_message_payload(message), room=f"chat_{group_id}")
     
     return jsonify({'success': True, 'message': 'Message sent', 'message_id': message.id})
 
@@ -3441,7 +5621,7 @@ def get_admin_activity_log():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     logs = ActivityLog.query.filter_by(
-        society_name=current_user.society_name
+        society_id=current_user.society_id
     ).order_by(ActivityLog.created_at.desc()).limit(20).all()
     
     return jsonify({
@@ -3460,7 +5640,7 @@ def get_admin_activity_log():
 @login_required
 def get_visitor_history():
     visitors = VisitorLog.query.filter_by(
-        society_name=current_user.society_name
+        society_id=current_user.society_id
     ).order_by(VisitorLog.created_at.desc()).limit(50).all()
     
     return jsonify({
@@ -3488,7 +5668,7 @@ def get_society_businesses():
     if current_user.role != 'admin':
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
-    business_societies = BusinessSociety.query.filter_by(society_name=current_user.society_name).all()
+    business_societies = BusinessSociety.query.filter_by(society_id=current_user.society_id).all()
     business_ids = [bs.business_id for bs in business_societies]
     
     businesses = User.query.filter(User.id.in_(business_ids), User.user_type == 'business').all()
@@ -3505,19 +5685,183 @@ def get_society_businesses():
     })
 
 
+# Longest edge in pixels of each stored rendition
+PHOTO_SIZES = {'small': 64, 'medium': 256, 'large': 640}
+
+
+# Keys an upload has stored but not yet committed to a user row, so a concurrent
+# discard of the same content cannot delete the files underneath it
+_photo_claims = {}
+_photo_store_lock = threading.Lock()
+
+
+def photo_dir(key):
+    return os.path.join(app.config['PHOTO_STORE_DIR'], key[:2], key)
+
+
+def profile_photo_url(key, size='medium'):
+    return f"/media/photos/{key}/{size}.jpg" if key else None
+
+
+def profile_photo_urls(key):
+    return {size: profile_photo_url(key, size) for size in PHOTO_SIZES} if key else None
+
+
+def decode_photo_upload():
+    """Raw image bytes from a multipart ``photo`` file or a JSON ``photo`` data-URL."""
+    upload = request.files.get('photo')
+    if upload:
+        return upload.read(app.config['PHOTO_MAX_BYTES'] + 1)
+    
+    data = request.get_json(silent=True) or {}
+    photo = data.get('photo')
+    if not isinstance(photo, str):
+        return None
+    try:
+        return base64.b64decode(photo.split(',', 1)[-1], validate=True)
+    except (ValueError, TypeError):
+        return None
+
+
+def write_profile_photo(key, raw):
+    """Render ``raw`` into the photo store under ``key`` unless it is already there."""
+    directory = photo_dir(key)
+    if os.path.isdir(directory):
+        return
+    
+    try:
+        image = Image.open(BytesIO(raw))
+        image = ImageOps.exif_transpose(image).convert('RGB')
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Not a readable image: {e}")
+    
+    staging = f"{directory}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(staging, exist_ok=True)
+    for size, edge in PHOTO_SIZES.items():
+        rendition = image.copy()
+        rendition.thumbnail((edge, edge), Image.LANCZOS)
+        rendition.save(os.path.join(staging, f"{size}.jpg"), 'JPEG', quality=85, optimize=True, progressive=True)
+    try:
+        os.rename(staging, directory)
+    except OSError:
+        # Another upload of the same image got there first
+        for name in os.listdir(staging):
+            os.remove(os.path.join(staging, name))
+        os.rmdir(staging)
+
+
+def store_profile_photo(raw):
+    """Save every rendition of an uploaded image and return its content key.
+
+    Keys are content hashes, so a stored photo never changes and identical
+    uploads share files. The key stays claimed until ``release_profile_photo``,
+    which the caller runs once the row pointing at it is committed. Raises
+    ``ValueError`` for data Pillow can't read.
+    """
+    key = hashlib.sha1(raw).hexdigest()
+    with _photo_store_lock:
+        _photo_claims[key] = _photo_claims.get(key, 0) + 1
+    try:
+        write_profile_photo(key, raw)
+    except Exception:
+        release_profile_photo(key)
+        raise
+    return key
+
+
+def release_profile_photo(key):
+    """Drop one upload's claim on ``key`` after its row has been committed."""
+    with _photo_store_lock:
+        if _photo_claims.get(key, 0) > 1:
+            _photo_claims[key] -= 1
+        else:
+            _photo_claims.pop(key, None)
+
+
+def discard_profile_photo(key):
+    """Delete a photo's files once no user points at it and no upload is reusing it."""
+    if not key:
+        return
+    with _photo_store_lock:
+        if key in _photo_claims or User.query.filter_by(photo_key=key).first():
+            return
+        directory = photo_dir(key)
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+
 @app.route('/api/profile/photo', methods=['POST'])
 @login_required
 def upload_profile_photo():
-    data = request.get_json()
-    if not data or 'photo' not in data:
+    raw = decode_photo_upload()
+    if not raw:
         return jsonify({'success': False, 'message': 'No photo provided'}), 400
+    if len(raw) > app.config['PHOTO_MAX_BYTES']:
+        return jsonify({'success': False, 'message': 'Photo is too large'}), 413
     
-    current_user.profile_photo = data['photo']
-    db.session.commit()
+    try:
+        key = store_profile_photo(raw)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Photo must be a JPEG, PNG, GIF or WebP image'}), 400
+    
+    old_key = current_user.photo_key
+    try:
+        current_user.row.photo_key = key
+        current_user.row.profile_photo = None
+        db.session.commit()
+    finally:
+        release_profile_photo(key)
+    if old_key != key:
+        discard_profile_photo(old_key)
     
     log_activity('Profile Photo Updated', f"{current_user.full_name} updated their profile photo", current_user)
     
-    return jsonify({'success': True, 'message': 'Photo updated successfully'})
+    return jsonify({
+        'success': True,
+        'message': 'Photo updated successfully',
+        'profile_photo': profile_photo_url(key),
+        'profile_photos': profile_photo_urls(key)
+    })
+
+
+@app.route('/media/photos/<key>/<size>.jpg')
+@login_required
+def profile_photo_file(key, size):
+    if size not in PHOTO_SIZES or len(key) != 40 or not all(c in '0123456789abcdef' for c in key):
+        abort(404)
+    return send_from_directory(photo_dir(key), f"{size}.jpg", max_age=app.config['ASSET_MAX_AGE'])
+
+
+@app.cli.command('migrate-profile-photos')
+def migrate_profile_photos_command():
+    """Move base64 profile photos out of the user table into the photo store.
+
+    Rows whose photo cannot be decoded keep their ``profile_photo`` and are listed
+    at the end, so nothing is lost and the command can be re-run after fixing them.
+    """
+    moved = 0
+    failed = []
+    user_ids = db.session.scalars(db.select(User.id).where(User.profile_photo != None)).all()
+    for user_id in user_ids:
+        user = db.session.get(User, user_id)
+        try:
+            key = store_profile_photo(base64.b64decode(user.profile_photo.split(',', 1)[-1]))
+        except ValueError as e:
+            print(f"❌ User {user_id}: {e}")
+            failed.append(user_id)
+            continue
+        try:
+            user.photo_key = key
+            user.profile_photo = None
+            db.session.commit()
+        finally:
+            release_profile_photo(key)
+        moved += 1
+    print(f"✅ Moved {moved} profile photos into {app.config['PHOTO_STORE_DIR']}")
+    if failed:
+        print(f"❌ {len(failed)} unreadable photos left in place for users: {', '.join(map(str, failed))}")
 
 
 @app.route('/api/business/send-bill', methods=['POST'])
@@ -3583,28 +5927,45 @@ def get_admin_stats():
     if current_user.role != 'admin':
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
-    society_name = current_user.society_name
-    
-    residents = User.query.filter_by(user_type='resident', society_name=society_name, is_approved=True).count()
-    pending_requests = MaintenanceRequest.query.filter_by(society_name=society_name, status='pending').count()
+    stats = society_stats_cache.get_or_compute(current_user.society_id, compute_society_stats)
     
-    today = datetime.utcnow().date()
-    visitors_today = VisitorLog.query.filter(
-        VisitorLog.society_name == society_name,
-        db.func.date(VisitorLog.entry_time) == today
-    ).count()
-    
-    dues_collected = db.session.query(db.func.sum(Payment.amount)).filter(
-        Payment.society_name == society_name,
-        Payment.status == 'paid'
-    ).scalar() or 0
+    return jsonify({'success': True, **stats})
+
+
+@app.route('/api/metrics', methods=['GET'])
+@login_required
+def get_metrics():
+    if current_user.role != 'admin':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     return jsonify({
         'success': True,
-        'residents': residents,
-        'pending_requests': pending_requests,
-        'visitors_today': visitors_today,
-        'dues_collected': dues_collected
+        'metrics': {
+            'society_stats_cache': society_stats_cache.metrics(),
+            'resident_directory_cache': resident_directory_cache.metrics(),
+            'user_principal_cache': user_principal_cache.metrics(),
+            'password_hasher': password_hasher.metrics(),
+            'qr_renderer': qr_renderer.metrics(),
+            'visitor_passes': dict(visitor_pass_stats),
+            'activity_log_writer': activity_log_writer.metrics(),
+            'chat_message_writer': chat_message_writer.metrics(),
+            'conditional_get': {
+                versions.name: versions.metrics()
+                for versions in (announcement_versions, resident_list_versions,
+                                 business_directory_versions, user_profile_versions)
+            },
+            'compression': {
+                encoding: {**stats, 'ratio': round(stats['bytes_out'] / stats['bytes_in'], 3)}
+                for encoding, stats in compression_stats.items()
+            },
+            'socketio': {
+                'async_mode': socketio.async_mode,
+                'transports': app.config['SOCKETIO_TRANSPORTS'],
+                'ping_interval': app.config['SOCKETIO_PING_INTERVAL'],
+                'ping_timeout': app.config['SOCKETIO_PING_TIMEOUT'],
+                **socket_connections
+            }
+        }
     })
 
 
@@ -3620,86 +5981,368 @@ def get_business_stats():
     from sqlalchemy import func
     month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     earnings = db.session.query(func.sum(Payment.amount)).filter(
-        Payment.created_by_id == current_user.id,
+        Payment.payee_id == current_user.id,
         Payment.status == 'paid',
         Payment.created_at >= month_start
     ).scalar() or 0
     
+    summary = BusinessRatingSummary.query.get(current_user.id)
+    
     return jsonify({
         'success': True,
         'total_bookings': total_bookings,
         'pending_requests': pending_requests,
         'earnings': earnings,
-        'avg_rating': 4.5
+        'avg_rating': summary.average_rating if summary else 0,
+        'review_count': summary.review_count if summary else 0,
+        'rating_histogram': summary.histogram if summary else {str(star): 0 for star in range(1, 6)}
+    })
+
+
+def sample_principal(**values):
+    """A ``UserPrincipal`` for building an endpoint's queries outside a request."""
+    return UserPrincipal({
+        **{field: None for field in UserPrincipal.FIELDS},
+        'id': 1, 'society_id': 1, 'flat_number': 'A-101', 'user_type': 'resident', 'role': 'resident',
+        **values
+    })
+
+
+def hot_query_statements():
+    """The list queries behind the busiest dashboard endpoints, keyed by endpoint.
+
+    Endpoints whose filters depend on the caller are built from the same
+    helpers the views use, once per role, so the plans checked are the ones
+    those users actually run.
+    """
+    society_id = 1
+    user_id = 1
+    group_id = 1
+    cursor = (datetime(2026, 1, 1), 1000)
+    roles = {
+        'admin': sample_principal(role='admin'),
+        'resident': sample_principal(),
+        'business': sample_principal(user_type='business', role='business'),
+        'guard': sample_principal(user_type='guard', role='guard'),
+    }
+    
+    statements = {}
+    for role in ('admin', 'resident', 'business'):
+        filters = maintenance_request_filters(roles[role])
+        statements[f'GET /api/maintenance-requests ({role})'] = keyset_page_query(
+            maintenance_request_list_query(filters), MaintenanceRequest.created_at, MaintenanceRequest.id, None, 50
+        )
+        statements[f'GET /api/maintenance-requests?totals=1 ({role})'] = maintenance_request_count_query(filters)
+    statements['GET /api/maintenance-requests?after= (resident)'] = keyset_page_query(
+        maintenance_request_list_query(maintenance_request_filters(roles['resident'])),
+        MaintenanceRequest.created_at, MaintenanceRequest.id, cursor, 50
+    )
+    
+    for role in ('admin', 'resident', 'business'):
+        filters = payment_filters(roles[role])
+        statements[f'GET /api/payments ({role})'] = keyset_page_query(
+            payment_list_query(filters), Payment.created_at, Payment.id, None, 50
+        )
+        statements[f'GET /api/payments?totals=1 ({role})'] = payment_totals_query(filters)
+    
+    dues_filters = payment_filters(roles['admin'], 'maintenance', month='January 2026')
+    statements['GET /api/admin/payments/overview'] = keyset_page_query(
+        payment_list_query(dues_filters), Payment.created_at, Payment.id, cursor, 50
+    )
+    statements['GET /api/admin/payments/overview (totals)'] = dues_status_totals_statement(dues_filters)
+    statements['GET /api/admin/payments/overview (months)'] = dues_rollup_query(society_id, 12)
+    
+    for role in ('guard', 'resident'):
+        statements[f'GET /api/visitor-log ({role})'] = visitor_log_list_query(visitor_log_filters(roles[role]))
+    statements['GET /api/visitors/expected'] = expected_visitors_query(society_id)
+    statements['GET /api/chat-groups/<id>/messages'] = chat_messages_query(group_id)
+    statements['GET /api/chat-groups/<id>/messages?since_id='] = chat_messages_query(group_id, since_id=1000)
+    
+    # Single-column lookups with no per-role variants
+    statements.update({
+        'GET /api/visitor-logs/history': db.select(VisitorLog).where(
+            VisitorLog.society_id == society_id
+        ).order_by(VisitorLog.created_at.desc()).limit(50),
+        'GET /api/activity-logs': db.select(ActivityLog).where(
+            ActivityLog.society_id == society_id
+        ).order_by(ActivityLog.created_at.desc()).limit(20),
+        'GET /api/announcements': db.select(Announcement).where(
+            Announcement.society_id == society_id
+        ).order_by(Announcement.created_at.desc()),
+        'GET /api/notifications': db.select(Notification).where(
+            Notification.user_id == user_id
+        ).order_by(Notification.created_at.desc()).limit(50),
+        'GET /api/notifications (unread count)': db.select(db.func.count(Notification.id)).where(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        ),
+        'GET /api/chat-groups/society': db.select(ChatGroup).where(
+            ChatGroup.society_id == society_id
+        ).order_by(ChatGroup.id),
     })
+    return statements
+
+
+def find_full_table_scans(statement):
+    """EXPLAIN a statement or query and return a description of every full table scan in its plan."""
+    if hasattr(statement, 'statement'):
+        statement = statement.statement
+    # Expand IN lists into one placeholder per value so EXPLAIN can bind them
+    compiled = statement.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+    params = compiled.construct_params()
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    sql = str(compiled)
+    
+    with db.engine.connect() as conn:
+        if db.engine.dialect.name == 'sqlite':
+            plan = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}', params).all()
+            return [
+                row[-1] for row in plan
+                if row[-1].startswith('SCAN ') and ' USING ' not in row[-1]
+                and row[-1] != 'SCAN CONSTANT ROW'
+            ]
+        
+        # Small tables make Postgres prefer a seq scan regardless, so rule it
+        # out: if one still appears, no index can serve the query.
+        with conn.begin():
+            conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+            plan = conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {sql}', params).scalar()
+    
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    scans = []
+    nodes = [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node.get('Node Type') == 'Seq Scan':
+            scans.append(f"Seq Scan on {node.get('Relation Name')}")
+        nodes.extend(node.get('Plans', []))
+    return scans
+
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """EXPLAIN the hot endpoint queries and fail on any full table scan."""
+    failures = 0
+    for endpoint, statement in hot_query_statements().items():
+        scans = find_full_table_scans(statement)
+        if scans:
+            failures += 1
+            print(f"❌ {endpoint}: {'; '.join(scans)}")
+        else:
+            print(f"✅ {endpoint}")
+    
+    if failures:
+        print(f"{failures} hot queries fall back to a full table scan")
+        raise SystemExit(1)
+
+
+socket_connections = {'connected': 0, 'peak_connected': 0, 'refused': 0}
+_socket_connections_lock = threading.Lock()
 
 
 @socketio.on('connect')
 def handle_connect():
-    if hasattr(current_user, 'id') and current_user.is_authenticated:
-        join_room(f"user_{current_user.id}")
-        join_room(f"society_{current_user.society_name}")
+    if not current_user.is_authenticated:
+        # Only signed-in dashboards get a socket; anonymous ones would just hold a slot
+        with _socket_connections_lock:
+            socket_connections['refused'] += 1
+        return False
+    
+    join_room(f"user_{current_user.id}")
+    join_room(f"society_{current_user.society_id}")
+    with _socket_connections_lock:
+        socket_connections['connected'] += 1
+        socket_connections['peak_connected'] = max(socket_connections['peak_connected'], socket_connections['connected'])
 
 
 @socketio.on('disconnect')
-def handle_disconnect():
-    if hasattr(current_user, 'id') and current_user.is_authenticated:
-        leave_room(f"user_{current_user.id}")
-        leave_room(f"society_{current_user.society_name}")
+def handle_disconnect(reason=None):
+    with _socket_connections_lock:
+        socket_connections['connected'] -= 1
+
+
+_chat_group_societies = OrderedDict()
+_chat_group_societies_lock = threading.Lock()
+
+
+def chat_group_society(group_id):
+    """Society id of a chat group, or None if there is no such group.
+
+    Groups never move between societies, so known groups stay in a bounded
+    LRU map and socket events skip the lookup query. Misses are not cached.
+    """
+    with _chat_group_societies_lock:
+        if group_id in _chat_group_societies:
+            _chat_group_societies.move_to_end(group_id)
+            return _chat_group_societies[group_id]
+    
+    society_id = db.session.scalar(db.select(ChatGroup.society_id).where(ChatGroup.id == group_id))
+    if society_id is None:
+        return None
+    
+    with _chat_group_societies_lock:
+        _chat_group_societies[group_id] = society_id
+        while len(_chat_group_societies) > app.config['CHAT_GROUP_CACHE_SIZE']:
+            _chat_group_societies.popitem(last=False)
+    return society_id
+
+
+class ChatMessageNotSaved(Exception):
+    """A chat message was refused or failed to commit; the text is safe to show its sender."""
+
+
+class ChatMessageWriter(BatchWriter):
+    """Write-behind buffer for socket chat messages.
+
+    Messages from every sender are inserted together in one transaction per
+    batch, each group's last-message pointer moves once per batch, and only
+    after the commit are the senders' futures resolved and the messages
+    broadcast, so an acknowledged message is always durable. Each room gets
+    the batch's messages as a single ``new_messages`` event.
+    """
+
+    thread_name = 'chat-message-writer'
+
+    def submit(self, group_id, sender, text):
+        """Queue a message; the returned future resolves to its payload once committed."""
+        future = Future()
+        row = {
+            'group_id': group_id,
+            'sender_id': sender.id,
+            'sender_name': sender.full_name,
+            'message': text,
+            'created_at': datetime.utcnow()
+        }
+        if not self.enqueue((row, future)):
+            future.set_exception(ChatMessageNotSaved('Chat is busy, please retry'))
+        return future
+
+    def write_batch(self, batch):
+        with app.app_context():
+            try:
+                messages = self._insert([row for row, _ in batch])
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Chat batch of {len(batch)} failed, retrying one by one: {e}")
+                messages = []
+                for row, future in batch:
+                    try:
+                        messages.extend(self._insert([row]))
+                    except Exception as row_error:
+                        db.session.rollback()
+                        print(f"❌ Chat message to group {row['group_id']} from user {row['sender_id']} failed: {row_error}")
+                        messages.append(ChatMessageNotSaved('Message could not be saved, please retry'))
+        
+        by_group = {}
+        for (_, future), message in zip(batch, messages):
+            if isinstance(message, Exception):
+                future.set_exception(message)
+                continue
+            payload = chat_message_payload(message)
+            by_group.setdefault(message.group_id, []).append(payload)
+            future.set_result(payload)
+        
+        # One packet per room per batch instead of one per message
+        for group_id, payloads in by_group.items():
+            socketio.emit('new_messages', {'group_id': group_id, 'messages': payloads}, room=f"chat_{group_id}")
+        return sum(len(payloads) for payloads in by_group.values())
+
+    def _insert(self, rows):
+        # One INSERT ... RETURNING per batch on PostgreSQL. SQLite can't return ids in parameter
+        # order from a multi-row insert, so there each buffered message is its own INSERT; the
+        # batch still shares one transaction and commit, which is what the msgs/sec figures gain.
+        ids = db.session.scalars(
+            db.insert(ChatMessage).returning(ChatMessage.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        messages = [ChatMessage(id=message_id, **row) for message_id, row in zip(ids, rows)]
+        
+        newest = {}
+        for message in messages:
+            newest[message.group_id] = message
+        for message in newest.values():
+            advance_chat_group_pointer(message)
+        db.session.commit()
+        return messages
+
+
+chat_message_writer = ChatMessageWriter(
+    app.config['CHAT_WRITE_FLUSH_MS'] / 1000,
+    app.config['CHAT_WRITE_BATCH_SIZE'],
+    app.config['CHAT_WRITE_QUEUE_SIZE']
+)
+atexit.register(chat_message_writer.stop)
+
+
+def parse_chat_group_id(data):
+    try:
+        return int(data.get('group_id'))
+    except (AttributeError, TypeError, ValueError):
+        return None
 
 
 @socketio.on('join_chat_group')
 def handle_join_group(data):
-    group_id = data.get('group_id')
-    if group_id:
+    group_id = parse_chat_group_id(data)
+    if group_id and current_user.is_authenticated:
+        if chat_group_society(group_id) != current_user.society_id:
+            return
         join_room(f"chat_{group_id}")
         emit('user_joined', {'user': current_user.full_name if current_user.is_authenticated else 'Unknown'}, room=f"chat_{group_id}")
 
 
 @socketio.on('leave_chat_group')
 def handle_leave_group(data):
-    group_id = data.get('group_id')
+    group_id = parse_chat_group_id(data)
     if group_id:
         leave_room(f"chat_{group_id}")
 
 
 @socketio.on('send_message')
 def handle_send_message(data):
+    """Queue a chat message and acknowledge the sender with its id once it is committed.
+
+    If the batch has not committed within ``CHAT_ACK_TIMEOUT`` the message stays
+    queued and the ack says ``pending``; it still arrives through ``new_messages``,
+    so the client must not resend it.
+    """
     if not current_user.is_authenticated:
-        return
+        return {'success': False, 'message': 'Not authenticated'}
+    
+    if not isinstance(data, dict):
+        return {'success': False, 'message': 'group_id and message are required'}
     
-    group_id = data.get('group_id')
-    message_text = data.get('message')
+    group_id = parse_chat_group_id(data)
+    message_text = str(data.get('message') or '').strip()
     
     if not group_id or not message_text:
-        return
+        return {'success': False, 'message': 'group_id and message are required'}
     
-    chat_message = ChatMessage(
-        group_id=group_id,
-        sender_id=current_user.id,
-        sender_name=current_user.full_name,
-        message=message_text,
-        society_name=current_user.society_name
-    )
-    db.session.add(chat_message)
-    db.session.commit()
+    if chat_group_society(group_id) != current_user.society_id:
+        return {'success': False, 'message': 'Unauthorized'}
     
-    emit('new_message', {
-        'id': chat_message.id,
-        'sender_id': current_user.id,
-        'sender_name': current_user.full_name,
-        'message': message_text,
-        'created_at': chat_message.created_at.isoformat() if chat_message.created_at else None
-    }, room=f"chat_{group_id}")
+    future = chat_message_writer.submit(group_id, current_user, message_text)
+    # Hand the connection back to the pool while the writer commits the batch
+    db.session.close()
+    try:
+        payload = future.result(timeout=app.config['CHAT_ACK_TIMEOUT'])
+    except FutureTimeoutError:
+        return {'success': True, 'pending': True, 'message': 'Message is still being saved'}
+    except ChatMessageNotSaved as e:
+        return {'success': False, 'message': str(e)}
+    except Exception as e:
+        print(f"❌ Chat message to group {group_id} from user {current_user.id} failed: {e}")
+        return {'success': False, 'message': 'Message could not be saved, please retry'}
+    
+    return {'success': True, 'id': payload['id'], 'created_at': payload['created_at']}
 
 
 def emit_notification(user_id, notification_data):
     socketio.emit('notification', notification_data, room=f"user_{user_id}")
 
 
-if __name__ == '__main__':
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True, allow_unsafe_werkzeug=True)
-
 @app.route('/demo_resident')
 def demo_resident():
     return render_template('demo_resident.html')
@@ -3726,11 +6369,14 @@ def create_visitor():
         purpose=data.get('purpose'),
         flat_number=data.get('flat_number', current_user.flat_number),
         society_name=current_user.society_name,
+        society_id=current_user.society_id,
         resident_id=current_user.id if current_user.user_type == 'resident' else None,
         guard_id=current_user.id if current_user.user_type == 'guard' else None,
         is_pre_approved=data.get('is_pre_approved', False)
     )
     db.session.add(visitor)
+    db.session.flush()
+    count_visitor_entry(visitor.society_id, visitor.entry_time)
     db.session.commit()
     return jsonify({'success': True, 'visitor_id': visitor.id})
 
@@ -3768,7 +6414,7 @@ def upvote_request(req_id):
     socketio.emit('upvote_update', {
         'request_id': req_id,
         'upvotes': req.upvotes
-    }, room=f"society_{current_user.society_name}")
+    }, room=f"society_{current_user.society_id}")
     
     return jsonify({'success': True, 'upvotes': req.upvotes})
 
@@ -3796,6 +6442,7 @@ def approve_user(user_id):
     user = User.query.get(user_id)
     if not user: return jsonify({'success': False}), 404
     user.is_approved = True
+    mark_society_stats_stale(user.society_id)
     db.session.commit()
     return jsonify({'success': True})
 
@@ -3805,14 +6452,17 @@ def guard_checkin_visitor(visitor_id):
     if current_user.user_type != 'guard':
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     visitor = VisitorLog.query.get(visitor_id)
-    if not visitor or visitor.society_name != current_user.society_name:
+    if not visitor or visitor.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Visitor not found'}), 404
     visitor.guard_check_in_time = datetime.utcnow()
+    if not visitor.entry_time:
+        visitor.entry_time = visitor.guard_check_in_time
+        count_visitor_entry(visitor.society_id, visitor.entry_time)
     visitor.guard_id = current_user.id
     visitor.guard_name = current_user.full_name
     visitor.status = 'inside'
     db.session.commit()
-    socketio.emit('visitor_update', {'visitor_id': visitor_id, 'status': 'inside'}, room=f"society_{current_user.society_name}")
+    socketio.emit('visitor_update', {'visitor_id': visitor_id, 'status': 'inside'}, room=f"society_{current_user.society_id}")
     return jsonify({'success': True, 'message': 'Visitor checked in'})
 
 @app.route('/api/guard/visitor-checkout/<int:visitor_id>', methods=['POST'])
@@ -3821,13 +6471,13 @@ def guard_checkout_visitor(visitor_id):
     if current_user.user_type != 'guard':
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     visitor = VisitorLog.query.get(visitor_id)
-    if not visitor or visitor.society_name != current_user.society_name:
+    if not visitor or visitor.society_id != current_user.society_id:
         return jsonify({'success': False, 'message': 'Visitor not found'}), 404
     visitor.guard_check_out_time = datetime.utcnow()
     visitor.exit_time = datetime.utcnow()
     visitor.status = 'exited'
     db.session.commit()
-    socketio.emit('visitor_update', {'visitor_id': visitor_id, 'status': 'exited'}, room=f"society_{current_user.society_name}")
+    socketio.emit('visitor_update', {'visitor_id': visitor_id, 'status': 'exited'}, room=f"society_{current_user.society_id}")
     return jsonify({'success': True, 'message': 'Visitor checked out'})
 
 @app.route('/api/business/booking/<int:booking_id>/status', methods=['POST'])
@@ -3847,6 +6497,7 @@ def update_booking_status(booking_id):
         booking = BusinessBooking.query.filter_by(maintenance_request_id=booking_id, provider_id=current_user.id).first()
         if booking:
             booking.status = 'Completed'
+    mark_society_stats_stale(request_obj.society_id)
     db.session.commit()
     log_activity('Booking Updated', f"Status changed from {old_status} to {new_status}", current_user)
     return jsonify({'success': True, 'message': f'Status updated to {new_status}'})
@@ -3905,7 +6556,7 @@ def get_request_comments(req_id):
 @login_required
 def get_public_requests():
     requests = MaintenanceRequest.query.filter_by(
-        society_name=current_user.society_name,
+        society_id=current_user.society_id,
         is_public=True
     ).order_by(MaintenanceRequest.upvotes.desc()).all()
     
@@ -3923,3 +6574,8 @@ def get_public_requests():
             'created_at': r.created_at.isoformat() if r.created_at else None
         } for r in requests]
     })
+
+
+if __name__ == '__main__':
+    # Development server; see wsgi.py for production
+    socketio.run(app, host='0.0.0.0', port=5000, debug=True, allow_unsafe_werkzeug=True)
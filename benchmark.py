@@ -0,0 +1,683 @@
+"""
+Benchmark Script - Measures query counts and response times of hot endpoints
+against a throwaway SQLite database (never the configured Supabase database).
+Run with: python benchmark.py [benchmark ...]
+"""
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+# Force a scratch SQLite database before app.py reads its configuration.
+for var in ("user", "password", "host", "port", "dbname"):
+    os.environ[var] = ""
+BENCH_DIR = tempfile.mkdtemp(prefix="urvoic-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}"
+os.environ.setdefault("QR_PASS_SECRET", "bench-visitor-pass-secret")
+
+from sqlalchemy import event
+
+from app import (
+    app, db, socketio, User, Society, MaintenanceRequest, Notification, FamilyMember, Vehicle, ChatMessage, VisitorLog, Announcement,
+    bill_maintenance, brotli, chat_message_writer, compress_body, resident_directory_cache, resolve_society_id,
+    user_principal_cache, load_user_principal, password_hasher, qr_renderer, render_qr, visitor_qr_payload
+)
+
+SOCIETY = "Bench Society"
+client_addresses = itertools.count(1)
+PASSWORD = "bench123"
+
+
+@contextmanager
+def count_queries():
+    counter = {'count': 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter['count'] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def reset_database():
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    # Ids restart from 1, so cached principals from the previous run would be wrong
+    user_principal_cache.clear()
+
+
+def society_id_for(society_name):
+    """Id of the named society, registering it first if this run has not yet."""
+    society_id = resolve_society_id(society_name)
+    if society_id is None:
+        society = Society(name=society_name, address='', city_state_pincode='')
+        db.session.add(society)
+        db.session.flush()
+        society_id = society.id
+    return society_id
+
+
+def create_user(email, user_type='resident', role='resident', **fields):
+    society_name = fields.pop('society_name', SOCIETY)
+    user = User(
+        email=email,
+        full_name=fields.pop('full_name', email.split('@')[0]),
+        phone=fields.pop('phone', '9000000000'),
+        user_type=user_type,
+        role=role,
+        is_approved=True,
+        society_name=society_name,
+        society_id=society_id_for(society_name),
+        **fields
+    )
+    user.set_password(PASSWORD)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def logged_in_client(email):
+    client = app.test_client()
+    # A distinct address per login keeps setup clear of the per-client sign-in rate limit
+    n = next(client_addresses)
+    address = {'REMOTE_ADDR': f"10.1.{n // 256 % 256}.{n % 256}"}
+    response = client.post('/api/login', json={'email': email, 'password': PASSWORD}, environ_base=address)
+    assert response.status_code == 200, response.get_json()
+    return client
+
+
+def warm_user_principal(client):
+    """Load the client's user into ``user_principal_cache`` so timed requests never count the loader query."""
+    with client.session_transaction() as client_session:
+        user_id = client_session.get('_user_id')
+    if user_id:
+        with app.app_context():
+            user_principal_cache.get_or_compute(int(user_id), load_user_principal)
+
+
+def timed_request(client, method, url, warm_user=True, **kwargs):
+    if warm_user:
+        warm_user_principal(client)
+    with app.app_context(), count_queries() as queries:
+        start = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    assert response.status_code in (200, 304), response.get_data(as_text=True)
+    return response.get_json(silent=True), queries['count'], elapsed_ms
+
+
+def timed_get(client, url, warm_user=True, **kwargs):
+    return timed_request(client, 'GET', url, warm_user, **kwargs)
+
+
+def bench_maintenance_requests():
+    """GET /api/maintenance-requests: queries per page must not grow with the table."""
+    print("GET /api/maintenance-requests (admin, limit=50)")
+    print(f"{'rows':>8} {'queries/page':>13} {'first page ms':>14} {'pages':>6} {'total queries':>14}")
+    for total in (10, 100, 1000, 5000):
+        with app.app_context():
+            reset_database()
+            admin = create_user('admin@bench.test', role='admin', flat_number='A-1')
+            businesses = [
+                create_user(f'biz{i}@bench.test', user_type='business', role='business',
+                            business_name=f'Bench Business {i}')
+                for i in range(5)
+            ]
+            base = datetime.utcnow()
+            db.session.bulk_save_objects([
+                MaintenanceRequest(
+                    title=f'Request {i}',
+                    description='Benchmark request',
+                    request_type='public' if i % 2 else 'private',
+                    society_name=SOCIETY,
+                    society_id=admin.society_id,
+                    flat_number='A-1',
+                    created_by_id=admin.id,
+                    assigned_business_id=businesses[i % 5].id if i % 3 else None,
+                    created_at=base - timedelta(minutes=i // 2)
+                ) for i in range(total)
+            ])
+            db.session.commit()
+            admin_email = admin.email
+
+        client = logged_in_client(admin_email)
+        data, first_queries, first_ms = timed_get(client, '/api/maintenance-requests?limit=50')
+        pages, total_queries = 1, first_queries
+        while data['next_cursor']:
+            data, queries, _ = timed_get(
+                client, f"/api/maintenance-requests?limit=50&after={data['next_cursor']}")
+            pages += 1
+            total_queries += queries
+        print(f"{total:>8} {first_queries:>13} {first_ms:>14.1f} {pages:>6} {total_queries:>14}")
+
+
+def bench_announcement_fanout():
+    """POST /api/announcements: notifying every resident is one bulk insert, not one commit each."""
+    print("POST /api/announcements (notifies every approved resident)")
+    print(f"{'residents':>10} {'queries':>8} {'ms':>8} {'notifications':>14}")
+    for total in (10, 100, 2000):
+        with app.app_context():
+            reset_database()
+            admin = create_user('admin@bench.test', role='admin', flat_number='A-1')
+            society_id = admin.society_id
+            db.session.bulk_save_objects([
+                User(email=f'resident{i}@bench.test', full_name=f'Resident {i}', phone='9000000000',
+                     user_type='resident', role='resident', is_approved=True, password_hash='-',
+                     society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+                for i in range(total)
+            ])
+            db.session.commit()
+            admin_email = admin.email
+
+        client = logged_in_client(admin_email)
+        _, queries, elapsed_ms = timed_request(client, 'POST', '/api/announcements',
+                                               json={'title': 'Water shutdown', 'content': 'Tomorrow 10am-2pm'})
+        with app.app_context():
+            notifications = Notification.query.count()
+        print(f"{total:>10} {queries:>8} {elapsed_ms:>8.1f} {notifications:>14}")
+
+
+def bench_set_maintenance():
+    """POST /api/admin/set-maintenance: billing is one INSERT ... SELECT and re-runs bill nobody twice."""
+    print("POST /api/admin/set-maintenance (run twice for the same month)")
+    print(f"{'residents':>10} {'run':>4} {'queries':>8} {'ms':>8} {'created':>8} {'skipped':>8}")
+    for total in (10, 1000, 5000):
+        with app.app_context():
+            reset_database()
+            admin = create_user('admin@bench.test', role='admin', flat_number='A-1')
+            society_id = admin.society_id
+            db.session.bulk_save_objects([
+                User(email=f'resident{i}@bench.test', full_name=f'Resident {i}', phone='9000000000',
+                     user_type='resident', role='resident', is_approved=True, password_hash='-',
+                     society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+                for i in range(total)
+            ])
+            db.session.commit()
+            admin_email = admin.email
+
+        client = logged_in_client(admin_email)
+        for run in (1, 2):
+            data, queries, elapsed_ms = timed_request(client, 'POST', '/api/admin/set-maintenance',
+                                                      json={'amount': 1500, 'month': 'January 2026'})
+            print(f"{total:>10} {run:>4} {queries:>8} {elapsed_ms:>8.1f} "
+                  f"{data['bills_created']:>8} {data['already_billed']:>8}")
+
+
+def bench_payments_overview():
+    """GET /api/admin/payments/overview: cost must not grow with months of billing history."""
+    print("GET /api/admin/payments/overview (500 flats, latest month)")
+    print(f"{'months':>7} {'bills':>7} {'queries':>8} {'ms':>8}")
+    for months in (1, 12, 60):
+        with app.app_context():
+            reset_database()
+            admin = create_user('admin@bench.test', role='admin', flat_number='A-1')
+            society_id = admin.society_id
+            db.session.bulk_save_objects([
+                User(email=f'resident{i}@bench.test', full_name=f'Resident {i}', phone='9000000000',
+                     user_type='resident', role='resident', is_approved=True, password_hash='-',
+                     society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+                for i in range(499)
+            ])
+            db.session.commit()
+            for m in range(months):
+                bill_maintenance(society_id, SOCIETY, 1500, f'Month {m}')
+            admin_email = admin.email
+
+        client = logged_in_client(admin_email)
+        _, queries, elapsed_ms = timed_get(client, f'/api/admin/payments/overview?month=Month%20{months - 1}')
+        print(f"{months:>7} {months * 500:>7} {queries:>8} {elapsed_ms:>8.1f}")
+
+
+def bench_payments():
+    """GET /api/payments: payer flats come from a join, so a page costs the same queries at any size."""
+    print("GET /api/payments (admin, limit=50, 12 months billed)")
+    print(f"{'flats':>7} {'bills':>7} {'queries/page':>13} {'first page ms':>14} {'month filter ms':>16}")
+    page_queries = set()
+    for flats in (10, 100, 500):
+        with app.app_context():
+            reset_database()
+            admin = create_user('admin@bench.test', role='admin', flat_number='A-1')
+            society_id = admin.society_id
+            db.session.bulk_save_objects([
+                User(email=f'resident{i}@bench.test', full_name=f'Resident {i}', phone='9000000000',
+                     user_type='resident', role='resident', is_approved=True, password_hash='-',
+                     society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+                for i in range(flats - 1)
+            ])
+            db.session.commit()
+            for m in range(12):
+                bill_maintenance(society_id, SOCIETY, 1500, f'Month {m}')
+            admin_email = admin.email
+
+        client = logged_in_client(admin_email)
+        data, queries, elapsed_ms = timed_get(client, '/api/payments?limit=50')
+        assert all(p['flat_number'] != 'N/A' for p in data['payments'])
+        _, month_queries, month_ms = timed_get(client, '/api/payments?limit=50&month=Month%203')
+        page_queries.update((queries, month_queries))
+        print(f"{flats:>7} {flats * 12:>7} {queries:>13} {elapsed_ms:>14.1f} {month_ms:>16.1f}")
+    assert len(page_queries) == 1, f"queries per page vary with table size: {sorted(page_queries)}"
+
+
+def bench_guard_residents():
+    """GET /api/guard/residents: one query per table when cold, none when cached, 304 when unchanged."""
+    print("GET /api/guard/residents (2 family members and 1 vehicle per flat)")
+    print(f"{'flats':>7} {'cold queries':>13} {'cold ms':>8} {'warm queries':>13} {'warm ms':>8} {'304 ms':>7}")
+    for flats in (10, 100, 500):
+        with app.app_context():
+            reset_database()
+            guard = create_user('guard@bench.test', user_type='guard', role='guard')
+            society_id = guard.society_id
+            db.session.bulk_save_objects([
+                User(id=1000 + i, email=f'resident{i}@bench.test', full_name=f'Resident {i}', phone='9000000000',
+                     user_type='resident', role='resident', is_approved=True, password_hash='-',
+                     society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+                for i in range(flats)
+            ])
+            db.session.bulk_save_objects([
+                FamilyMember(resident_id=1000 + i, name=f'Family {i}-{n}', relationship='child',
+                             society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+                for i in range(flats) for n in range(2)
+            ] + [
+                Vehicle(resident_id=1000 + i, vehicle_type='car', vehicle_number=f'KA01-{i}',
+                        society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+                for i in range(flats)
+            ])
+            db.session.commit()
+            guard_email = guard.email
+
+        client = logged_in_client(guard_email)
+        resident_directory_cache.invalidate(society_id)
+        _, cold_queries, cold_ms = timed_get(client, '/api/guard/residents')
+        response = client.get('/api/guard/residents')
+        etag = response.headers['ETag']
+        _, warm_queries, warm_ms = timed_get(client, '/api/guard/residents')
+        _, _, not_modified_ms = timed_get(client, '/api/guard/residents', headers={'If-None-Match': etag})
+        print(f"{flats:>7} {cold_queries:>13} {cold_ms:>8.1f} {warm_queries:>13} {warm_ms:>8.1f} {not_modified_ms:>7.1f}")
+
+
+def bench_socket_chat():
+    """Socket send_message: concurrent senders in one group share batched commits."""
+    print("Socket.IO send_message (one society group, every message acknowledged)")
+    print(f"{'senders':>8} {'messages':>9} {'seconds':>8} {'msgs/sec':>9} {'avg batch':>10} {'stored':>7}")
+    per_sender = 200
+    for senders in (1, 10, 50):
+        with app.app_context():
+            reset_database()
+            emails = [create_user(f'resident{i}@bench.test', flat_number=f'B-{i}').email for i in range(senders)]
+        
+        clients = [logged_in_client(email) for email in emails]
+        group_id = clients[0].get('/api/chat-groups/society').get_json()['groups'][0]['id']
+        sockets = [socketio.test_client(app, flask_test_client=client) for client in clients]
+        for sock in sockets:
+            sock.emit('join_chat_group', {'group_id': group_id})
+        batches_before = chat_message_writer.metrics()['batches']
+        failures = []
+        
+        def send_all(sock):
+            for n in range(per_sender):
+                ack = sock.emit('send_message', {'group_id': group_id, 'message': f'message {n}'}, callback=True)
+                # A pending ack is not yet durable, so it does not count as acknowledged here
+                if not ack or not ack.get('success') or ack.get('pending'):
+                    failures.append(ack)
+        
+        threads = [threading.Thread(target=send_all, args=(sock,)) for sock in sockets]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        
+        for sock in sockets:
+            sock.disconnect()
+        assert not failures, failures[:3]
+        total = senders * per_sender
+        batches = chat_message_writer.metrics()['batches'] - batches_before
+        with app.app_context():
+            stored = ChatMessage.query.count()
+        print(f"{senders:>8} {total:>9} {elapsed:>8.2f} {total / elapsed:>9.0f} {total / batches:>10.1f} {stored:>7}")
+
+
+def bench_compression():
+    """Response compression: bytes on the wire per endpoint and the CPU spent compressing."""
+    flats = 500
+    with app.app_context():
+        reset_database()
+        admin = create_user('admin@bench.test', role='admin', flat_number='A-1')
+        guard = create_user('guard@bench.test', user_type='guard', role='guard')
+        society_id = admin.society_id
+        db.session.bulk_save_objects([
+            User(id=1000 + i, email=f'resident{i}@bench.test', full_name=f'Resident {i}', phone='9000000000',
+                 user_type='resident', role='resident', is_approved=True, password_hash='-',
+                 society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+            for i in range(flats)
+        ])
+        db.session.bulk_save_objects([
+            FamilyMember(resident_id=1000 + i, name=f'Family {i}', relationship='spouse',
+                         society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+            for i in range(flats)
+        ] + [
+            Vehicle(resident_id=1000 + i, vehicle_type='car', vehicle_number=f'KA01-{i}',
+                    society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+            for i in range(flats)
+        ] + [
+            VisitorLog(visitor_name=f'Visitor {i}', visitor_phone='9800000000', purpose='Delivery',
+                       flat_number=f'B-{i % flats}', society_name=SOCIETY, society_id=society_id,
+                       guard_id=guard.id, guard_name=guard.full_name, resident_id=1000 + i % flats,
+                       status='exited', permission_status='approved')
+            for i in range(2000)
+        ] + [
+            MaintenanceRequest(title=f'Request {i}', description='Leaking tap in the kitchen',
+                               request_type='public' if i % 2 else 'private', society_name=SOCIETY,
+                               society_id=society_id, flat_number=f'B-{i}', created_by_id=admin.id)
+            for i in range(200)
+        ])
+        db.session.commit()
+        bill_maintenance(society_id, SOCIETY, 1500, 'January 2026')
+        admin_email, guard_email = admin.email, guard.email
+
+    endpoints = [
+        (guard_email, '/api/visitor-log'),
+        (guard_email, '/api/guard/residents'),
+        (admin_email, '/api/payments?limit=200'),
+        (admin_email, '/api/maintenance-requests?limit=200'),
+    ]
+    encodings = ['gzip'] + (['br'] if brotli else [])
+    print(f"Response compression ({flats} flats; gzip level {app.config['COMPRESS_GZIP_LEVEL']}, "
+          f"brotli quality {app.config['COMPRESS_BROTLI_QUALITY']})")
+    header = f"{'endpoint':<36} {'identity':>9}"
+    for encoding in encodings:
+        header += f" {encoding:>8} {'saved':>6} {'ms':>6}"
+    print(header)
+    for email, url in endpoints:
+        client = logged_in_client(email)
+        identity = client.get(url, headers={'Accept-Encoding': 'identity'})
+        assert identity.status_code == 200 and 'Content-Encoding' not in identity.headers
+        body = identity.get_data()
+        row = f"{url:<36} {len(body):>9}"
+        for encoding in encodings:
+            response = client.get(url, headers={'Accept-Encoding': encoding})
+            assert response.headers.get('Content-Encoding') == encoding, url
+            with app.app_context():
+                start = time.perf_counter()
+                compress_body(body, encoding)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            size = len(response.get_data())
+            row += f" {size:>8} {1 - size / len(body):>6.0%} {elapsed_ms:>6.2f}"
+        print(row)
+
+
+def bench_conditional_get():
+    """Read-mostly endpoints: a repeat load with If-None-Match skips the view's queries."""
+    print("Conditional GET (500 residents, 200 announcements; admin)")
+    print(f"{'endpoint':<28} {'200 queries':>12} {'200 ms':>8} {'304 queries':>12} {'304 ms':>8}")
+    with app.app_context():
+        reset_database()
+        admin = create_user('admin@bench.test', role='admin', flat_number='A-1')
+        society_id = admin.society_id
+        db.session.bulk_save_objects([
+            User(email=f'resident{i}@bench.test', full_name=f'Resident {i}', phone='9000000000',
+                 user_type='resident', role='resident', is_approved=True, password_hash='-',
+                 society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+            for i in range(500)
+        ] + [
+            Announcement(title=f'Notice {i}', content='The lifts will be serviced on Sunday',
+                         society_name=SOCIETY, society_id=society_id, created_by_id=admin.id)
+            for i in range(200)
+        ])
+        db.session.commit()
+        admin_email = admin.email
+
+    client = logged_in_client(admin_email)
+    for url in ('/api/announcements', '/api/residents', '/api/admin/residents/all',
+                '/api/businesses', '/api/current-user'):
+        client.get(url)
+        _, full_queries, full_ms = timed_get(client, url)
+        etag = client.get(url).headers['ETag']
+        _, cached_queries, cached_ms = timed_get(client, url, headers={'If-None-Match': etag})
+        print(f"{url:<28} {full_queries:>12} {full_ms:>8.2f} {cached_queries:>12} {cached_ms:>8.2f}")
+
+
+def bench_user_loader():
+    """Flask-Login user loader: cached principals take the user query off every request."""
+    requests_per_run = 200
+    with app.app_context():
+        reset_database()
+        resident_email = create_user('resident@bench.test', flat_number='B-1').email
+    client = logged_in_client(resident_email)
+    
+    print(f"Flask-Login user loader ({requests_per_run} x GET /api/notifications)")
+    print(f"{'loader':<8} {'queries/request':>16} {'ms/request':>11}")
+    for label, cold in (('cold', True), ('cached', False)):
+        total_queries, total_ms = 0, 0.0
+        for _ in range(requests_per_run):
+            if cold:
+                user_principal_cache.clear()
+            _, queries, elapsed_ms = timed_get(client, '/api/notifications', warm_user=False)
+            total_queries += queries
+            total_ms += elapsed_ms
+        print(f"{label:<8} {total_queries / requests_per_run:>16.2f} {total_ms / requests_per_run:>11.2f}")
+    metrics = user_principal_cache.metrics()
+    print(f"hit ratio {metrics['hit_ratio']}, {metrics['avg_compute_ms']} ms of user loading saved per hit")
+
+
+def bench_login_storm():
+    """Login storm: logins/sec and latency of an unrelated endpoint while 16 clients log in."""
+    storm_threads, storm_seconds, accounts = 16, 5, 200
+    with app.app_context():
+        reset_database()
+        observer_email = create_user('observer@bench.test', flat_number='A-1').email
+        society_id = resolve_society_id(SOCIETY)
+        password_hash = password_hasher.hash(PASSWORD)
+        db.session.bulk_save_objects([
+            User(email=f'resident{i}@bench.test', full_name=f'Resident {i}', phone='9000000000',
+                 user_type='resident', role='resident', is_approved=True, password_hash=password_hash,
+                 society_name=SOCIETY, society_id=society_id, flat_number=f'B-{i}')
+            for i in range(accounts)
+        ])
+        db.session.commit()
+    observer = logged_in_client(observer_email)
+    
+    def observe(stop, latencies):
+        while not stop.is_set():
+            start = time.perf_counter()
+            observer.get('/api/notifications')
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+    
+    def storm(stop, statuses, n):
+        client = app.test_client()
+        # Each storm client is its own IP, so the per-client admission limit sees 16 clients
+        client_ip = {'REMOTE_ADDR': f'10.0.0.{n + 1}'}
+        while not stop.is_set():
+            response = client.post('/api/login', json={'email': f'resident{n % accounts}@bench.test', 'password': PASSWORD},
+                                   environ_base=client_ip)
+            statuses.append(response.status_code)
+            n += storm_threads
+    
+    print(f"Login storm ({storm_threads} clients for {storm_seconds}s) vs GET /api/notifications")
+    print(f"{'hashing':<26} {'logins/s':>9} {'rejected':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    configured = (password_hasher.workers, password_hasher.rate)
+    modes = [
+        ('no storm', None),
+        ('inline, unlimited', (0, 0)),
+        (f'{configured[0]} workers, {configured[1]:g}/s', configured),
+    ]
+    for label, settings in modes:
+        stop, latencies, statuses = threading.Event(), [], []
+        threads = [threading.Thread(target=observe, args=(stop, latencies))]
+        if settings:
+            password_hasher.workers, password_hasher.rate = settings
+            threads += [threading.Thread(target=storm, args=(stop, statuses, n)) for n in range(storm_threads)]
+        for thread in threads:
+            thread.start()
+        time.sleep(storm_seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{label:<26} {statuses.count(200) / storm_seconds:>9.1f} {statuses.count(429):>9} {p50:>8.1f} {p99:>8.1f}")
+    password_hasher.workers, password_hasher.rate = configured
+
+
+def bench_qr_codes():
+    """Visitor QR codes: cold renders vs cache hits, and PNG vs SVG bytes on the wire."""
+    repeats = 50
+    with app.app_context():
+        reset_database()
+        resident = create_user('resident@bench.test', flat_number='B-1')
+        visitor = VisitorLog(visitor_name='Ramesh Kumar', visitor_phone='9876543210', flat_number='B-1',
+                             society_name=SOCIETY, society_id=resident.society_id, resident_id=resident.id,
+                             purpose='Delivery', status='pre_approved', is_pre_approved=True)
+        db.session.add(visitor)
+        db.session.commit()
+        resident_email, visitor_id = resident.email, visitor.id
+    client = logged_in_client(resident_email)
+    
+    print(f"GET /api/visitor-log/<id>/qr-code ({repeats} requests per row)")
+    print(f"{'format':<8} {'cache':<7} {'ms/request':>11} {'bytes':>7} {'gzip':>7} {'br':>7}")
+    for fmt in ('png', 'svg'):
+        url = f'/api/visitor-log/{visitor_id}/qr-code?format={fmt}'
+        sizes = {
+            encoding: len(client.get(url, headers={'Accept-Encoding': encoding}).data)
+            for encoding in ('identity', 'gzip', 'br')
+        }
+        for label, cold in (('cold', True), ('cached', False)):
+            total_ms = 0.0
+            for _ in range(repeats):
+                if cold:
+                    qr_renderer.clear()
+                total_ms += timed_get(client, url)[2]
+            print(f"{fmt:<8} {label:<7} {total_ms / repeats:>11.2f} {sizes['identity']:>7} {sizes['gzip']:>7} {sizes['br']:>7}")
+    metrics = qr_renderer.metrics()
+    print(f"{metrics['entries']} cached images, {metrics['bytes']} bytes, {metrics['avg_render_ms']} ms per render")
+
+
+def bench_bulk_passes():
+    """Event guest list: one pre-approve + one QR request per guest vs a single bulk ZIP or sheet."""
+    guests = [{'visitor_name': f'Guest {i}', 'visitor_phone': '9000000000', 'flat_number': 'Clubhouse'}
+              for i in range(300)]
+    with app.app_context():
+        reset_database()
+        admin_email = create_user('admin@bench.test', role='admin', flat_number='A-1').email
+    client = logged_in_client(admin_email)
+    
+    print(f"Pre-approving {len(guests)} event guests with QR passes (admin, {qr_renderer.workers} render workers)")
+    print(f"{'method':<30} {'requests':>9} {'queries':>8} {'seconds':>8} {'bytes':>9}")
+    total_queries, total_bytes, start = 0, 0, time.perf_counter()
+    for guest in guests:
+        data, queries, _ = timed_request(client, 'POST', '/api/visitors/pre-approve-admin', json=guest)
+        total_queries += queries
+        with app.app_context(), count_queries() as counted:
+            total_bytes += len(client.get(f"/api/visitor-log/{data['visitor_id']}/qr-code").data)
+        total_queries += counted['count']
+    print(f"{'one at a time (png)':<30} {len(guests) * 2:>9} {total_queries:>8} "
+          f"{time.perf_counter() - start:>8.2f} {total_bytes:>9}")
+    
+    for label, options in (('bulk zip (png)', {}), ('bulk zip (svg)', {'image': 'svg'}),
+                           ('bulk printable sheet', {'format': 'sheet'})):
+        with app.app_context(), count_queries() as counted:
+            start = time.perf_counter()
+            response = client.post('/api/visitors/pre-approve-admin/bulk', json={'guests': guests, **options})
+            size = sum(len(chunk) for chunk in response.response)
+            elapsed = time.perf_counter() - start
+        assert response.status_code == 200, response.get_data(as_text=True)
+        print(f"{label:<30} {1:>9} {counted['count']:>8} {elapsed:>8.2f} {size:>9}")
+
+
+def bench_qr_tokens():
+    """Signed visitor passes: QR density, forged scans rejected without queries, batched offline scans."""
+    scans = 100
+    with app.app_context():
+        reset_database()
+        resident = create_user('resident@bench.test', flat_number='B-1')
+        guard_email = create_user('guard@bench.test', role='guard').email
+        visitors = [VisitorLog(visitor_name=f'Guest {i}', visitor_phone='9876543210', flat_number='B-1',
+                               society_name=SOCIETY, society_id=resident.society_id, resident_id=resident.id,
+                               purpose='Delivery', status='pre_approved', is_pre_approved=True,
+                               created_at=datetime.utcnow() - timedelta(hours=1))
+                    for i in range(scans * 2)]
+        db.session.add_all(visitors)
+        db.session.commit()
+        passes = [visitor_qr_payload(visitor) for visitor in visitors]
+        legacy = json.dumps({
+            'visitor_id': visitors[0].id, 'visitor_name': visitors[0].visitor_name,
+            'visitor_phone': visitors[0].visitor_phone, 'flat_number': visitors[0].flat_number,
+            'society_name': visitors[0].society_name, 'purpose': visitors[0].purpose,
+            'is_pre_approved': True, 'created_at': visitors[0].created_at.isoformat()
+        })
+    
+    print("QR payload density")
+    print(f"{'payload':<14} {'chars':>6} {'modules':>8} {'png bytes':>10} {'svg bytes':>10}")
+    for label, payload in (('unsigned json', legacy), ('signed pass', passes[0])):
+        svg = render_qr(payload, 'svg').decode()
+        modules = svg.split('viewBox="0 0 ', 1)[1].split(' ', 1)[0]
+        print(f"{label:<14} {len(payload):>6} {modules + 'x' + modules:>8} {len(render_qr(payload, 'png')):>10} {len(svg):>10}")
+    
+    guard = logged_in_client(guard_email)
+    guard.get('/api/current-user')
+    forged = passes[0][:-2] + ('AA' if passes[0][-2:] != 'AA' else 'BB')
+    print(f"\nGuard verification ({scans} scans per row)")
+    print(f"{'scan':<30} {'requests':>9} {'queries':>8} {'ms/scan':>8}")
+    with app.app_context(), count_queries() as counted:
+        start = time.perf_counter()
+        response = guard.post('/api/visitor-log/verify-qr', json={'qr_data': forged})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    assert response.status_code == 400, response.get_json()
+    print(f"{'forged pass (rejected)':<30} {1:>9} {counted['count']:>8} {elapsed_ms:>8.2f}")
+    # Unsigned passes are only honoured for visitors created before the configured cutover
+    unsigned_before = app.config['QR_UNSIGNED_BEFORE']
+    app.config['QR_UNSIGNED_BEFORE'] = datetime.utcnow()
+    _, queries, elapsed_ms = timed_request(guard, 'POST', '/api/visitor-log/verify-qr', json={'qr_data': legacy})
+    app.config['QR_UNSIGNED_BEFORE'] = unsigned_before
+    print(f"{'unsigned json (pre-cutover)':<30} {1:>9} {queries:>8} {elapsed_ms:>8.2f}")
+    total_queries, total_ms = 0, 0.0
+    for payload in passes[:scans]:
+        _, queries, elapsed_ms = timed_request(guard, 'POST', '/api/visitor-log/verify-qr', json={'qr_data': payload})
+        total_queries += queries
+        total_ms += elapsed_ms
+    print(f"{'signed passes, one by one':<30} {scans:>9} {total_queries:>8} {total_ms / scans:>8.2f}")
+    queued = [{'qr_data': payload, 'scanned_at': datetime.utcnow().isoformat()} for payload in passes[scans:]]
+    result, queries, elapsed_ms = timed_request(guard, 'POST', '/api/visitor-log/verify-qr/batch', json={'scans': queued})
+    assert result['verified'] == scans, result
+    print(f"{'signed passes, queued batch':<30} {1:>9} {queries:>8} {elapsed_ms / scans:>8.2f}")
+
+
+BENCHMARKS = {
+    'maintenance-requests': bench_maintenance_requests,
+    'announcement-fanout': bench_announcement_fanout,
+    'set-maintenance': bench_set_maintenance,
+    'payments-overview': bench_payments_overview,
+    'payments': bench_payments,
+    'guard-residents': bench_guard_residents,
+    'socket-chat': bench_socket_chat,
+    'compression': bench_compression,
+    'conditional-get': bench_conditional_get,
+    'user-loader': bench_user_loader,
+    'login-storm': bench_login_storm,
+    'qr-codes': bench_qr_codes,
+    'bulk-passes': bench_bulk_passes,
+    'qr-tokens': bench_qr_tokens,
+}
+
+
+if __name__ == '__main__':
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+        sys.exit(1)
+    for name in selected:
+        BENCHMARKS[name]()
+        print()
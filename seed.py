@@ -43,6 +43,9 @@ def seed_database():
         )
         db.session.add(society)
         db.session.commit()
+        
+        admin.society_id = society.id
+        db.session.commit()
         print(f"Created society: {society.name}")
         
         residents = [
@@ -62,6 +65,7 @@ def seed_database():
                 role="resident",
                 is_approved=True,
                 society_name="Green Valley Society",
+                society_id=society.id,
                 flat_number=r["flat"]
             )
             user.set_password("resident123")
@@ -81,6 +85,7 @@ def seed_database():
                 role="resident",
                 is_approved=False,
                 society_name="Green Valley Society",
+                society_id=society.id,
                 flat_number=r["flat"]
             )
             user.set_password("pending123")
@@ -93,7 +98,8 @@ def seed_database():
             user_type="resident",
             role="guard",
             is_approved=True,
-            society_name="Green Valley Society"
+            society_name="Green Valley Society",
+            society_id=society.id
         )
         guard.set_password("guard123")
         db.session.add(guard)
@@ -136,6 +142,7 @@ def seed_database():
                 title=a["title"],
                 content=a["content"],
                 society_name="Green Valley Society",
+                society_id=society.id,
                 created_by_id=admin_user.id,
                 created_at=datetime.utcnow() - timedelta(days=random.randint(1, 10))
             )
@@ -158,6 +165,7 @@ def seed_database():
                 request_type=m["type"],
                 status=m["status"],
                 society_name="Green Valley Society",
+                society_id=society.id,
                 flat_number=m["flat"],
                 created_by_id=resident.id if resident else admin_user.id,
                 created_at=datetime.utcnow() - timedelta(days=random.randint(1, 7))
@@ -182,6 +190,7 @@ def seed_database():
                 user_name=admin_user.full_name,
                 user_type="admin",
                 society_name="Green Valley Society",
+                society_id=society.id,
                 created_at=datetime.utcnow() - timedelta(hours=random.randint(1, 48))
             )
             db.session.add(log)
@@ -192,6 +201,7 @@ def seed_database():
             name="Green Valley Society",
             group_type="society",
             society_name="Green Valley Society",
+            society_id=society.id,
             created_by_id=admin_user.id,
             created_at=datetime.utcnow()
         )
@@ -201,6 +211,7 @@ def seed_database():
             name="Block A Residents",
             group_type="block",
             society_name="Green Valley Society",
+            society_id=society.id,
             created_by_id=admin_user.id,
             created_at=datetime.utcnow()
         )
@@ -0,0 +1,112 @@
+"""
+Socket Load Script - Opens authenticated dashboard sockets against a running server
+in steps and reports how many one worker holds, how fast they connect and how
+responsive HTTP stays while they are open.
+Run with: python socket_load.py --email admin@example.com --password secret [--url http://localhost:5000]
+Needs websocket-client (pip install websocket-client). Sign in as an admin to also
+read the server's own connection counts from /api/metrics.
+"""
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import sys
+import time
+
+import requests
+import socketio
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def login(url, email, password):
+    session = requests.Session()
+    response = session.post(f"{url}/api/login", json={'email': email, 'password': password})
+    if response.status_code != 200 or not response.json().get('success'):
+        print(f"❌ Login failed for {email}: {response.text[:200]}")
+        sys.exit(1)
+    return session
+
+
+def open_socket(url, cookie, transports, dropped):
+    client = socketio.Client(reconnection=False)
+    client.on('disconnect', lambda *args: dropped.append(client))
+    start = time.perf_counter()
+    client.connect(url, headers={'Cookie': cookie}, transports=transports, wait_timeout=10)
+    return client, (time.perf_counter() - start) * 1000
+
+
+def http_latency_ms(session, url, samples=5):
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        session.get(f"{url}/api/current-user")
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentile(timings, 0.5)
+
+
+def server_connections(session, url):
+    response = session.get(f"{url}/api/metrics")
+    if response.status_code != 200:
+        return None
+    return response.json()['metrics']['socketio']['connected']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--sockets', type=int, default=2000, help='total sockets to open')
+    parser.add_argument('--step', type=int, default=250, help='sockets opened per step')
+    parser.add_argument('--concurrency', type=int, default=50, help='handshakes in flight at once')
+    parser.add_argument('--hold', type=int, default=60, help='seconds to hold every socket open at the end')
+    parser.add_argument('--transport', default='websocket', choices=['websocket', 'polling'])
+    args = parser.parse_args()
+
+    session = login(args.url, args.email, args.password)
+    cookie = '; '.join(f"{name}={value}" for name, value in session.cookies.items())
+    transports = [args.transport]
+    pool = eventlet.GreenPool(args.concurrency)
+    clients, dropped, failures = [], [], []
+
+    def connect_one(_):
+        try:
+            return open_socket(args.url, cookie, transports, dropped)
+        except Exception as e:
+            failures.append(e)
+            return None
+
+    print(f"Dashboard sockets against {args.url} ({args.transport})")
+    print(f"{'open':>7} {'failed':>7} {'dropped':>8} {'p50 ms':>8} {'p95 ms':>8} {'http ms':>8} {'server':>7}")
+    while len(clients) < args.sockets:
+        step = min(args.step, args.sockets - len(clients))
+        timings = []
+        for result in pool.imap(connect_one, range(step)):
+            if result:
+                clients.append(result[0])
+                timings.append(result[1])
+        server = server_connections(session, args.url)
+        print(f"{len(clients) - len(dropped):>7} {len(failures):>7} {len(dropped):>8} "
+              f"{percentile(timings, 0.5):>8.1f} {percentile(timings, 0.95):>8.1f} "
+              f"{http_latency_ms(session, args.url):>8.1f} {server if server is not None else '-':>7}")
+        if failures and len(failures) >= step:
+            print(f"❌ Every handshake in the last step failed ({failures[-1]}); stopping")
+            break
+
+    print(f"Holding {len(clients) - len(dropped)} sockets for {args.hold}s (pings keep them alive)")
+    eventlet.sleep(args.hold)
+    print(f"✅ {len(clients) - len(dropped)} sockets still open, {len(dropped)} dropped, "
+          f"http p50 {http_latency_ms(session, args.url):.1f} ms")
+
+    for client in clients:
+        client.disconnect()
+
+
+if __name__ == '__main__':
+    main()
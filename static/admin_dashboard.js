@@ -1379,12 +1379,24 @@ function showMyProfilePage() {
     loadMyProfileData();
 }
 
-function loadMaintenanceRequests() {
-    fetch('/api/maintenance-requests')
+let maintenanceRequestsLoaded = [];
+let maintenanceNextCursor = null;
+
+function loadMaintenanceRequests(append = false) {
+    const params = new URLSearchParams({ limit: 50 });
+    if (append && maintenanceNextCursor) params.set('after', maintenanceNextCursor);
+    
+    fetch(`/api/maintenance-requests?${params}`)
         .then(res => res.json())
         .then(data => {
             if (data.success) {
-                displayMaintenanceRequests(data.requests || []);
+                const page = data.requests || [];
+                maintenanceRequestsLoaded = append ? maintenanceRequestsLoaded.concat(page) : page;
+                maintenanceNextCursor = data.next_cursor || null;
+                displayMaintenanceRequests(maintenanceRequestsLoaded);
+                
+                const loadMoreBtn = document.getElementById('maintenance-load-more');
+                if (loadMoreBtn) loadMoreBtn.style.display = maintenanceNextCursor ? 'inline-block' : 'none';
             }
         })
         .catch(err => console.log('Error loading maintenance requests'));
@@ -1670,17 +1682,39 @@ function denyVisitor(id) {
     .catch(err => showToast('Error denying visitor', 'error'));
 }
 
-function loadPayments() {
-    fetch('/api/payments')
+let paymentsLoaded = [];
+let paymentsNextCursor = null;
+
+function loadPayments(append = false) {
+    const params = new URLSearchParams({ limit: 50 });
+    if (append && paymentsNextCursor) params.set('after', paymentsNextCursor);
+    
+    fetch(`/api/admin/payments/overview?${params}`)
         .then(res => res.json())
         .then(data => {
             if (data.success) {
-                displayPayments(data.payments || []);
+                const page = data.payments || [];
+                paymentsLoaded = append ? paymentsLoaded.concat(page) : page;
+                paymentsNextCursor = data.next_cursor || null;
+                displayPaymentTotals(data);
+                displayPayments(paymentsLoaded);
+                
+                const loadMoreBtn = document.getElementById('payments-load-more');
+                if (loadMoreBtn) loadMoreBtn.style.display = paymentsNextCursor ? 'inline-block' : 'none';
             }
         })
         .catch(err => console.log('Error loading payments'));
 }
 
+function displayPaymentTotals(data) {
+    const collectedEl = document.getElementById('payments-collected-total');
+    const pendingEl = document.getElementById('payments-pending-total');
+    const titleEl = document.getElementById('payment-overview-title');
+    if (collectedEl) collectedEl.textContent = `₹${(data.collected || 0).toLocaleString('en-IN')}`;
+    if (pendingEl) pendingEl.textContent = `₹${(data.pending || 0).toLocaleString('en-IN')}`;
+    if (titleEl) titleEl.textContent = `Payment Overview for ${data.month}`;
+}
+
 function displayPayments(payments) {
     const container = document.getElementById('payment-summary-list-container');
     if (!container) return;
@@ -1693,22 +1727,6 @@ function displayPayments(payments) {
         return;
     }
     
-    let collectedTotal = 0;
-    let pendingTotal = 0;
-    
-    payments.forEach(p => {
-        if (p.status === 'paid') {
-            collectedTotal += parseFloat(p.amount);
-        } else {
-            pendingTotal += parseFloat(p.amount);
-        }
-    });
-    
-    const collectedEl = document.getElementById('payments-collected-total');
-    const pendingEl = document.getElementById('payments-pending-total');
-    if (collectedEl) collectedEl.textContent = `₹${collectedTotal.toLocaleString('en-IN')}`;
-    if (pendingEl) pendingEl.textContent = `₹${pendingTotal.toLocaleString('en-IN')}`;
-    
     memberList.innerHTML = payments.map(p => {
         const statusClass = p.status === 'paid' ? 'paid' : 'pending';
         const bgColor = p.status === 'paid' ? '#e5f6e8' : '#fdecec';
@@ -1722,6 +1740,7 @@ function displayPayments(payments) {
                  data-resident="${p.payer_name}" 
                  data-amount="₹${p.amount}" 
                  data-status="${p.status}" 
+                 data-month="${p.due_date || '--'}"
                  data-date="${dateStr}"
                  onclick="showPaymentDetail(this)">
                 <div class="profile-pic-placeholder-sm" style="background-color: ${bgColor};">${initial}</div>
@@ -1750,6 +1769,7 @@ function showPaymentDetail(element) {
     document.getElementById('detail-amount').textContent = amount;
     document.getElementById('detail-status').textContent = status === 'paid' ? 'Paid' : 'Pending';
     document.getElementById('detail-date').textContent = date;
+    document.getElementById('detail-month').textContent = element.dataset.month;
     
     const detailView = document.getElementById('payment-detail-view');
     detailView.style.display = 'block';
@@ -473,18 +473,30 @@ function showReplyForm(reviewId) {
     }
 }
 
-function loadBusinessEarnings() {
-    fetch('/api/payments')
+let earningsPayments = [];
+let earningsNextCursor = null;
+let earningsTotal = 0;
+
+function loadBusinessEarnings(append = false) {
+    // The list is paged, so the total comes from the server rather than summing what is loaded
+    const params = new URLSearchParams({ limit: 50, totals: 1 });
+    if (append && earningsNextCursor) params.set('after', earningsNextCursor);
+    
+    fetch(`/api/payments?${params}`)
         .then(res => res.json())
         .then(data => {
             if (data.success) {
-                displayBusinessEarnings(data.payments || []);
+                const page = data.payments || [];
+                earningsPayments = append ? earningsPayments.concat(page) : page;
+                earningsNextCursor = data.next_cursor || null;
+                if (data.totals) earningsTotal = data.totals.amount;
+                displayBusinessEarnings(earningsPayments, earningsTotal);
             }
         })
         .catch(err => console.log('Error loading earnings'));
 }
 
-function displayBusinessEarnings(payments) {
+function displayBusinessEarnings(payments, totalEarnings) {
     const container = document.getElementById('earnings-list');
     if (!container) return;
     
@@ -493,10 +505,7 @@ function displayBusinessEarnings(payments) {
         return;
     }
     
-    let totalEarnings = 0;
-    
     container.innerHTML = payments.map(p => {
-        totalEarnings += parseFloat(p.amount);
         const statusClass = p.status === 'paid' ? 'status-paid' : 'status-pending';
         const date = new Date(p.created_at);
         const dateStr = date.toLocaleDateString('en-IN', { day: 'numeric', month: 'short' });
@@ -515,6 +524,14 @@ function displayBusinessEarnings(payments) {
         `;
     }).join('');
     
+    if (earningsNextCursor) {
+        container.insertAdjacentHTML('beforeend', `
+            <div style="text-align:center; padding:10px;">
+                <button type="button" class="toggle-btn" onclick="loadBusinessEarnings(true)">Load more</button>
+            </div>
+        `);
+    }
+    
     const totalEl = document.getElementById('total-earnings');
     if (totalEl) totalEl.textContent = `₹${totalEarnings.toLocaleString('en-IN')}`;
 }
@@ -363,12 +363,21 @@ function showServiceProvidersPage() {
     loadServiceProviders();
 }
 
-function loadResidentMaintenanceRequests() {
-    fetch('/api/maintenance-requests')
+let residentRequests = [];
+let residentRequestsCursor = null;
+
+function loadResidentMaintenanceRequests(append = false) {
+    const params = new URLSearchParams({ limit: 50 });
+    if (append && residentRequestsCursor) params.set('after', residentRequestsCursor);
+    
+    fetch(`/api/maintenance-requests?${params}`)
         .then(res => res.json())
         .then(data => {
             if (data.success) {
-                displayResidentRequests(data.requests || []);
+                const page = data.requests || [];
+                residentRequests = append ? residentRequests.concat(page) : page;
+                residentRequestsCursor = data.next_cursor || null;
+                displayResidentRequests(residentRequests);
             }
         })
         .catch(err => console.log('Error loading requests'));
@@ -408,6 +417,14 @@ function displayResidentRequests(requests) {
             </div>
         `;
     }).join('');
+    
+    if (residentRequestsCursor) {
+        container.insertAdjacentHTML('beforeend', `
+            <div style="text-align:center; padding:10px;">
+                <button type="button" class="toggle-btn" onclick="loadResidentMaintenanceRequests(true)">Load more</button>
+            </div>
+        `);
+    }
 }
 
 function loadResidentVisitors() {
@@ -450,12 +467,21 @@ function displayResidentVisitors(visitors) {
     }).join('');
 }
 
-function loadResidentPayments() {
-    fetch('/api/payments')
+let residentPayments = [];
+let residentPaymentsCursor = null;
+
+function loadResidentPayments(append = false) {
+    const params = new URLSearchParams({ limit: 50 });
+    if (append && residentPaymentsCursor) params.set('after', residentPaymentsCursor);
+    
+    fetch(`/api/payments?${params}`)
         .then(res => res.json())
         .then(data => {
             if (data.success) {
-                displayResidentPayments(data.payments || []);
+                const page = data.payments || [];
+                residentPayments = append ? residentPayments.concat(page) : page;
+                residentPaymentsCursor = data.next_cursor || null;
+                displayResidentPayments(residentPayments);
             }
         })
         .catch(err => console.log('Error loading payments'));
@@ -490,6 +516,14 @@ function displayResidentPayments(payments) {
             </div>
         `;
     }).join('');
+    
+    if (residentPaymentsCursor) {
+        container.insertAdjacentHTML('beforeend', `
+            <div style="text-align:center; padding:10px;">
+                <button type="button" class="toggle-btn" onclick="loadResidentPayments(true)">Load more</button>
+            </div>
+        `);
+    }
 }
 
 function payNow(paymentId) {
@@ -653,53 +687,95 @@ function displayResidentChatGroups(groups) {
 
 let currentChatGroupId = null;
 let chatRefreshInterval = null;
+let lastChatMessageId = 0;
+let chatSocket = null;
 
 function openChat(groupName, groupId) {
+    if (chatSocket && currentChatGroupId && currentChatGroupId !== groupId) {
+        chatSocket.emit('leave_chat_group', { group_id: currentChatGroupId });
+    }
     currentChatGroupId = groupId;
     navigateToView('individual-chat-view');
     document.getElementById('chatGroupName').innerText = groupName;
     loadChatMessages(groupId);
+    if (chatSocket && chatSocket.connected) {
+        chatSocket.emit('join_chat_group', { group_id: groupId });
+    }
     
+    // Live messages arrive over the socket; poll for deltas only while it is down
     if (chatRefreshInterval) clearInterval(chatRefreshInterval);
-    chatRefreshInterval = setInterval(() => loadChatMessages(groupId), 5000);
+    chatRefreshInterval = setInterval(() => {
+        if (currentView !== 'individual-chat-view') return;
+        if (chatSocket && chatSocket.connected) return;
+        loadNewChatMessages(currentChatGroupId);
+    }, 5000);
 }
 
 function loadChatMessages(groupId) {
     fetch(`/api/chat-groups/${groupId}/messages`)
         .then(res => res.json())
         .then(data => {
-            if (data.success) {
+            if (data.success && groupId === currentChatGroupId) {
                 displayChatMessages(data.messages || []);
             }
         })
         .catch(err => console.log('Error loading messages'));
 }
 
+function loadNewChatMessages(groupId) {
+    if (!groupId) return;
+    fetch(`/api/chat-groups/${groupId}/messages?since_id=${lastChatMessageId}`)
+        .then(res => res.json())
+        .then(data => {
+            if (data.success && groupId === currentChatGroupId) {
+                appendChatMessages(data.messages || []);
+                if (data.has_more) loadNewChatMessages(groupId);
+            }
+        })
+        .catch(err => console.log('Error loading messages'));
+}
+
+function renderChatMessage(m) {
+    const isOwn = m.sender_id === window.currentUserId;
+    const time = new Date(m.created_at);
+    const timeStr = time.toLocaleTimeString('en-IN', { hour: '2-digit', minute: '2-digit' });
+    
+    return `
+        <div class="chat-message ${isOwn ? 'sent' : 'received'}">
+            ${!isOwn ? `<div class="message-sender">${m.sender_name}</div>` : ''}
+            <div class="message-bubble">
+                <div class="message-text">${m.message}</div>
+                <span class="message-time">${timeStr}</span>
+            </div>
+        </div>
+    `;
+}
+
 function displayChatMessages(messages) {
     const container = document.getElementById('chat-messages-container');
     if (!container) return;
     
+    lastChatMessageId = messages.length ? messages[messages.length - 1].id : 0;
+    
     if (messages.length === 0) {
         container.innerHTML = '<p style="text-align:center;color:#999;padding:30px;">No messages yet. Start the conversation!</p>';
         return;
     }
     
-    container.innerHTML = messages.map(m => {
-        const isOwn = m.sender_id === window.currentUserId;
-        const time = new Date(m.created_at);
-        const timeStr = time.toLocaleTimeString('en-IN', { hour: '2-digit', minute: '2-digit' });
-        
-        return `
-            <div class="chat-message ${isOwn ? 'sent' : 'received'}">
-                ${!isOwn ? `<div class="message-sender">${m.sender_name}</div>` : ''}
-                <div class="message-bubble">
-                    <div class="message-text">${m.message}</div>
-                    <span class="message-time">${timeStr}</span>
-                </div>
-            </div>
-        `;
-    }).join('');
+    container.innerHTML = messages.map(renderChatMessage).join('');
+    container.scrollTop = container.scrollHeight;
+}
+
+function appendChatMessages(messages) {
+    const container = document.getElementById('chat-messages-container');
+    if (!container) return;
+    
+    const fresh = messages.filter(m => m.id > lastChatMessageId);
+    if (fresh.length === 0) return;
     
+    if (lastChatMessageId === 0) container.innerHTML = '';
+    container.insertAdjacentHTML('beforeend', fresh.map(renderChatMessage).join(''));
+    lastChatMessageId = fresh[fresh.length - 1].id;
     container.scrollTop = container.scrollHeight;
 }
 
@@ -710,6 +786,20 @@ function sendChatMessage() {
     const content = input.value.trim();
     if (!content) return;
     
+    if (chatSocket && chatSocket.connected) {
+        // The server acknowledges once the message is saved; it reaches us via new_messages.
+        // A pending ack means it is still queued and will arrive the same way, so never resend it.
+        chatSocket.emit('send_message', { group_id: currentChatGroupId, message: content }, function(ack) {
+            if (ack && ack.success) {
+                input.value = '';
+                if (ack.pending) showToast('Sending... your message will appear shortly', 'success');
+            } else {
+                showToast((ack && ack.message) || 'Failed to send message', 'error');
+            }
+        });
+        return;
+    }
+    
     fetch(`/api/chat-groups/${currentChatGroupId}/send`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
@@ -719,7 +809,7 @@ function sendChatMessage() {
     .then(data => {
         if (data.success) {
             input.value = '';
-            loadChatMessages(currentChatGroupId);
+            if (!chatSocket || !chatSocket.connected) loadNewChatMessages(currentChatGroupId);
         } else {
             showToast(data.message || 'Failed to send message', 'error');
         }
@@ -829,14 +919,43 @@ function initRequestTypeToggle() {
     });
 }
 
-function renderPrivateRequests() {
-    const grid = document.getElementById('private-requests-grid');
+const requestPages = {
+    public: { items: [], cursor: null },
+    private: { items: [], cursor: null }
+};
+
+function fetchRequestPage(type, append) {
+    const page = requestPages[type];
+    const params = new URLSearchParams({ type, limit: 20 });
+    if (append && page.cursor) params.set('after', page.cursor);
     
-    fetch('/api/maintenance-requests?type=private')
+    return fetch(`/api/maintenance-requests?${params}`)
         .then(res => res.json())
         .then(data => {
             if (data.success) {
-                const myReqs = data.requests || [];
+                page.items = append ? page.items.concat(data.requests || []) : (data.requests || []);
+                page.cursor = data.next_cursor || null;
+            }
+            return data;
+        });
+}
+
+function appendLoadMoreButton(grid, type, renderFnName) {
+    if (!requestPages[type].cursor) return;
+    grid.insertAdjacentHTML('beforeend', `
+        <div style="grid-column: 1 / -1; text-align:center;">
+            <button type="button" class="toggle-btn" onclick="${renderFnName}(true)">Load more</button>
+        </div>
+    `);
+}
+
+function renderPrivateRequests(append = false) {
+    const grid = document.getElementById('private-requests-grid');
+    
+    fetchRequestPage('private', append)
+        .then(data => {
+            if (data.success) {
+                const myReqs = requestPages.private.items;
                 
                 if (myReqs.length === 0) {
                     grid.innerHTML = '<p style="text-align:center; color:var(--muted); padding:20px;">No private requests yet.</p>';
@@ -861,19 +980,19 @@ function renderPrivateRequests() {
                         </div>
                     </div>
                 `).join('');
+                appendLoadMoreButton(grid, 'private', 'renderPrivateRequests');
             }
         })
         .catch(err => console.log('Error loading private requests'));
 }
 
-function renderPublicRequests() {
+function renderPublicRequests(append = false) {
     const grid = document.getElementById('public-requests-grid');
     
-    fetch('/api/maintenance-requests?type=public')
-        .then(res => res.json())
+    fetchRequestPage('public', append)
         .then(data => {
             if (data.success) {
-                const publicReqs = data.requests || [];
+                const publicReqs = requestPages.public.items;
                 
                 if (publicReqs.length === 0) {
                     grid.innerHTML = '<p style="text-align:center; color:var(--muted); padding:20px;">No public requests yet.</p>';
@@ -903,6 +1022,7 @@ function renderPublicRequests() {
                         </div>
                     `;
                 }).join('');
+                appendLoadMoreButton(grid, 'public', 'renderPublicRequests');
                 lucide.createIcons();
             }
         })
@@ -1405,10 +1525,28 @@ function initLogout() {
 // --- Socket.IO for Real-Time Updates ---
 function initSocketIO() {
     if (typeof io !== 'undefined') {
-        const socket = io();
+        const socket = io({ transports: window.socketioTransports || ['polling', 'websocket'] });
+        chatSocket = socket;
         
         socket.on('connect', function() {
             console.log('Socket.IO connected');
+            if (currentChatGroupId) {
+                // Rejoin after a reconnect and fetch whatever was missed while offline
+                socket.emit('join_chat_group', { group_id: currentChatGroupId });
+                loadNewChatMessages(currentChatGroupId);
+            }
+        });
+        
+        socket.on('new_message', function(data) {
+            if (data.group_id === currentChatGroupId) {
+                appendChatMessages([data]);
+            }
+        });
+        
+        socket.on('new_messages', function(data) {
+            if (data.group_id === currentChatGroupId) {
+                appendChatMessages(data.messages);
+            }
         });
         
         socket.on('request_status_update', function(data) {
@@ -1639,12 +1777,12 @@ function loadResidentDashboard() {
         })
         .catch(err => console.log('Activity loaded with defaults'));
 
-    fetch('/api/maintenance-requests')
+    fetch('/api/maintenance-requests?limit=1&totals=1')
         .then(res => res.json())
         .then(data => {
             if (data.success) {
                 const countEl = document.getElementById('maintenance-count');
-                if (countEl) countEl.textContent = data.requests ? data.requests.length : 0;
+                if (countEl) countEl.textContent = data.totals ? data.totals.count : 0;
             }
         })
         .catch(err => console.log('Maintenance loaded with defaults'));
@@ -0,0 +1,67 @@
+"""
+Production Entry Point - Serves the app and Socket.IO on cooperative green threads
+instead of one OS thread per connected dashboard.
+Run with: gunicorn --worker-class eventlet -w 1 --bind 0.0.0.0:5000 wsgi:app
+      or: python wsgi.py
+Set SOCKETIO_ASYNC_MODE=gevent (and --worker-class gevent) to run under gevent instead.
+Socket.IO rooms live in worker memory, so run one worker per deployment.
+"""
+import os
+
+ASYNC_MODE = os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'eventlet')
+
+# Patch the standard library before anything imports socket, threading or ssl
+if ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+else:
+    raise SystemExit(f"❌ SOCKETIO_ASYNC_MODE must be 'eventlet' or 'gevent', not {ASYNC_MODE!r}")
+
+
+def make_psycopg2_green():
+    """Let other green threads run while psycopg2 waits on the database socket.
+
+    psycopg2 talks to PostgreSQL from C, which monkey patching cannot reach, so
+    without a wait callback every query would stall the whole worker.
+    """
+    try:
+        import psycopg2
+        from psycopg2 import extensions
+    except ImportError:
+        return
+
+    if ASYNC_MODE == 'eventlet':
+        from eventlet.hubs import trampoline
+
+        def wait_read(fd):
+            trampoline(fd, read=True)
+
+        def wait_write(fd):
+            trampoline(fd, write=True)
+    else:
+        from gevent.socket import wait_read, wait_write
+
+    def wait_callback(conn, timeout=None):
+        while True:
+            state = conn.poll()
+            if state == extensions.POLL_OK:
+                break
+            elif state == extensions.POLL_READ:
+                wait_read(conn.fileno())
+            elif state == extensions.POLL_WRITE:
+                wait_write(conn.fileno())
+            else:
+                raise psycopg2.OperationalError(f"Bad result from poll: {state}")
+
+    extensions.set_wait_callback(wait_callback)
+
+
+make_psycopg2_green()
+
+from app import app, socketio  # noqa: E402
+
+if __name__ == '__main__':
+    socketio.run(app, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))